@@ -6,15 +6,18 @@ Replaces Supabase Auth with local bcrypt password hashing and JWT token generati
 
 from datetime import datetime, timedelta
 from typing import Optional
+from functools import cached_property
+from uuid import UUID
 from jose import JWTError, jwt
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
 import bcrypt
 import logging
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.database import get_db
+from app.db.database import get_db, get_async_db
 from app.models.database_models import User
 from app.config import settings
 
@@ -48,8 +51,12 @@ class UserResponse(BaseModel):
     username: Optional[str] = None
     created_at: Optional[str] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+    
+    @cached_property
+    def uuid(self) -> UUID:
+        """id parsed as a UUID (for queries on UUID columns), parsed once per request"""
+        return UUID(self.id)
 
 
 class AuthResponse(BaseModel):
@@ -341,13 +348,11 @@ async def reset_password(data: PasswordReset, db: Session) -> dict:
         )
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> UserResponse:
+def verify_credentials(credentials: Optional[HTTPAuthorizationCredentials]) -> str:
     """
-    Dependency to extract and verify current user from JWT token
-    Used in route handlers: @app.get("/protected", dependencies=[Depends(get_current_user)])
+    Verify the bearer token and return its user id (the JWT "sub").
+    Raises 401 when credentials are missing or invalid; the user row is
+    not looked up, so callers can fetch it together with other data.
     """
     if not credentials:
         logger.error("❌ [AUTH] No credentials provided in request")
@@ -359,18 +364,39 @@ async def get_current_user(
     token = credentials.credentials
     logger.debug(f"🔍 [AUTH] Received token (first 20 chars): {token[:20]}...")
     
+    payload = TokenManager.verify_token(token)
+    user_id = payload.get("sub")
+    
+    if not user_id:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token"
+        )
+    
+    logger.debug(f"✅ [AUTH] Token verified - user_id: {user_id}")
+    return user_id
+
+
+def to_user_response(user: User) -> UserResponse:
+    """Public view of an authenticated User row"""
+    return UserResponse(
+        id=str(user.id),
+        email=user.email,
+        username=user.username,
+        created_at=user.created_at.isoformat() if user.created_at else None
+    )
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> UserResponse:
+    """
+    Dependency to extract and verify current user from JWT token
+    Used in route handlers: @app.get("/protected", dependencies=[Depends(get_current_user)])
+    """
     try:
-        payload = TokenManager.verify_token(token)
-        user_id = payload.get("sub")
-        email = payload.get("email")
-        
-        logger.debug(f"✅ [AUTH] Token verified - user_id: {user_id}")
-        
-        if not user_id:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token"
-            )
+        user_id = verify_credentials(credentials)
         
         # Fetch user from database
         user = db.query(User).filter(User.id == user_id).first()
@@ -384,12 +410,7 @@ async def get_current_user(
         
         logger.info(f"✅ [AUTH] User authenticated: {user.email}")
         
-        return UserResponse(
-            id=str(user.id),
-            email=user.email,
-            username=user.username,
-            created_at=user.created_at.isoformat() if user.created_at else None
-        )
+        return to_user_response(user)
         
     except HTTPException:
         raise
@@ -401,6 +422,37 @@ async def get_current_user(
         )
 
 
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> UserResponse:
+    """
+    get_current_user for routes on the AsyncSession: the user lookup is
+    awaited instead of blocking the event loop, on the request's own
+    async connection
+    """
+    user_id = verify_credentials(credentials)
+    
+    try:
+        user = await db.get(User, UUID(user_id))
+    except Exception as e:
+        logger.error(f"❌ [AUTH] get_current_user_async error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Authentication failed"
+        )
+    
+    if not user:
+        logger.error(f"❌ [AUTH] User not found in DB: {user_id}")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found"
+        )
+    
+    logger.info(f"✅ [AUTH] User authenticated: {user.email}")
+    return to_user_response(user)
+
+
 async def get_optional_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
     db: Session = Depends(get_db)
@@ -427,12 +479,38 @@ async def get_optional_user(
         if not user:
             return None
         
-        return UserResponse(
-            id=str(user.id),
-            email=user.email,
-            username=user.username,
-            created_at=user.created_at.isoformat() if user.created_at else None
-        )
+        return to_user_response(user)
+        
+    except Exception as e:
+        logger.debug(f"Optional user authentication failed (this is OK): {e}")
+        return None
+
+
+async def get_optional_user_async(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> Optional[UserResponse]:
+    """
+    get_optional_user for routes on the AsyncSession: the user lookup is
+    awaited instead of blocking the event loop (and the request uses one
+    connection, from the async pool, instead of one per engine)
+    """
+    if not credentials:
+        return None
+    
+    try:
+        payload = TokenManager.verify_token(credentials.credentials)
+        user_id = payload.get("sub")
+        
+        if not user_id:
+            return None
+        
+        user = await db.get(User, UUID(user_id))
+        
+        if not user:
+            return None
+        
+        return to_user_response(user)
         
     except Exception as e:
         logger.debug(f"Optional user authentication failed (this is OK): {e}")
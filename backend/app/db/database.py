@@ -1,4 +1,5 @@
-from sqlalchemy import create_engine, event
+from sqlalchemy import create_engine, event, make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, declarative_base
 from sqlalchemy.pool import QueuePool
 from app.config import settings
@@ -16,36 +17,37 @@ import socket
 # - Simpler architecture: one database for all business logic
 # ============================================
 
+# PostgreSQL only: routes rely on PostgreSQL SQL (ON CONFLICT, GROUPING SETS,
+# INCLUDE indexes) and on the asyncpg engine below. SQLite is not supported.
+if make_url(settings.DATABASE_URL).get_backend_name() != "postgresql":
+    raise RuntimeError("DATABASE_URL must be a PostgreSQL URL (postgresql://...); SQLite is not supported")
+
 # Create database engine
-# For SQLite, disable some features that PostgreSQL has
 kwargs = {
     "echo": settings.DEBUG,
-    "pool_pre_ping": True,
+    "query_cache_size": 1200,  # Compiled statement cache (default 500); report/portfolio routes build many distinct selects
+    "pool_size": settings.DB_SYNC_POOL_SIZE,  # ✅ 10 par défaut (le pool async a le sien)
+    "max_overflow": settings.DB_SYNC_MAX_OVERFLOW,  # ✅ 10 par défaut (débordement)
+    "pool_timeout": settings.DB_POOL_TIMEOUT,
+    "pool_recycle": settings.DB_POOL_RECYCLE,  # ✅ Recycle connexions après 30 min (évite stale connections)
+    "pool_pre_ping": True,  # ✅ Vérifie connexion avant utilisation
+    "poolclass": QueuePool,
+    "connect_args": {
+        "connect_timeout": 10,
+        "keepalives": 1,
+        "keepalives_idle": 30,
+        "keepalives_interval": 10,
+        "keepalives_count": 5,
+        "tcp_user_timeout": 30000,  # 30 seconds in milliseconds
+    }
 }
 
-# PostgreSQL-specific settings
-if "postgresql" in settings.DATABASE_URL:
-    kwargs.update({
-        "pool_size": 20,  # ✅ Augmenté de 5 à 20 pour supporter charge simultanée
-        "max_overflow": 30,  # ✅ Augmenté de 10 à 30 (débordement)
-        "pool_recycle": 3600,  # ✅ Nouvelle: Recycle connexions après 1h (évite stale connections)
-        "pool_pre_ping": True,  # ✅ Vérifie connexion avant utilisation
-        "poolclass": QueuePool,
-        "connect_args": {
-            "connect_timeout": 10,
-            "keepalives": 1,
-            "keepalives_idle": 30,
-            "keepalives_interval": 10,
-            "keepalives_count": 5,
-            "tcp_user_timeout": 30000,  # 30 seconds in milliseconds
-        }
-    })
-
-# SQLite-specific settings
-if "sqlite" in settings.DATABASE_URL:
-    kwargs.update({
-        "connect_args": {"check_same_thread": False}
-    })
+# psycopg2: INSERT executemany is already batched into multi-row VALUES
+# (insertmanyvalues, 1000 rows per page); "values_plus_batch" also sends
+# UPDATE/DELETE executemany (ORM bulk updates) through execute_batch
+# instead of one round-trip per parameter set
+if make_url(settings.DATABASE_URL).get_driver_name() == "psycopg2":
+    kwargs["executemany_mode"] = "values_plus_batch"
 
 engine = create_engine(settings.DATABASE_URL, **kwargs)
 
@@ -66,6 +68,28 @@ def receive_connect(dbapi_conn, connection_record):
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine (asyncpg) for routes that await their queries instead of
+# blocking the event loop with the sync Session above
+async_url = make_url(settings.DATABASE_URL).set(drivername="postgresql+asyncpg")
+async_connect_args = {"timeout": 10}
+# asyncpg takes ssl=..., not libpq's sslmode=... query parameter
+sslmode = async_url.query.get("sslmode")
+if sslmode:
+    async_url = async_url.difference_update_query(["sslmode"])
+    async_connect_args["ssl"] = sslmode
+async_engine = create_async_engine(
+    async_url,
+    echo=settings.DEBUG,
+    pool_size=settings.DB_ASYNC_POOL_SIZE,
+    max_overflow=settings.DB_ASYNC_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=True,
+    query_cache_size=1200,
+    connect_args=async_connect_args,
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # Create declarative base for models
 Base = declarative_base()
 
@@ -76,3 +100,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# Async dependency for FastAPI (routes using AsyncSession)
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
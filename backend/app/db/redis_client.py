@@ -0,0 +1,233 @@
+"""
+Redis Client for Response Caching
+=================================
+Short-lived caching of expensive API responses (portfolio summary, reports).
+
+Caching is best-effort: when Redis is disabled (REDIS_ENABLED=false, the
+default in development) or unreachable, every helper degrades to a no-op
+and endpoints simply recompute their response.
+"""
+
+import asyncio
+import functools
+import logging
+from typing import Any, Optional
+
+import orjson
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_redis_client = None
+
+
+def get_redis():
+    """Get or create the shared async Redis client (None if caching is disabled)."""
+    global _redis_client
+    if not settings.REDIS_ENABLED:
+        return None
+    if _redis_client is None:
+        import redis.asyncio as aioredis
+        _redis_client = aioredis.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=0.5,
+            socket_timeout=0.5,
+        )
+    return _redis_client
+
+
+async def cache_get(key: str) -> Optional[Any]:
+    """Return the cached JSON value for key, or None on miss/error."""
+    client = get_redis()
+    if client is None:
+        return None
+    try:
+        cached = await client.get(key)
+    except Exception as e:
+        logger.warning(f"Redis GET failed for {key}: {e}")
+        return None
+    return orjson.loads(cached) if cached else None
+
+
+async def cache_set(key: str, value: Any, ttl: int) -> None:
+    """Store value as JSON under key with a TTL in seconds."""
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        await client.set(key, orjson.dumps(value), ex=ttl)
+    except Exception as e:
+        logger.warning(f"Redis SET failed for {key}: {e}")
+
+
+async def cache_delete(*keys: str) -> None:
+    """Delete one or more keys (used to invalidate after writes)."""
+    client = get_redis()
+    if client is None or not keys:
+        return
+    try:
+        await client.delete(*keys)
+    except Exception as e:
+        logger.warning(f"Redis DELETE failed for {keys}: {e}")
+
+
+async def cache_incr(key: str) -> None:
+    """Atomically increment an integer key (created at 1 if missing)."""
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        await client.incr(key)
+    except Exception as e:
+        logger.warning(f"Redis INCR failed for {key}: {e}")
+
+
+# ============== Cache Keys ==============
+
+def portfolio_cache_keys(user_id) -> tuple:
+    """Keys of every cached per-user portfolio response."""
+    return (
+        f"portfolio:summary:{user_id}",
+    )
+
+
+async def _cache_version(version_key: str) -> Optional[int]:
+    """
+    Integer stored under version_key, 0 until first bumped (cache_incr);
+    None when caching is disabled or Redis is unreachable.
+    """
+    client = get_redis()
+    if client is None:
+        return None
+    try:
+        version = await client.get(version_key)
+    except Exception as e:
+        logger.warning(f"Redis GET failed for {version_key}: {e}")
+        return None
+    return int(version) if version else 0
+
+
+def trading_settings_version_key(user_id) -> str:
+    """Key holding the version of a user's cached trading settings."""
+    return f"settings:trading:version:{user_id}"
+
+
+async def trading_settings_cache_version(user_id) -> Optional[int]:
+    """
+    Current version of a user's cached trading settings, bumped after each
+    settings write; None when caching is disabled or Redis is unreachable.
+    """
+    return await _cache_version(trading_settings_version_key(user_id))
+
+
+def trading_settings_cache_key(user_id, version: int) -> str:
+    """
+    Key for a user's cached GET /api/settings/trading response. A read that
+    raced a write fills a key of the version it read before the write's
+    bump, which no later request looks up.
+    """
+    return f"settings:trading:{user_id}:v{version}"
+
+
+async def invalidate_trading_settings_cache(user_id) -> None:
+    """Orphan a user's cached trading settings after a settings write commits."""
+    await cache_incr(trading_settings_version_key(user_id))
+
+
+def report_version_key(user_id) -> str:
+    """Key holding the version of a user's cached reports (see report_cache_key)."""
+    return f"reports:version:{user_id}"
+
+
+async def report_cache_version(user_id) -> Optional[int]:
+    """
+    Current version of a user's cached reports, 0 until their trades first
+    change; None when caching is disabled or Redis is unreachable.
+    """
+    return await _cache_version(report_version_key(user_id))
+
+
+def report_cache_key(user_id, version: int, endpoint: str, params: dict) -> str:
+    """
+    Key for a cached report response, unique per user, report version,
+    endpoint and query params. Bumping the version (invalidate_user_cache)
+    orphans every older key, which then expires on its TTL.
+    """
+    query = "&".join(f"{name}={params[name]}" for name in sorted(params))
+    return f"reports:{user_id}:v{version}:{endpoint}:{query}"
+
+
+async def invalidate_user_cache(user_id) -> None:
+    """Drop cached portfolio and report responses for a user after their trades change."""
+    await cache_delete(*portfolio_cache_keys(user_id))
+    await cache_incr(report_version_key(user_id))
+
+
+def cached_response(prefix: str, ttl: int):
+    """
+    Cache a route's JSON response under prefix + its query params for ttl
+    seconds. Only for endpoints whose response is not user-scoped (the db
+    session and user dependencies are excluded from the key); staleness is
+    bounded by the TTL, there is no write-path invalidation.
+    """
+    def decorator(handler):
+        @functools.wraps(handler)
+        async def wrapper(**kwargs):
+            params = {k: v for k, v in kwargs.items() if k not in ("db", "current_user")}
+            query = "&".join(f"{name}={params[name]}" for name in sorted(params))
+            key = f"{prefix}:{query}"
+            cached = await cache_get(key)
+            if cached is not None:
+                return cached
+            response = await handler(**kwargs)
+            await cache_set(key, response, ttl)
+            return response
+        return wrapper
+    return decorator
+
+
+# ============== Invalidation on trade writes ==============
+# Trades are opened/closed from many places (routes, bot engine, SL/TP
+# manager, AI agent). Rather than calling invalidate_user_cache at each of
+# them, track the users whose trades were flushed and invalidate once the
+# transaction commits.
+
+_DIRTY_USERS_KEY = "cache_dirty_user_ids"
+
+# Invalidation tasks still running; the event loop only keeps weak
+# references to tasks, so they are held here until they complete
+_invalidation_tasks = set()
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_trade_users(session, flush_context, instances):
+    from app.models.database_models import Trade
+    
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Trade) and obj.user_id:
+            session.info.setdefault(_DIRTY_USERS_KEY, set()).add(obj.user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    user_ids = session.info.pop(_DIRTY_USERS_KEY, None)
+    if not user_ids or not settings.REDIS_ENABLED:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # Committed from a worker thread: callers there invalidate explicitly,
+        # otherwise the cache TTL bounds staleness
+        return
+    for user_id in user_ids:
+        task = loop.create_task(invalidate_user_cache(user_id))
+        _invalidation_tasks.add(task)
+        task.add_done_callback(_invalidation_tasks.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop(_DIRTY_USERS_KEY, None)
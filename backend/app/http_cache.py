@@ -0,0 +1,33 @@
+"""
+HTTP caching helpers shared by the API routes (ETag / If-None-Match).
+"""
+
+import hashlib
+
+from fastapi import Request, Response
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match lists etag (weak or strong)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def body_etag(body: bytes) -> str:
+    """Strong ETag for a response body that never changes at runtime."""
+    return '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+
+
+def static_json_response(request: Request, body: bytes, etag: str, cache_control: str) -> Response:
+    """
+    Serve pre-serialized JSON with its ETag, or a bodyless 304 when the
+    client already holds this version.
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -1,9 +1,11 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import logging
 import asyncio
 import os
+import numpy as np
 
 # Force Railway redeploy - v2
 # Suppress TensorFlow and CUDA verbose logging
@@ -13,7 +15,7 @@ os.environ['TF_ENABLE_ONEDNN_OPTS'] = '0'  # Disable oneDNN optimization to redu
 # Import routes
 from app.routes import health, portfolio, crypto, bots, reports, risk, trades, translations, ml, auth, ai_agent, exchange, watchlist, settings as settings_routes, admin, long_term
 from app.config import settings
-from app.db.database import Base, engine, SessionLocal
+from app.db.database import Base, engine, SessionLocal, async_engine
 from app.services import bot_engine as bot_engine_module
 from app.services.bot_engine import BotEngine
 from app.services import ai_agent as ai_agent_module
@@ -38,6 +40,9 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("🚀 CRBot API Starting...")
     
+    # One PCG64 generator per worker process for demo/simulated data
+    app.state.rng = np.random.default_rng()
+    
     # Create missing tables (idempotent)
     try:
         from sqlalchemy import text
@@ -968,6 +973,16 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"⚠️ Could not start Portfolio Sync Service: {e}")
     
+    # === Portfolio History Snapshots (daily equity for drawdown reports) ===
+    try:
+        from app.services.portfolio_history_service import get_portfolio_history_service
+        
+        history_service = get_portfolio_history_service()
+        asyncio.create_task(history_service.start())
+        logger.info("✅ Portfolio History Service started (hourly snapshots)")
+    except Exception as e:
+        logger.warning(f"⚠️ Could not start Portfolio History Service: {e}")
+    
     yield
     
     # Shutdown
@@ -997,6 +1012,14 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.debug(f"Error stopping portfolio sync service: {e}")
     
+    # Stop portfolio history service
+    try:
+        from app.services.portfolio_history_service import stop_portfolio_history_service
+        stop_portfolio_history_service()
+        logger.info("[OK] Portfolio History Service stopped")
+    except Exception as e:
+        logger.debug(f"Error stopping portfolio history service: {e}")
+    
     # Stop recommendation scheduler
     try:
         if hasattr(app.state, 'recommendation_scheduler') and app.state.recommendation_scheduler:
@@ -1032,12 +1055,16 @@ async def lifespan(app: FastAPI):
     if bot_engine_module.bot_engine:
         await bot_engine_module.bot_engine.stop()
         logger.info("[OK] Bot Engine stopped")
+    
+    # Close pooled asyncpg connections
+    await async_engine.dispose()
 
 # Create FastAPI app
 app = FastAPI(
     title=settings.API_TITLE,
     description=settings.API_DESCRIPTION,
     version=settings.API_VERSION,
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, JSON
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, Boolean, Text, JSON, Index
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import validates
 from sqlalchemy.sql import func
 import uuid
 from app.db.database import Base
@@ -35,12 +36,25 @@ class Portfolio(Base):
     win_rate = Column(Float, default=0.0)
     max_drawdown = Column(Float, default=0.0)
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    
+    # Fetch updated_at with RETURNING on flush, so async routes can read it
+    # after commit without a lazy refresh
+    __mapper_args__ = {"eager_defaults": True}
+
+class PortfolioHistory(Base):
+    """Daily equity snapshot per user (written by PortfolioHistoryService, see migration 025)"""
+    __tablename__ = "portfolio_history"
+    
+    user_id = Column(UUID(as_uuid=True), primary_key=True)
+    date = Column(Date, primary_key=True)
+    equity = Column(Float, nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
 class Trade(Base):
     __tablename__ = "trades"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    user_id = Column(UUID(as_uuid=True), index=True, nullable=False)  # Supabase user UUID
+    user_id = Column(UUID(as_uuid=True), nullable=False)  # Supabase user UUID (leads every composite index below)
     bot_id = Column(UUID(as_uuid=True), index=True)
     symbol = Column(String(20), index=True)
     side = Column(String(10))  # BUY or SELL
@@ -66,6 +80,28 @@ class Trade(Base):
     market_context = Column(String(50), nullable=True)  # STRONG_BULLISH, WEAK_BULLISH, STRONG_BEARISH, etc
     market_context_confidence = Column(Float, nullable=True)  # 0-100% confidence in market context
     created_at = Column(DateTime, server_default=func.now())
+    
+    # Composite indexes matching the (user_id, status) filter + time ordering used
+    # by portfolio/trade-history endpoints (see migration 023). (user_id, status,
+    # entry_time) is served by the idx_trades_user_status_entry_ctx prefix.
+    __table_args__ = (
+        Index("idx_trades_user_status_exit", user_id, status, exit_time.desc().nullslast()),
+        # Trades report page and trade list ordered by entry_time without a status filter (migration 026)
+        Index("idx_trades_user_entry", user_id, entry_time.desc()),
+        # Cross-user status scans: SL/TP monitor (OPEN), performance report (CLOSED) (migration 028)
+        Index("idx_trades_status_entry", status, entry_time, postgresql_include=["pnl"]),
+        # Covering index for the reports GROUP BY (strategy, market_context) aggregates (migration 024)
+        Index(
+            "idx_trades_user_status_entry_ctx",
+            user_id, status, entry_time, strategy, market_context,
+            postgresql_include=["pnl"],
+        ),
+    )
+    
+    @validates("symbol", "status")
+    def _normalize_upper(self, key, value):
+        """Store symbol/status uppercase so equality filters can use the plain btree indexes (migration 027)"""
+        return value.upper() if value else value
 
 class Bot(Base):
     __tablename__ = "bots"
@@ -105,6 +141,7 @@ class StrategyPerformance(Base):
     max_drawdown = Column(Float, default=0.0)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
 class RiskEvent(Base):
     __tablename__ = "risk_events"
     
@@ -240,6 +277,17 @@ class WatchlistItem(Base):
     # Timestamps
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    
+    __table_args__ = (
+        # One symbol per user; conflict target of the watchlist upserts (migration 004)
+        Index("idx_watchlist_items_user_symbol", user_id, symbol, unique=True),
+        # Active items in priority order: symbol list, AI sync, active_only listing (migration 029)
+        Index(
+            "idx_watchlist_items_user_active_priority",
+            user_id, priority.desc(), created_at,
+            postgresql_where=(is_active == True),
+        ),
+    )
 
 
 class MLPrediction(Base):
@@ -416,6 +464,15 @@ class WatchlistRecommendation(Base):
     accepted_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, server_default=func.now(), index=True)
     
+    __table_args__ = (
+        # Recommendation history, keyset-paginated on (accepted_at, id) (migration 030)
+        Index(
+            "idx_rec_user_accepted_at",
+            user_id, accepted_at.desc(), id.desc(),
+            postgresql_where=accepted.isnot(None),
+        ),
+    )
+    
     def __repr__(self):
         status = "pending" if self.accepted is None else ("accepted" if self.accepted else "rejected")
         return f"<WatchlistRecommendation {self.symbol} score={self.score} {status}>"
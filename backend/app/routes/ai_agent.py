@@ -8,6 +8,7 @@ from pydantic import BaseModel
 from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
 from app.db.database import get_db
+from app.timeutils import iso_now
 from app.auth.local_auth import get_current_user, UserResponse
 from app.services import ai_agent as ai_agent_module
 from app.services.ai_agent_manager import ai_agent_manager
@@ -240,7 +241,7 @@ async def get_ai_status(
         "engine": engine_status,
         "running": agent_status.get("running", False),  # Top-level running state for convenience
         "user_id": user_id,
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": iso_now()
     }
 
 
@@ -306,7 +307,6 @@ async def analyze_watchlist(
     Returns recommendations sorted by confidence.
     """
     from app.models.database_models import WatchlistItem
-    from uuid import UUID
     
     user_id = str(current_user.id)
     
@@ -321,7 +321,7 @@ async def analyze_watchlist(
     try:
         # Get user's active watchlist items from database
         watchlist_items = db.query(WatchlistItem).filter(
-            WatchlistItem.user_id == UUID(current_user.id),
+            WatchlistItem.user_id == current_user.uuid,
             WatchlistItem.is_active == True
         ).order_by(WatchlistItem.priority.desc()).limit(limit).all()
         
@@ -405,7 +405,7 @@ async def analyze_watchlist(
             "count": len(recommendations),
             "analyzed": len(symbols_to_analyze),
             "errors": errors if errors else None,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": iso_now()
         }
         
     except Exception as e:
@@ -464,7 +464,7 @@ async def chat_with_ai(
         
         return {
             "response": response,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": iso_now(),
             "user_id": str(current_user.id)
         }
         
@@ -808,11 +808,19 @@ async def get_autonomous_trades(
         
         trades = query.order_by(Trade.entry_time.desc()).limit(limit).all()
         
-        # Calculate stats
-        total_pnl = sum(float(t.pnl or 0) for t in trades if t.status == "CLOSED")
-        winning = sum(1 for t in trades if t.status == "CLOSED" and (t.pnl or 0) > 0)
-        losing = sum(1 for t in trades if t.status == "CLOSED" and (t.pnl or 0) < 0)
-        open_count = sum(1 for t in trades if t.status == "OPEN")
+        # Calculate stats (single pass over the page)
+        total_pnl = 0.0
+        winning = losing = open_count = 0
+        for t in trades:
+            if t.status == "OPEN":
+                open_count += 1
+            elif t.status == "CLOSED":
+                pnl = float(t.pnl or 0)
+                total_pnl += pnl
+                if pnl > 0:
+                    winning += 1
+                elif pnl < 0:
+                    losing += 1
         
         return {
             "trades": [
@@ -875,11 +883,22 @@ async def get_autonomous_stats(
             AIDecision.created_at >= cutoff
         ).all()
         
-        # Calculate trade stats
-        closed_trades = [t for t in trades if t.status == "CLOSED"]
-        total_pnl = sum(float(t.pnl or 0) for t in closed_trades)
-        winning = [t for t in closed_trades if (t.pnl or 0) > 0]
-        losing = [t for t in closed_trades if (t.pnl or 0) < 0]
+        # Calculate trade stats (single pass)
+        open_count = closed_count = winning = losing = 0
+        total_pnl = win_pnl = loss_pnl = 0.0
+        for t in trades:
+            if t.status == "OPEN":
+                open_count += 1
+            elif t.status == "CLOSED":
+                closed_count += 1
+                pnl = float(t.pnl or 0)
+                total_pnl += pnl
+                if pnl > 0:
+                    winning += 1
+                    win_pnl += pnl
+                elif pnl < 0:
+                    losing += 1
+                    loss_pnl += pnl
         
         # Calculate decision stats
         executed_decisions = sum(1 for d in decisions if d.executed)
@@ -890,14 +909,14 @@ async def get_autonomous_stats(
             "period_days": days,
             "trades": {
                 "total": len(trades),
-                "open": sum(1 for t in trades if t.status == "OPEN"),
-                "closed": len(closed_trades),
-                "winning": len(winning),
-                "losing": len(losing),
-                "win_rate": round(len(winning) / len(closed_trades) * 100, 1) if closed_trades else 0,
+                "open": open_count,
+                "closed": closed_count,
+                "winning": winning,
+                "losing": losing,
+                "win_rate": round(winning / closed_count * 100, 1) if closed_count else 0,
                 "total_pnl": round(total_pnl, 2),
-                "avg_win": round(sum(float(t.pnl) for t in winning) / len(winning), 2) if winning else 0,
-                "avg_loss": round(sum(float(t.pnl) for t in losing) / len(losing), 2) if losing else 0,
+                "avg_win": round(win_pnl / winning, 2) if winning else 0,
+                "avg_loss": round(loss_pnl / losing, 2) if losing else 0,
             },
             "decisions": {
                 "total": len(decisions),
@@ -7,7 +7,7 @@ from app.models.database_models import Bot, Trade, StrategyPerformance, Portfoli
 from app.services.strategies import StrategyRegistry
 from app.services import bot_engine as bot_engine_module
 from app.auth.local_auth import get_current_user, get_optional_user, UserResponse
-from sqlalchemy import desc
+from sqlalchemy import desc, func
 from datetime import datetime
 import json
 import uuid
@@ -57,13 +57,19 @@ async def get_bots(
     """Get all bots for current authenticated user"""
     bots = db.query(Bot).filter(Bot.user_id == current_user.id).all()
     
+    # Open trades count for all bots in one grouped COUNT
+    open_trades_by_bot = {}
+    if bots:
+        open_trades_by_bot = dict(
+            db.query(Trade.bot_id, func.count(Trade.id)).filter(
+                Trade.bot_id.in_([bot.id for bot in bots]),
+                Trade.status == "OPEN"
+            ).group_by(Trade.bot_id).all()
+        )
+    
     result = []
     for bot in bots:
-        # Get open trades count
-        open_trades = db.query(Trade).filter(
-            Trade.bot_id == bot.id,
-            Trade.status == "OPEN"
-        ).count()
+        open_trades = open_trades_by_bot.get(bot.id, 0)
         
         # Parse JSON fields - handle both string and parsed JSON (PostgreSQL JSONB)
         if isinstance(bot.config, str):
@@ -91,8 +97,8 @@ async def get_bots(
             "risk_percent": bot.risk_percent,
             "symbols": symbols,
             "config": config,
-            "created_at": bot.created_at.isoformat() if bot.created_at else None,
-            "updated_at": bot.updated_at.isoformat() if bot.updated_at else None,
+            "created_at": bot.created_at,
+            "updated_at": bot.updated_at,
         })
     
     return {"bots": result, "total": len(result)}
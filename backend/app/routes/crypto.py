@@ -1,12 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from app.db.database import get_db
 from app.models.database_models import WatchlistItem
+from app.timeutils import iso_now
 import httpx
 import os
-from datetime import datetime, timedelta
 import random
+import numpy as np
 from typing import Optional, List, Dict, Any
 import logging
 from app.services import (
@@ -83,30 +84,36 @@ async def get_crypto_prices(db: Session = Depends(get_db)):
         }
 
 @router.get("/crypto/chart")
-async def get_crypto_chart(symbol: str = "BTCUSDT", interval: str = "1h"):
+async def get_crypto_chart(request: Request, symbol: str = "BTCUSDT", interval: str = "1h"):
     """Get historical OHLCV data for charting"""
     
-    # Demo data
-    candles = []
+    # Demo data: random walk generated as whole arrays (each candle opens
+    # near the previous close)
+    count = 100
     base_price = 42150.0
+    rng = request.app.state.rng
     
-    for i in range(100):
-        open_price = base_price + random.uniform(-500, 500)
-        close_price = open_price + random.uniform(-300, 300)
-        high_price = max(open_price, close_price) + random.uniform(0, 200)
-        low_price = min(open_price, close_price) - random.uniform(0, 200)
-        volume = random.uniform(100, 1000)
-        
-        candles.append({
-            "open": round(open_price, 2),
-            "high": round(high_price, 2),
-            "low": round(low_price, 2),
-            "close": round(close_price, 2),
-            "volume": round(volume, 2),
+    open_offsets = rng.uniform(-500, 500, count)
+    close_moves = rng.uniform(-300, 300, count)
+    closes = base_price + np.cumsum(open_offsets + close_moves)
+    opens = closes - close_moves
+    highs = np.maximum(opens, closes) + rng.uniform(0, 200, count)
+    lows = np.minimum(opens, closes) - rng.uniform(0, 200, count)
+    volumes = rng.uniform(100, 1000, count)
+    
+    candles = [
+        {
+            "open": open_price,
+            "high": high_price,
+            "low": low_price,
+            "close": close_price,
+            "volume": volume,
             "time": i * 3600
-        })
-        
-        base_price = close_price
+        }
+        for i, (open_price, high_price, low_price, close_price, volume) in enumerate(zip(
+            *(np.round(series, 2).tolist() for series in (opens, highs, lows, closes, volumes))
+        ))
+    ]
     
     return {
         "symbol": symbol,
@@ -141,7 +148,7 @@ async def get_crypto_data(symbol: str):
                 "high_24h": float(ticker_data.get("high_24h", 0)),
                 "low_24h": float(ticker_data.get("low_24h", 0)),
                 "volume_24h": float(ticker_data.get("volume_24h", 0)),
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": iso_now()
             }
         else:
             logger.error(f"❌ [DATA] Market data error for {symbol_upper}: {ticker_data.get('error')}")
@@ -157,7 +164,7 @@ async def get_crypto_data(symbol: str):
         "high_24h": 43200.0,
         "low_24h": 41000.0,
         "volume_24h": 28500000,
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": iso_now()
     }
 
 # ============ FEATURE 4.1: Crypto Analysis Data ============
@@ -260,7 +267,7 @@ async def get_market_candles(
             "timeframe": timeframe,
             "candles": candles,
             "count": len(candles),
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": iso_now()
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -299,7 +306,7 @@ async def get_rsi(symbol: str, period: int = 14):
             "period": period,
             "value": rsi_values[-1],
             "interpretation": _interpret_rsi(rsi_values[-1]),
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": iso_now()
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -325,7 +332,7 @@ async def get_macd(symbol: str):
             "signal": signal_line[-1],
             "histogram": histogram[-1],
             "interpretation": _interpret_macd(macd_line[-1], signal_line[-1]),
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": iso_now()
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -355,7 +362,7 @@ async def get_bollinger_bands(symbol: str, period: int = 20):
             "lower_band": lower[-1],
             "current_price": current_price,
             "position": _bollinger_position(current_price, upper[-1], lower[-1]),
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": iso_now()
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -381,7 +388,7 @@ async def get_ema(symbol: str, period: int = 50):
             "value": ema_values[-1],
             "price": prices[-1],
             "interpretation": _interpret_ema(prices[-1], ema_values[-1]),
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": iso_now()
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -404,7 +411,7 @@ async def get_all_indicators(symbol: str):
         return {
             "symbol": symbol,
             "indicators": analysis,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": iso_now()
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -517,7 +524,7 @@ async def get_elliott_wave(symbol: str):
             "symbol": symbol,
             "indicator": "Elliott Wave",
             **elliott_analysis,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": iso_now()
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -540,7 +547,7 @@ async def get_fibonacci(symbol: str):
             "symbol": symbol,
             "indicator": "Fibonacci",
             **fib_analysis,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": iso_now()
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -562,7 +569,7 @@ async def get_ichimoku(symbol: str):
             "symbol": symbol,
             "indicator": "Ichimoku Cloud",
             **ichimoku_data,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": iso_now()
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -605,7 +612,7 @@ async def get_advanced_analysis(symbol: str):
             "elliott_wave": elliott,
             "fibonacci": fibonacci,
             "ichimoku": ichimoku,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": iso_now()
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -701,7 +708,7 @@ async def ml_predict_batch(symbols: Optional[str] = None, db: Session = Depends(
         return {
             "status": "success",
             "predictions": results,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": iso_now()
         }
     except Exception as e:
         logger.error(f"❌ ML batch prediction error: {e}")
@@ -738,7 +745,7 @@ async def ml_detect_patterns(symbol: str):
             return {
                 "status": "success",
                 "symbol": symbol.upper(),
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": iso_now(),
                 "patterns": demo_patterns,
                 "total_patterns_detected": len(demo_patterns),
                 "top_pattern": demo_patterns[0] if demo_patterns else None
@@ -749,7 +756,7 @@ async def ml_detect_patterns(symbol: str):
         return {
             "status": "success",
             "symbol": symbol.upper(),
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": iso_now(),
             "patterns": patterns,
             "total_patterns_detected": len(patterns),
             "top_pattern": patterns[0] if patterns else None
@@ -789,7 +796,7 @@ async def ml_trading_signals(symbol: str):
                 "price_prediction_7d": 45000 if symbol.upper() == "BTC" else 2500,
                 "current_price": 42000 if symbol.upper() == "BTC" else 2200,
                 "change_percent": random.uniform(-10, 10),
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": iso_now()
             }
         
         current_price = result.get("current_price", 0)
@@ -829,7 +836,7 @@ async def ml_trading_signals(symbol: str):
             "price_prediction_7d": pred_7d,
             "current_price": current_price,
             "change_percent": price_change_percent,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": iso_now()
         }
     except Exception as e:
         return {
@@ -2,8 +2,8 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from app.db.database import get_db
 from app.models.database_models import Portfolio, Trade
+from app.timeutils import iso_now
 from sqlalchemy import desc, text
-from datetime import datetime, timedelta
 from pathlib import Path
 import logging
 
@@ -15,7 +15,7 @@ async def health_check():
     """Health check endpoint"""
     return {
         "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": iso_now(),
         "service": "CRBot API"
     }
 
@@ -108,7 +108,7 @@ async def create_ai_decisions_table(db: Session = Depends(get_db)):
         return {
             "status": "✅ ai_decisions table created",
             "migration_file": str(found_path),
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": iso_now()
         }
         
     except Exception as e:
@@ -117,6 +117,6 @@ async def create_ai_decisions_table(db: Session = Depends(get_db)):
         return {
             "status": "❌ FAILED",
             "error": str(e),
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": iso_now()
         }
 
@@ -1,21 +1,39 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.db.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import get_db, get_async_db
 from app.models.database_models import Portfolio, Trade, Bot
 from app.services.risk_calculator import RiskCalculator
 from app.services.market_data import MarketDataCollector
-from app.auth.local_auth import get_current_user, get_optional_user, UserResponse
-from sqlalchemy import desc
-from datetime import datetime, timedelta
-from pydantic import BaseModel
-from typing import Optional, List
+from app.auth.local_auth import get_current_user, get_current_user_async, get_optional_user, get_optional_user_async, UserResponse
+from app.db.redis_client import cache_get, cache_set, invalidate_user_cache, portfolio_cache_keys
+from app.config import settings
+from sqlalchemy import and_, desc, func, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from datetime import datetime, time, timedelta
+from pydantic import BaseModel, ConfigDict
+from typing import Optional, List, Dict, Iterable
+import asyncio
 import logging
+import os
+import uuid
+from operator import itemgetter
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api", tags=["portfolio"])
 
+# Max concurrent ticker requests (Binance rate-limits bursts; keep it bounded)
+MARKET_CONCURRENCY = int(os.getenv("MARKET_CONCURRENCY", "8"))
+_market_semaphore = asyncio.Semaphore(MARKET_CONCURRENCY)
+
+# Risk metrics keys change whenever their inputs do; the TTL only bounds Redis memory
+RISK_METRICS_CACHE_TTL = 24 * 3600
+
 class OrderCreate(BaseModel):
+    # Orders are validated once and never mutated; reject unknown fields up front
+    model_config = ConfigDict(extra="forbid", frozen=True)
+    
     symbol: str
     side: str  # BUY or SELL
     quantity: float
@@ -24,19 +42,66 @@ class OrderCreate(BaseModel):
     stop_loss: Optional[float] = None
     take_profit: Optional[float] = None
 
-@router.get("/portfolio/summary")
-async def get_portfolio_summary(
-    db: Session = Depends(get_db),
-    current_user: UserResponse = Depends(get_current_user)
-):
-    """Get portfolio summary (KPIs)"""
-    # Get portfolio for user
-    user_id = current_user.id
-    portfolio = db.query(Portfolio).filter(Portfolio.user_id == user_id).first()
+
+async def _fetch_current_prices(
+    market_collector: MarketDataCollector,
+    symbols: Iterable[str]
+) -> Dict[str, Optional[float]]:
+    """
+    Fetch current prices for several symbols concurrently.
+    Concurrency is bounded by MARKET_CONCURRENCY to stay under exchange rate limits.
+    Symbols whose price could not be fetched map to None (callers fall back to entry price).
+    """
+    unique_symbols = list(dict.fromkeys(symbols))
     
-    if not portfolio:
-        # Create portfolio for this user if not exists
-        portfolio = Portfolio(
+    async def _fetch(symbol: str) -> float:
+        async with _market_semaphore:
+            ticker_data = await market_collector.get_ticker(symbol)
+        return float(ticker_data['close'])
+    
+    results = await asyncio.gather(
+        *(_fetch(symbol) for symbol in unique_symbols),
+        return_exceptions=True
+    )
+    
+    prices = {}
+    for symbol, result in zip(unique_symbols, results):
+        if isinstance(result, Exception):
+            logger.warning(f"Could not get current price for {symbol}: {str(result)}")
+            prices[symbol] = None
+        else:
+            prices[symbol] = result
+    return prices
+
+def _risk_metrics_cache_key(user_id, closed_stats, open_trades: List[Trade]) -> str:
+    """
+    Cache key for risk metrics, fingerprinting the inputs they depend on.
+    Trade ids are UUIDs (not monotonic), so use counts, latest timestamps and
+    the realized P&L (from the closed-trade aggregate row, see
+    _closed_trade_stats) instead; the date is included because the equity
+    curve is a 30-day window.
+    """
+    last_entry = max((t.entry_time for t in open_trades if t.entry_time), default=None)
+    return (
+        f"portfolio:risk:{user_id}:{datetime.utcnow().date()}:"
+        f"{closed_stats.closed}:{closed_stats.last_exit}:{closed_stats.realized_pnl}:"
+        f"{len(open_trades)}:{last_entry}"
+    )
+
+async def _get_or_create_portfolio(db: AsyncSession, user_id) -> Portfolio:
+    """
+    Return the user's portfolio, creating it on first access.
+    Creation is a single INSERT ... ON CONFLICT DO NOTHING RETURNING, so two
+    concurrent first requests cannot both insert. The caller commits.
+    """
+    by_user = select(Portfolio).where(Portfolio.user_id == user_id)
+    portfolio = (await db.execute(by_user)).scalars().first()
+    if portfolio:
+        return portfolio
+    
+    stmt = (
+        pg_insert(Portfolio)
+        .values(
             user_id=user_id,
             total_value=100000.0,
             cash_balance=100000.0,
@@ -45,17 +110,55 @@ async def get_portfolio_summary(
             win_rate=0.0,
             max_drawdown=0.0
         )
-        db.add(portfolio)
-        db.commit()
-        db.refresh(portfolio)
-    
-    # Calculate real-time stats from trades (filtered by user)
-    trade_query = db.query(Trade)
-    if current_user:
-        trade_query = trade_query.filter(Trade.user_id == current_user.id)
-    
-    open_trades = trade_query.filter(Trade.status == "OPEN").all()
-    closed_trades = trade_query.filter(Trade.status == "CLOSED").all()
+        .on_conflict_do_nothing(index_elements=["user_id"])
+        .returning(Portfolio)
+    )
+    portfolio = (await db.execute(stmt)).scalar_one_or_none()
+    if portfolio is None:
+        # A concurrent request created it first
+        portfolio = (await db.execute(by_user)).scalars().first()
+    return portfolio
+
+async def _closed_trade_stats(db: AsyncSession, user_id, start_of_today: datetime):
+    """
+    One aggregate row over the user's trades: total count, and for closed
+    trades count, wins, realized P&L (overall and since start_of_today) and
+    the latest exit. The summary needs no closed Trade rows beyond this.
+    """
+    closed = Trade.status == "CLOSED"
+    return (await db.execute(
+        select(
+            func.count().label("trades"),
+            func.count().filter(closed).label("closed"),
+            func.count().filter(closed, Trade.pnl > 0).label("wins"),
+            func.coalesce(func.sum(Trade.pnl).filter(closed), 0.0).label("realized_pnl"),
+            func.coalesce(
+                func.sum(Trade.pnl).filter(closed, Trade.exit_time >= start_of_today), 0.0
+            ).label("daily_pnl"),
+            func.max(Trade.exit_time).filter(closed).label("last_exit"),
+        ).where(Trade.user_id == user_id)
+    )).one()
+
+@router.get("/portfolio/summary")
+async def get_portfolio_summary(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserResponse = Depends(get_current_user_async)
+):
+    """Get portfolio summary (KPIs)"""
+    # Get portfolio for user
+    user_id = current_user.uuid
+    
+    # Short-lived cache: dashboard polling hits this every few seconds
+    cache_key = portfolio_cache_keys(user_id)[0]
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return cached
+    portfolio = await _get_or_create_portfolio(db, user_id)
+    open_trades = (await db.execute(
+        select(Trade).where(Trade.user_id == user_id, Trade.status == "OPEN")
+    )).scalars().all()
+    start_of_today = datetime.combine(datetime.now().date(), time.min)
+    closed_stats = await _closed_trade_stats(db, user_id, start_of_today)
     
     # === CRITICAL FIX ===
     # Cash balance calculation:
@@ -69,8 +172,8 @@ async def get_portfolio_summary(
     # Calculate cost of open positions
     cost_of_open_positions = sum(float(t.entry_price) * float(t.quantity) for t in open_trades)
     
-    # Calculate realized PnL from closed trades
-    realized_pnl = sum(t.pnl for t in closed_trades if t.pnl)
+    # Realized PnL from closed trades
+    realized_pnl = closed_stats.realized_pnl
     
     # RECALCULATE cash_balance correctly:
     # cash_balance = initial_capital - cost_of_open_positions + realized_pnl
@@ -83,23 +186,22 @@ async def get_portfolio_summary(
     unrealized_pnl = 0
     positions_current_value = 0
     
+    current_prices = await _fetch_current_prices(market_collector, (t.symbol for t in open_trades))
+    
     for trade in open_trades:
-        try:
-            # Get current price from market
-            ticker_data = await market_collector.get_ticker(trade.symbol)
-            current_price = float(ticker_data['close'])
-            
-            # Calculate position value at current price
-            position_value_at_current = float(trade.quantity) * current_price
-            positions_current_value += position_value_at_current
-            
-            # Calculate unrealized PnL for this position
-            trade_unrealized_pnl = float(trade.quantity) * (current_price - float(trade.entry_price))
-            unrealized_pnl += trade_unrealized_pnl
-        except Exception as e:
+        current_price = current_prices.get(trade.symbol)
+        if current_price is None:
             # Fallback: use entry price if current price not available
-            logger.warning(f"Could not get current price for {trade.symbol}: {str(e)}")
             positions_current_value += float(trade.quantity) * float(trade.entry_price)
+            continue
+        
+        # Calculate position value at current price
+        position_value_at_current = float(trade.quantity) * current_price
+        positions_current_value += position_value_at_current
+        
+        # Calculate unrealized PnL for this position
+        trade_unrealized_pnl = float(trade.quantity) * (current_price - float(trade.entry_price))
+        unrealized_pnl += trade_unrealized_pnl
     
     # Update portfolio stats
     # CRITICAL: Total PnL = Realized + Unrealized
@@ -111,51 +213,57 @@ async def get_portfolio_summary(
     portfolio.total_value = recalculated_cash_balance + positions_current_value
     
     # Calculate win rate from closed trades
-    if len(closed_trades) > 0:
-        winning_trades = [t for t in closed_trades if t.pnl and t.pnl > 0]
-        portfolio.win_rate = (len(winning_trades) / len(closed_trades)) * 100
+    if closed_stats.closed > 0:
+        portfolio.win_rate = (closed_stats.wins / closed_stats.closed) * 100
     else:
         portfolio.win_rate = 0.0
     
-    db.commit()
-    
-    # Get recent trades
-    recent_trades = db.query(Trade).order_by(desc(Trade.entry_time)).limit(5).all()
-    
-    # Calculate advanced risk metrics
-    trades_data = [
-        {
-            'status': t.status,
-            'pnl': t.pnl
-        }
-        for t in db.query(Trade).all()
-    ]
-    
-    # Get equity curve for max drawdown calculation
-    equity_curve_response = await get_equity_curve(30, db, current_user)
-    equity_data = equity_curve_response.get('data', [])
-    
-    # Calculate all risk metrics
-    risk_metrics = RiskCalculator.calculate_all_metrics(
-        trades=trades_data,
-        equity_curve=equity_data
-    )
+    # Calculate advanced risk metrics (only recomputed when the user's trades
+    # change); the closed trades themselves are only loaded on a miss
+    risk_key = _risk_metrics_cache_key(user_id, closed_stats, open_trades)
+    risk_metrics = await cache_get(risk_key)
+    risk_cached = risk_metrics is not None
+    
+    if not risk_cached:
+        closed_trades = (await db.execute(
+            select(
+                Trade.status, Trade.pnl, Trade.entry_time, Trade.exit_time,
+                Trade.quantity, Trade.entry_price
+            ).where(Trade.user_id == user_id, Trade.status == "CLOSED")
+        )).all()
+        trades_data = [
+            {
+                'status': t.status,
+                'pnl': t.pnl
+            }
+            for t in closed_trades
+        ]
+        
+        # Equity curve for max drawdown calculation, from the trades already loaded
+        cutoff_date = datetime.utcnow() - timedelta(days=30)
+        equity_data = _equity_curve_points(
+            portfolio.cash_balance,
+            [t for t in (*open_trades, *closed_trades) if t.entry_time and t.entry_time >= cutoff_date],
+            30
+        )
+        
+        # Calculate all risk metrics
+        risk_metrics = RiskCalculator.calculate_all_metrics(
+            trades=trades_data,
+            equity_curve=equity_data
+        )
     
     # Update max_drawdown in portfolio
     portfolio.max_drawdown = risk_metrics.get('max_drawdown_pct', 0.0)
     
     # === CRITICAL FIX #24: Calculate daily_pnl from trades closed TODAY ===
-    today = datetime.now().date()
-    daily_pnl = 0.0
-    for trade in closed_trades:
-        # Check if trade was closed today
-        if trade.exit_time and trade.exit_time.date() == today:
-            daily_pnl += (trade.pnl or 0)
-    portfolio.daily_pnl = daily_pnl
+    portfolio.daily_pnl = closed_stats.daily_pnl
     
-    db.commit()
+    # Flushed with RETURNING of the onupdate updated_at (Portfolio eager_defaults),
+    # so the loaded portfolio can be read after commit without a refresh
+    await db.commit()
     
-    return {
+    response = {
         "portfolio_value": portfolio.total_value,
         "cash_balance": portfolio.cash_balance,
         "daily_pnl": portfolio.daily_pnl,
@@ -163,8 +271,8 @@ async def get_portfolio_summary(
         "win_rate": portfolio.win_rate,
         "max_drawdown": portfolio.max_drawdown,
         "open_positions_count": len(open_trades),
-        "recent_trades_count": len(recent_trades),
-        "last_updated": portfolio.updated_at.isoformat(),
+        "recent_trades_count": min(closed_stats.trades, 5),
+        "last_updated": portfolio.updated_at,
         # Advanced risk metrics
         "sharpe_ratio": risk_metrics.get('sharpe_ratio', 0.0),
         "average_win": risk_metrics.get('average_win', 0.0),
@@ -175,11 +283,47 @@ async def get_portfolio_summary(
         "largest_win": risk_metrics.get('largest_win', 0.0),
         "largest_loss": risk_metrics.get('largest_loss', 0.0)
     }
+    
+    if not risk_cached:
+        await cache_set(risk_key, risk_metrics, RISK_METRICS_CACHE_TTL)
+    await cache_set(cache_key, response, settings.PORTFOLIO_SUMMARY_CACHE_TTL)
+    
+    return response
+
+# Position sorts the database can do (stored columns); the rest are derived from live prices
+POSITION_SQL_SORT_COLUMNS = {
+    "symbol": Trade.symbol,
+    "entry_price": Trade.entry_price,
+}
+POSITION_DERIVED_SORT_KEYS = {
+    "current_price": itemgetter("current_price"),
+    "unrealized_pnl": itemgetter("unrealized_pnl"),
+}
+
+async def _load_open_positions(db: AsyncSession, user_id=None, order_by=None):
+    """Load open trades (filtered by user if given) and the names of their bots."""
+    query = select(Trade).where(Trade.status == "OPEN")
+    
+    # Filter by user if authenticated
+    if user_id:
+        query = query.where(Trade.user_id == user_id)
+    
+    if order_by is not None:
+        query = query.order_by(order_by)
+    
+    open_trades = (await db.execute(query)).scalars().all()
+    
+    # One IN query for all bot names instead of one lookup per trade
+    bot_ids = {t.bot_id for t in open_trades if t.bot_id}
+    bot_names = {}
+    if bot_ids:
+        bot_names = dict((await db.execute(select(Bot.id, Bot.name).where(Bot.id.in_(bot_ids)))).all())
+    return open_trades, bot_names
 
 @router.get("/portfolio/positions")
 async def get_positions(
-    db: Session = Depends(get_db),
-    current_user: Optional[UserResponse] = Depends(get_optional_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Optional[UserResponse] = Depends(get_optional_user_async),
     sort_by: str = "symbol",  # symbol, entry_price, current_price, unrealized_pnl
     sort_order: str = "asc",  # asc, desc
     symbol_filter: str = None,
@@ -187,40 +331,33 @@ async def get_positions(
     max_pnl: float = None
 ):
     """Get current open positions with sorting and filtering"""
-    from app.models.database_models import Bot
-    from sqlalchemy import func as db_func
-    
-    query = db.query(Trade).filter(Trade.status == "OPEN")
-    
-    # Filter by user if authenticated
-    if current_user:
-        query = query.filter(Trade.user_id == current_user.id)
-    
-    open_trades = query.all()
+    sort_desc = sort_order.lower() == "desc"
+    derived_sort_key = POSITION_DERIVED_SORT_KEYS.get(sort_by)
+    sql_order_by = None
+    if derived_sort_key is None:
+        # Default: symbol
+        sort_column = POSITION_SQL_SORT_COLUMNS.get(sort_by, Trade.symbol)
+        sql_order_by = sort_column.desc() if sort_desc else sort_column.asc()
+    
+    open_trades, bot_names = await _load_open_positions(
+        db, current_user.uuid if current_user else None, sql_order_by
+    )
     
     positions = []
     market_collector = MarketDataCollector()
+    current_prices = await _fetch_current_prices(market_collector, (t.symbol for t in open_trades))
     
     for trade in open_trades:
         # Get bot name if this trade is from a bot
-        bot_name = None
-        if trade.bot_id:
-            bot = db.query(Bot).filter(Bot.id == trade.bot_id).first()
-            if bot:
-                bot_name = bot.name
+        bot_name = bot_names.get(trade.bot_id)
         
         # === CRITICAL FIX #1: Always fetch current price from market ===
         # Never use entry_price as fallback - force real market data
-        current_price = None
-        try:
-            ticker_data = await market_collector.get_ticker(trade.symbol)
-            current_price = float(ticker_data['close'])
-            logger.debug(f"✓ Fetched {trade.symbol}: ${current_price:.2f}")
-        except Exception as e:
-            logger.warning(f"⚠️ Could not get current price for {trade.symbol}: {str(e)}")
+        current_price = current_prices.get(trade.symbol)
+        if current_price is None:
             # STILL use entry price if API fails, but log it clearly
             current_price = float(trade.entry_price)
-            logger.warning(f"   Fallback: Using entry_price ${current_price:.2f}")
+            logger.warning(f"   Fallback: Using entry_price ${current_price:.2f} for {trade.symbol}")
         
         # === CRITICAL FIX #2: Calculate unrealized PnL correctly ===
         # Always use: (current_price - entry_price) * quantity
@@ -258,32 +395,40 @@ async def get_positions(
             "unrealized_pnl_percent": unrealized_pnl_percent,
             "strategy": trade.strategy,
             "bot_name": bot_name,
-            "entry_time": trade.entry_time.isoformat()
+            "entry_time": trade.entry_time
         })
     
-    # Apply sorting
-    sort_order_asc = sort_order.lower() != "desc"
-    
-    if sort_by == "entry_price":
-        positions.sort(key=lambda x: x["entry_price"], reverse=not sort_order_asc)
-    elif sort_by == "current_price":
-        positions.sort(key=lambda x: x["current_price"], reverse=not sort_order_asc)
-    elif sort_by == "unrealized_pnl":
-        positions.sort(key=lambda x: x["unrealized_pnl"], reverse=not sort_order_asc)
-    else:  # Default: symbol
-        positions.sort(key=lambda x: x["symbol"], reverse=not sort_order_asc)
+    # Stored columns were already ordered by the query; only live-price sorts remain
+    if derived_sort_key is not None:
+        positions.sort(key=derived_sort_key, reverse=sort_desc)
     
     return positions
 
 @router.post("/portfolio/orders")
 async def create_order(
     order: OrderCreate, 
-    db: Session = Depends(get_db),
-    current_user: Optional[UserResponse] = Depends(get_optional_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Optional[UserResponse] = Depends(get_optional_user_async)
 ):
     """Execute a new order (Buy/Sell)"""
-    user_id = current_user.id if current_user else "user_1"
-    portfolio = db.query(Portfolio).filter(Portfolio.user_id == user_id).first()
+    # Anonymous orders have no portfolio (404)
+    user_id = current_user.uuid if current_user else None
+    result = await _execute_order(db, order, user_id, current_user)
+    await invalidate_user_cache(user_id)
+    return result
+
+async def _execute_order(
+    db: AsyncSession,
+    order: OrderCreate,
+    user_id,
+    current_user: Optional[UserResponse]
+) -> dict:
+    """Apply an order to the portfolio and commit."""
+    portfolio = None
+    if user_id is not None:
+        portfolio = (await db.execute(
+            select(Portfolio).where(Portfolio.user_id == user_id)
+        )).scalars().first()
     
     if not portfolio:
         raise HTTPException(status_code=404, detail="Portfolio not found")
@@ -297,8 +442,8 @@ async def create_order(
         portfolio.cash_balance -= total_cost
         
         new_trade = Trade(
-            user_id=current_user.id if current_user else None,
-            bot_id="manual",
+            user_id=current_user.uuid if current_user else None,
+            bot_id=None,  # Manual order (bot_id is a UUID column)
             symbol=order.symbol,
             side="BUY",
             entry_price=order.price,
@@ -317,15 +462,15 @@ async def create_order(
         # For now, we just create a SELL trade or close an existing one
         
         # Try to find an open BUY trade to close (filtered by user)
-        trade_query = db.query(Trade).filter(
+        trade_query = select(Trade).where(
             Trade.symbol == order.symbol, 
             Trade.side == "BUY", 
             Trade.status == "OPEN"
         )
         if current_user:
-            trade_query = trade_query.filter(Trade.user_id == current_user.id)
+            trade_query = trade_query.where(Trade.user_id == current_user.uuid)
         
-        open_trade = trade_query.first()
+        open_trade = (await db.execute(trade_query.limit(1))).scalars().first()
         
         if open_trade:
             # Close the trade
@@ -333,15 +478,16 @@ async def create_order(
             open_trade.exit_price = order.price
             open_trade.exit_time = datetime.utcnow()
             
-            pnl = (order.price - open_trade.entry_price) * open_trade.quantity
+            diff = order.price - open_trade.entry_price
+            pnl = diff * open_trade.quantity
             open_trade.pnl = pnl
-            open_trade.pnl_percent = (pnl / (open_trade.entry_price * open_trade.quantity)) * 100
+            open_trade.pnl_percent = (diff / open_trade.entry_price) * 100
             
             portfolio.cash_balance += (order.quantity * order.price)
             portfolio.total_pnl += pnl
             
             # Return the closed trade info
-            db.commit()
+            await db.commit()
             return {"message": "Position closed", "pnl": pnl, "new_balance": portfolio.cash_balance}
         else:
             # No position to sell - reject the order
@@ -350,11 +496,58 @@ async def create_order(
                 detail=f"No open BUY position found for {order.symbol}. Cannot sell without a position."
             )
             
-    db.commit()
+    await db.commit()
     return {"message": "Order executed successfully", "new_balance": portfolio.cash_balance}
 
+# Trade columns listed by /trades and /portfolio/trade-history (plain rows, no ORM objects)
+TRADE_LIST_COLUMNS = (
+    Trade.id, Trade.symbol, Trade.side, Trade.entry_price, Trade.exit_price,
+    Trade.quantity, Trade.pnl, Trade.pnl_percent, Trade.status, Trade.strategy,
+    Trade.entry_time, Trade.exit_time,
+)
+
+def _trade_list_query(db: Session):
+    """Trade list rows with the bot name joined in (one query instead of a lookup per trade)."""
+    return db.query(*TRADE_LIST_COLUMNS, Bot.name.label("bot_name")).outerjoin(
+        Bot, Bot.id == Trade.bot_id
+    )
+
+def _window_total(rows, query, offset: int) -> int:
+    """
+    Total row count from a page fetched with a COUNT(*) OVER () column.
+    A page past the end has no rows to carry the total, so count separately then.
+    """
+    if rows:
+        return rows[0].total_count
+    return query.count() if offset > 0 else 0
+
+def _encode_trade_cursor(trade_time: Optional[datetime], trade_id) -> str:
+    """Keyset cursor for trade history: '<iso time>_<trade id>' (time empty when NULL)."""
+    return f"{trade_time.isoformat() if trade_time else ''}_{trade_id}"
+
+def _decode_trade_cursor(cursor: str):
+    """Inverse of _encode_trade_cursor. Raises ValueError on malformed input."""
+    time_part, sep, id_part = cursor.partition("_")
+    if not sep:
+        raise ValueError("cursor has no trade id")
+    return (datetime.fromisoformat(time_part) if time_part else None), uuid.UUID(id_part)
+
+def _trade_seek(sort_column, sort_order: str, cursor_time: Optional[datetime], cursor_id):
+    """
+    Rows after (cursor_time, cursor_id) in the trade history ordering:
+    NULL times sort last when descending and first when ascending, and a
+    row comparison alone would drop them (it is NULL for a NULL time).
+    """
+    if sort_order == "desc":
+        if cursor_time is None:
+            return and_(sort_column.is_(None), Trade.id < cursor_id)
+        return or_(tuple_(sort_column, Trade.id) < (cursor_time, cursor_id), sort_column.is_(None))
+    if cursor_time is None:
+        return or_(and_(sort_column.is_(None), Trade.id > cursor_id), sort_column.isnot(None))
+    return tuple_(sort_column, Trade.id) > (cursor_time, cursor_id)
+
 @router.get("/trades")
-async def get_trades(
+def get_trades(
     limit: int = 20,
     offset: int = 0,
     status: str = None,
@@ -362,9 +555,7 @@ async def get_trades(
     current_user: Optional[UserResponse] = Depends(get_optional_user)
 ):
     """Get trades with pagination and filtering"""
-    from app.models.database_models import Bot
-    
-    query = db.query(Trade)
+    query = _trade_list_query(db)
     
     # Filter by user if authenticated
     if current_user:
@@ -373,19 +564,18 @@ async def get_trades(
     if status:
         query = query.filter(Trade.status == status)
     
-    total = query.count()
-    trades = query.order_by(desc(Trade.entry_time)).offset(offset).limit(limit).all()
+    # Total comes back with the page via COUNT(*) OVER () - one scan instead of two
+    rows = (
+        query.add_columns(func.count().over().label("total_count"))
+        .order_by(desc(Trade.entry_time))
+        .offset(offset)
+        .limit(limit)
+        .all()
+    )
+    total = _window_total(rows, query, offset)
     
-    trades_response = []
-    for trade in trades:
-        # Get bot name if this trade is from a bot
-        bot_name = None
-        if trade.bot_id:
-            bot = db.query(Bot).filter(Bot.id == trade.bot_id).first()
-            if bot:
-                bot_name = bot.name
-        
-        trades_response.append({
+    trades_response = [
+        {
             "id": trade.id,
             "symbol": trade.symbol,
             "side": trade.side,
@@ -396,10 +586,12 @@ async def get_trades(
             "pnl_percent": trade.pnl_percent,
             "status": trade.status,
             "strategy": trade.strategy,
-            "bot_name": bot_name,
-            "entry_time": trade.entry_time.isoformat() if trade.entry_time else None,
-            "exit_time": trade.exit_time.isoformat() if trade.exit_time else None,
-        })
+            "bot_name": trade.bot_name,
+            "entry_time": trade.entry_time,
+            "exit_time": trade.exit_time,
+        }
+        for trade in rows
+    ]
     
     return {
         "total": total,
@@ -409,7 +601,7 @@ async def get_trades(
     }
 
 @router.get("/portfolio/trade-history")
-async def get_trade_history(
+def get_trade_history(
     db: Session = Depends(get_db),
     current_user: UserResponse = Depends(get_current_user),
     page: int = 1,
@@ -419,7 +611,8 @@ async def get_trade_history(
     symbol_filter: str = None,
     status_filter: str = "CLOSED",  # CLOSED, OPEN, ALL
     min_pnl: float = None,
-    max_pnl: float = None
+    max_pnl: float = None,
+    cursor: str = None
 ):
     """
     Get trade history with pagination, sorting, and filtering
@@ -433,6 +626,8 @@ async def get_trade_history(
     - status_filter: CLOSED, OPEN, or ALL
     - min_pnl: Minimum PnL filter
     - max_pnl: Maximum PnL filter
+    - cursor: next_cursor from the previous page; switches to keyset pagination
+      (time ordering only, page is ignored and totals are not computed)
     """
     user_id = current_user.id
     
@@ -442,7 +637,7 @@ async def get_trade_history(
     sort_order = "desc" if sort_order.lower() == "desc" else "asc"
     
     # Build query
-    query = db.query(Trade).filter(Trade.user_id == user_id)
+    query = _trade_list_query(db).filter(Trade.user_id == user_id)
     
     # Apply status filter
     if status_filter and status_filter.upper() != "ALL":
@@ -465,50 +660,73 @@ async def get_trade_history(
         sort_column = Trade.pnl
     elif sort_by == "status":
         sort_column = Trade.status
-    else:  # Default to entry_time, but prefer exit_time if available (for closed trades)
-        # For trades, we want to sort by exit_time (when trade closed) if available,
-        # otherwise by entry_time (when trade opened)
-        # This ensures most recent closed trades appear first
-        sort_column = Trade.exit_time
+    else:  # Default to time ordering
+        # Closed trades sort by exit_time (when the trade closed) so the most
+        # recent closes appear first; OPEN/ALL have no exit_time on open trades,
+        # so they sort by entry_time (when the trade opened)
+        sort_column = Trade.exit_time if (status_filter or "").upper() == "CLOSED" else Trade.entry_time
+    time_sort = sort_by not in ("symbol", "pnl", "status")
     
     if sort_order == "desc":
-        query = query.order_by(sort_column.desc().nullslast())
+        query = query.order_by(sort_column.desc().nullslast(), Trade.id.desc())
     else:
-        query = query.order_by(sort_column.asc().nullsfirst())
+        query = query.order_by(sort_column.asc().nullsfirst(), Trade.id.asc())
     
-    # Calculate pagination
-    total_trades = query.count()
-    total_pages = (total_trades + page_size - 1) // page_size
+    if cursor:
+        # Keyset pagination: seek past the last row of the previous page
+        # instead of OFFSET-scanning every row before it
+        if not time_sort:
+            raise HTTPException(status_code=400, detail="cursor is only supported with time ordering")
+        try:
+            cursor_time, cursor_id = _decode_trade_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.filter(_trade_seek(sort_column, sort_order, cursor_time, cursor_id))
+        
+        trades = query.limit(page_size + 1).all()
+        has_next = len(trades) > page_size
+        trades = trades[:page_size]
+        has_prev = True
+        total_trades = None
+        total_pages = None
+    else:
+        # Apply pagination (total comes back with the page via COUNT(*) OVER ())
+        offset = (page - 1) * page_size
+        rows = (
+            query.add_columns(func.count().over().label("total_count"))
+            .offset(offset)
+            .limit(page_size)
+            .all()
+        )
+        trades = rows
+        total_trades = _window_total(rows, query, offset)
+        total_pages = (total_trades + page_size - 1) // page_size
+        has_next = page < total_pages
+        has_prev = page > 1
     
-    # Apply pagination
-    offset = (page - 1) * page_size
-    trades = query.offset(offset).limit(page_size).all()
+    next_cursor = None
+    if time_sort and has_next and trades:
+        next_cursor = _encode_trade_cursor(getattr(trades[-1], sort_column.key), trades[-1].id)
     
     # Format response
     trades_response = []
     for trade in trades:
-        bot_name = None
-        if trade.bot_id:
-            bot = db.query(Bot).filter(Bot.id == trade.bot_id).first()
-            if bot:
-                bot_name = bot.name
-        
         pnl_percent = (trade.pnl_percent or 0) if trade.pnl_percent is not None else 0
         
         trades_response.append({
             "id": str(trade.id),
             "symbol": trade.symbol,
             "side": trade.side,
-            "entry_price": float(trade.entry_price),
-            "exit_price": float(trade.exit_price) if trade.exit_price else None,
-            "quantity": float(trade.quantity),
-            "pnl": float(trade.pnl) if trade.pnl else 0,
-            "pnl_percent": float(pnl_percent),
+            "entry_price": trade.entry_price,
+            "exit_price": trade.exit_price or None,
+            "quantity": trade.quantity,
+            "pnl": trade.pnl or 0,
+            "pnl_percent": pnl_percent,
             "status": trade.status,
             "strategy": trade.strategy,
-            "bot_name": bot_name,
-            "entry_time": trade.entry_time.isoformat(),
-            "exit_time": trade.exit_time.isoformat() if trade.exit_time else None,
+            "bot_name": trade.bot_name,
+            "entry_time": trade.entry_time,
+            "exit_time": trade.exit_time,
             "duration_minutes": (trade.exit_time - trade.entry_time).total_seconds() / 60 if trade.exit_time else None
         })
     
@@ -518,8 +736,9 @@ async def get_trade_history(
             "page_size": page_size,
             "total_trades": total_trades,
             "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1
+            "has_next": has_next,
+            "has_prev": has_prev,
+            "next_cursor": next_cursor
         },
         "filters": {
             "status": status_filter,
@@ -534,63 +753,48 @@ async def get_trade_history(
         "trades": trades_response
     }
 
-@router.get("/portfolio/equity-curve")
-async def get_equity_curve(
-    days: int = 30, 
-    db: Session = Depends(get_db),
-    current_user: Optional[UserResponse] = Depends(get_optional_user)
-):
-    """Get equity curve data for last N days (calculated from actual trades)"""
-    user_id = current_user.id if current_user else "user_1"
-    portfolio = db.query(Portfolio).filter(Portfolio.user_id == user_id).first()
-    
-    if not portfolio:
-        return {"data": []}
-    
-    # Get all trades from the last N days
-    cutoff_date = datetime.utcnow() - timedelta(days=days)
-    all_trades = db.query(Trade).filter(
-        Trade.user_id == user_id,
-        Trade.entry_time >= cutoff_date
-    ).order_by(Trade.entry_time.asc()).all()
-    
-    # Calculate equity curve by simulating portfolio value over time
+def _equity_curve_points(cash_balance: float, trades, days: int) -> List[dict]:
+    """
+    Daily portfolio values for the last `days` days, simulated from the
+    cash balance and the trades entered in that window.
+    """
     data = []
-    running_balance = portfolio.cash_balance
-    today = datetime.utcnow()
-    
-    # Group trades by day
-    trades_by_day = {}
-    for trade in all_trades:
-        day = trade.entry_time.date()
-        if day not in trades_by_day:
-            trades_by_day[day] = {'closed': [], 'opened': []}
-        if trade.status == "CLOSED":
-            trades_by_day[day]['closed'].append(trade)
+    today = datetime.utcnow().date()
+    
+    # Convert each trade once to integer "days ago" indices so the per-day
+    # sweep below compares ints instead of calling .date() per trade per day
+    spans = []
+    for trade in trades:
+        entry_ago = (today - trade.entry_time.date()).days
+        if trade.status == "OPEN":
+            exit_ago = None
+        elif trade.status == "CLOSED" and trade.exit_time:
+            exit_ago = (today - trade.exit_time.date()).days
         else:
-            trades_by_day[day]['opened'].append(trade)
+            continue
+        position_value = trade.quantity * float(trade.entry_price)
+        spans.append((entry_ago, exit_ago, trade.pnl or 0, position_value))
     
     # Build equity curve day by day
     for i in range(days):
-        current_date = (today - timedelta(days=days-i)).date()
+        days_ago = days - i
+        current_date = today - timedelta(days=days_ago)
         
         # Start with cash balance
-        daily_value = portfolio.cash_balance
+        daily_value = cash_balance
         daily_pnl = 0
         
-        # Add realized PnL from trades closed up to this date
-        for trade in all_trades:
-            if trade.entry_time.date() <= current_date and trade.status == "CLOSED" and trade.exit_time.date() <= current_date:
-                daily_pnl += (trade.pnl or 0)
-        
-        # Add unrealized PnL from positions still open at this date
-        open_at_date = [t for t in all_trades if t.entry_time.date() <= current_date and (t.status == "OPEN" or (t.status == "CLOSED" and t.exit_time.date() > current_date))]
-        for trade in open_at_date:
-            if trade.status == "OPEN" or (trade.status == "CLOSED" and trade.exit_time.date() > current_date):
-                # This position is open at this date
+        for entry_ago, exit_ago, pnl, position_value in spans:
+            if entry_ago < days_ago:
+                # Not opened yet at this date
+                continue
+            if exit_ago is not None and exit_ago >= days_ago:
+                # Realized PnL from trades closed up to this date
+                daily_pnl += pnl
+            else:
+                # Position still open at this date
                 # We would need current price at this date for exact calculation
                 # For now, use entry price (conservative estimate)
-                position_value = trade.quantity * float(trade.entry_price)
                 daily_value += position_value
         
         # Apply all PnL
@@ -601,4 +805,36 @@ async def get_equity_curve(
             "value": round(daily_value, 2)
         })
     
+    return data
+
+@router.get("/portfolio/equity-curve")
+async def get_equity_curve(
+    days: int = 30, 
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Optional[UserResponse] = Depends(get_optional_user_async)
+):
+    """Get equity curve data for last N days (calculated from actual trades)"""
+    if not current_user:
+        return {"data": []}  # Anonymous users have no portfolio
+    user_id = current_user.uuid
+    portfolio = (await db.execute(
+        select(Portfolio.cash_balance, Portfolio.total_value).where(Portfolio.user_id == user_id)
+    )).first()
+    
+    if not portfolio:
+        return {"data": []}
+    
+    # Get all trades from the last N days (only the columns the curve uses)
+    cutoff_date = datetime.utcnow() - timedelta(days=days)
+    all_trades = (await db.execute(
+        select(
+            Trade.entry_time, Trade.exit_time, Trade.status, Trade.pnl,
+            Trade.quantity, Trade.entry_price
+        ).where(
+            Trade.user_id == user_id,
+            Trade.entry_time >= cutoff_date
+        )
+    )).all()
+    
+    data = _equity_curve_points(portfolio.cash_balance, all_trades, days)
     return {"data": data, "current_value": portfolio.total_value}
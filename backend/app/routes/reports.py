@@ -1,153 +1,418 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.db.database import get_db
-from app.models.database_models import Bot, Trade, StrategyPerformance, Portfolio
-from app.auth.local_auth import get_current_user, UserResponse
-from sqlalchemy import func, desc
-from datetime import datetime, timedelta
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import AsyncSessionLocal, get_async_db
+from app.models.database_models import Bot, Trade, StrategyPerformance, Portfolio, PortfolioHistory
+from app.auth.local_auth import get_current_user_async, UserResponse
+from sqlalchemy import and_, func, desc, tuple_, select, literal_column
+from app.db.redis_client import cache_get, cache_set, report_cache_key, report_cache_version
+from app.config import settings
+from app.http_cache import etag_matches
+from datetime import date, datetime, timedelta
+import functools
+import hashlib
+import inspect
 import logging
+import orjson
+from collections import defaultdict, namedtuple
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/reports", tags=["reports"])
 
+def _closed_since(user_id, since: datetime):
+    """Conditions selecting a user's trades closed, entered since `since`."""
+    return (
+        Trade.user_id == user_id,
+        Trade.status == "CLOSED",
+        Trade.entry_time >= since
+    )
+
+# Strategy / market context group keys ("UNKNOWN" when the trade has none).
+# The default is inlined so SELECT and GROUP BY render the same expression.
+_UNKNOWN = literal_column("'UNKNOWN'")
+_STRATEGY_KEY = func.coalesce(Trade.strategy, _UNKNOWN).label("strategy")
+_CONTEXT_KEY = func.coalesce(Trade.market_context, _UNKNOWN).label("market_context")
+
+StrategyRollup = namedtuple("StrategyRollup", "totals contexts recent_trades")
+
+async def _strategy_rollup(db: AsyncSession, user_id, since: datetime, strategy: str = None) -> StrategyRollup:
+    """
+    Per-strategy totals and per (strategy, market context) stats for a user,
+    from one GROUPING SETS scan of their closed trades (index-only on
+    idx_trades_user_status_entry_ctx). With a strategy, the scan is limited
+    to it and its 10 most recent closed trades are fetched.
+    
+    totals maps strategy -> aggregate row, contexts maps strategy ->
+    {market_context: aggregate row} (rows carry the _pnl_aggregates labels).
+    """
+    conds = list(_closed_since(user_id, since))
+    if strategy:
+        conds.append(Trade.strategy == strategy)
+    
+    # GROUPING(context) = 1 marks the strategy-wide rows
+    rows = (await db.execute(
+        select(
+            _STRATEGY_KEY,
+            _CONTEXT_KEY,
+            func.grouping(_CONTEXT_KEY.element).label("is_strategy_total"),
+            *_pnl_aggregates()
+        ).where(*conds).group_by(
+            func.grouping_sets(
+                tuple_(_STRATEGY_KEY.element, _CONTEXT_KEY.element),
+                tuple_(_STRATEGY_KEY.element)
+            )
+        )
+    )).all()
+    
+    totals = {}
+    contexts = defaultdict(dict)
+    for row in rows:
+        if row.is_strategy_total:
+            totals[row.strategy] = row
+        else:
+            contexts[row.strategy][row.market_context] = row
+    
+    recent_trades = []
+    if strategy:
+        recent_trades = (await db.execute(
+            select(
+                Trade.id, Trade.symbol, Trade.entry_price, Trade.exit_price,
+                Trade.pnl, Trade.pnl_percent, Trade.market_context, Trade.exit_time
+            ).where(
+                *_closed_since(user_id, since),
+                Trade.strategy == strategy
+            ).order_by(desc(Trade.exit_time)).limit(10)
+        )).all()
+    
+    return StrategyRollup(totals, contexts, recent_trades)
+
+async def _report_etag(db: AsyncSession, user_id, endpoint: str, params: dict) -> str:
+    """
+    ETag for a report response: a fingerprint of the user's trades, bots and
+    portfolio (counts + latest timestamps, one indexed query) combined with
+    the endpoint, query params and current UTC date.
+    """
+    fingerprint = (await db.execute(select(
+        select(func.count(Trade.id)).where(Trade.user_id == user_id).scalar_subquery(),
+        select(func.max(Trade.entry_time)).where(Trade.user_id == user_id).scalar_subquery(),
+        select(func.max(Trade.exit_time)).where(Trade.user_id == user_id).scalar_subquery(),
+        select(func.count(Bot.id)).where(Bot.user_id == user_id).scalar_subquery(),
+        select(func.max(Bot.updated_at)).where(Bot.user_id == user_id).scalar_subquery(),
+        select(Portfolio.updated_at).where(Portfolio.user_id == user_id).limit(1).scalar_subquery(),
+    ))).one()
+    query = sorted(params.items())
+    source = f"reports:{user_id}:{endpoint}:{query}|{datetime.utcnow().date()}|{tuple(fingerprint)}"
+    return '"' + hashlib.sha1(source.encode()).hexdigest() + '"'
+
+async def _global_report_etag(db: AsyncSession, endpoint: str) -> str:
+    """
+    ETag for a cross-user report built from closed trades: closed-trade count
+    and latest entry (index-only on idx_trades_status_entry) plus UTC date.
+    """
+    fingerprint = (await db.execute(
+        select(func.count(Trade.id), func.max(Trade.entry_time)).where(Trade.status == "CLOSED")
+    )).one()
+    source = f"reports:global:{endpoint}|{datetime.utcnow().date()}|{tuple(fingerprint)}"
+    return '"' + hashlib.sha1(source.encode()).hexdigest() + '"'
+
+def _revalidation_headers(etag: str, scope: str = "private") -> dict:
+    """ETag plus a short Cache-Control (max-age + stale-while-revalidate)."""
+    return {
+        "ETag": etag,
+        "Cache-Control": (
+            f"{scope}, max-age={settings.REPORTS_HTTP_MAX_AGE}, "
+            f"stale-while-revalidate={settings.REPORTS_HTTP_STALE_WHILE_REVALIDATE}"
+        ),
+    }
+
+def _with_request_response(wrapper, handler):
+    """Expose request/response to FastAPI alongside the handler's own params."""
+    signature = inspect.signature(handler)
+    wrapper.__signature__ = signature.replace(parameters=[
+        *signature.parameters.values(),
+        inspect.Parameter("request", inspect.Parameter.KEYWORD_ONLY, annotation=Request),
+        inspect.Parameter("response", inspect.Parameter.KEYWORD_ONLY, annotation=Response),
+    ])
+    return wrapper
+
+def _report_params(kwargs: dict) -> dict:
+    """A report handler's query params (its arguments minus dependencies)."""
+    return {k: v for k, v in kwargs.items() if k not in ("current_user", "db")}
+
+async def _serve_cached(request: Request, response: Response, key, ttl: int, make_etag, scope: str, handler, kwargs):
+    """
+    Answer a report from its Redis entry, which holds the body together with
+    the ETag it was built under, so every 304 and every body come from the
+    same snapshot. Only a miss (or no key: Redis off) calls make_etag() and
+    the handler, then stores both.
+    """
+    hit = await cache_get(key) if key else None
+    if hit is not None:
+        etag, body = hit["etag"], hit["body"]
+    else:
+        etag, body = await make_etag(), None
+    
+    headers = _revalidation_headers(etag, scope)
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    
+    if body is None:
+        body = await handler(**kwargs)
+        if isinstance(body, Response):  # streamed bodies are not cached
+            body.headers.update(headers)
+            return body
+        if key:
+            await cache_set(key, {"etag": etag, "body": body}, ttl)
+    response.headers.update(headers)
+    return body
+
+def _cached_report(endpoint: str):
+    """
+    Cache a per-user report response in Redis for REPORTS_CACHE_TTL seconds,
+    together with its ETag. Keyed by user, report version, endpoint and query
+    params; the version is bumped when the user's trades change (see
+    app.db.redis_client).
+    
+    Responses are revalidated with that ETag, so polling clients sending
+    If-None-Match get a 304 without the report being rebuilt. A cache hit
+    answers both from Redis; only a miss (or Redis being off) computes the
+    per-user _report_etag from the database.
+    """
+    def decorator(handler):
+        @functools.wraps(handler)
+        async def wrapper(request: Request, response: Response, **kwargs):
+            user_id = kwargs["current_user"].id
+            params = _report_params(kwargs)
+            version = await report_cache_version(user_id)  # None: caching disabled / Redis unreachable
+            key = report_cache_key(user_id, version, endpoint, params) if version is not None else None
+            return await _serve_cached(
+                request, response, key, settings.REPORTS_CACHE_TTL,
+                lambda: _report_etag(kwargs["db"], user_id, endpoint, params), "private",
+                handler, kwargs,
+            )
+        
+        return _with_request_response(wrapper, handler)
+    return decorator
+
+def _cached_global_report(endpoint: str):
+    """
+    Cache a cross-user report in Redis for GLOBAL_REPORTS_CACHE_TTL seconds
+    together with its ETag (not invalidated on writes; it ages out), and
+    revalidate it as a public response. _global_report_etag only runs on a
+    miss.
+    """
+    def decorator(handler):
+        @functools.wraps(handler)
+        async def wrapper(request: Request, response: Response, **kwargs):
+            return await _serve_cached(
+                request, response, f"reports:global:{endpoint}", settings.GLOBAL_REPORTS_CACHE_TTL,
+                lambda: _global_report_etag(kwargs["db"], endpoint), "public",
+                handler, kwargs,
+            )
+        
+        return _with_request_response(wrapper, handler)
+    return decorator
+
+def _pnl_aggregates(*where):
+    """
+    Labeled aggregate columns over Trade.pnl, so report endpoints get
+    counts/sums/extremes from one SQL scan instead of iterating rows in Python.
+    Win/loss splits are FILTERed aggregates; NULL pnl is skipped by SQL.
+    Optional where predicates restrict every aggregate (FILTER) so other
+    columns of the same scan can cover the wider row set.
+    """
+    def agg(column, *conds):
+        conds = (*where, *conds)
+        return column.filter(and_(*conds)) if conds else column
+    
+    return (
+        agg(func.count(Trade.id)).label("trades"),
+        func.coalesce(agg(func.sum(Trade.pnl)), 0.0).label("total_pnl"),
+        agg(func.count(Trade.id), Trade.pnl > 0).label("wins"),
+        agg(func.count(Trade.id), Trade.pnl < 0).label("losses"),
+        func.coalesce(agg(func.sum(Trade.pnl), Trade.pnl > 0), 0.0).label("win_pnl"),
+        func.coalesce(agg(func.sum(Trade.pnl), Trade.pnl < 0), 0.0).label("loss_pnl"),
+        agg(func.max(Trade.pnl)).label("max_pnl"),
+        agg(func.min(Trade.pnl)).label("min_pnl"),
+    )
+
+# Rows fetched per round trip when streaming large result sets (yield_per)
+STREAM_BATCH_SIZE = 1000
+
+# Trade columns serialized by the trades report (row keys = response keys)
+TRADE_REPORT_COLUMNS = (
+    Trade.id, Trade.symbol, Trade.side, Trade.entry_price, Trade.exit_price,
+    Trade.quantity, Trade.pnl, Trade.pnl_percent, Trade.status, Trade.strategy,
+    Trade.entry_time, Trade.exit_time, Trade.market_context,
+    Trade.market_context_confidence, Trade.stop_loss_price,
+    Trade.take_profit_price, Trade.trade_phase,
+)
+
+async def _stream_trades_report(report: dict, page):
+    """
+    JSON body of a trades report whose "trades" array is streamed from a
+    server-side cursor, STREAM_BATCH_SIZE rows per chunk. Uses its own
+    session: the request's is closed once the handler returns.
+    """
+    yield orjson.dumps(report)[:-1] + b',"trades":['
+    separator = b""
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(page.execution_options(yield_per=STREAM_BATCH_SIZE))
+        async for batch in result.partitions():
+            yield separator + b",".join(orjson.dumps(dict(row._mapping)) for row in batch)
+            separator = b","
+    yield b"]}"
+
 @router.get("/dashboard")
+@_cached_report("dashboard")
 async def get_dashboard_report(
-    current_user: UserResponse = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: UserResponse = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get dashboard summary report with comprehensive KPIs"""
     logger.info(f"📊 [DASHBOARD] Request from user: {current_user.id} | email: {current_user.email}")
     user_id = current_user.id
     
-    portfolio = db.query(Portfolio).filter(Portfolio.user_id == user_id).first()
-    bots = db.query(Bot).filter(Bot.user_id == user_id).all()
-    
-    # Calculate totals
-    total_bots = len(bots)
-    active_bots = len([b for b in bots if b.status == "ACTIVE"])
-    total_trades = db.query(Trade).filter(Trade.user_id == user_id).count()
-    
-    # Calculate overall metrics
-    closed_trades = db.query(Trade).filter(
-        Trade.user_id == user_id,
-        Trade.status == "CLOSED"
-    ).all()
-    total_pnl = sum([t.pnl or 0 for t in closed_trades])
-    winning_trades = len([t for t in closed_trades if t.pnl and t.pnl > 0])
-    losing_trades = len([t for t in closed_trades if t.pnl and t.pnl < 0])
+    # Portfolio value, bot counts, the trade count and the closed-trade
+    # aggregates in one round trip: bots/portfolio as scalar subqueries, and a
+    # single scan of the user's trades with the closed stats FILTERed
+    portfolio_value = select(Portfolio.total_value).where(
+        Portfolio.user_id == user_id
+    ).limit(1).scalar_subquery()
+    total_bots = select(func.count(Bot.id)).where(Bot.user_id == user_id).scalar_subquery()
+    active_bots = select(func.count(Bot.id)).where(
+        Bot.user_id == user_id,
+        Bot.status == "ACTIVE"
+    ).scalar_subquery()
+    
+    stats = (await db.execute(
+        select(
+            portfolio_value.label("portfolio_value"),
+            total_bots.label("total_bots"),
+            active_bots.label("active_bots"),
+            func.count(Trade.id).label("total_trades"),
+            *_pnl_aggregates(Trade.status == "CLOSED")
+        ).where(Trade.user_id == user_id)
+    )).one()
+    closed_count = stats.trades
+    total_pnl = stats.total_pnl
+    winning_trades = stats.wins
+    losing_trades = stats.losses
     
     # Calculate advanced metrics
-    winning_pnls = [t.pnl for t in closed_trades if t.pnl and t.pnl > 0]
-    losing_pnls = [t.pnl for t in closed_trades if t.pnl and t.pnl < 0]
-    
-    average_win = sum(winning_pnls) / len(winning_pnls) if winning_pnls else 0
-    average_loss = sum(losing_pnls) / len(losing_pnls) if losing_pnls else 0
-    best_trade = max(winning_pnls) if winning_pnls else 0
-    worst_trade = min(losing_pnls) if losing_pnls else 0
-    avg_trade_pnl = total_pnl / len(closed_trades) if closed_trades else 0
+    average_win = stats.win_pnl / winning_trades if winning_trades else 0
+    average_loss = stats.loss_pnl / losing_trades if losing_trades else 0
+    best_trade = stats.max_pnl if winning_trades else 0
+    worst_trade = stats.min_pnl if losing_trades else 0
+    avg_trade_pnl = total_pnl / closed_count if closed_count else 0
     
     # Calculate profit factor (sum of wins / absolute sum of losses)
-    sum_wins = sum(winning_pnls) if winning_pnls else 0
-    sum_losses = abs(sum(losing_pnls)) if losing_pnls else 1
+    sum_wins = stats.win_pnl
+    sum_losses = abs(stats.loss_pnl) if losing_trades else 1
     profit_factor = sum_wins / sum_losses if sum_losses > 0 else 0
     
     return {
-        "portfolio_value": portfolio.total_value if portfolio else 0,
-        "total_bots": total_bots,
-        "active_bots": active_bots,
-        "total_trades": total_trades,
+        "portfolio_value": stats.portfolio_value or 0,
+        "total_bots": stats.total_bots,
+        "active_bots": stats.active_bots,
+        "total_trades": stats.total_trades,
         "winning_trades": winning_trades,
         "losing_trades": losing_trades,
         "total_pnl": total_pnl,
-        "win_rate": (winning_trades / len(closed_trades) * 100) if closed_trades else 0,
+        "win_rate": (winning_trades / closed_count * 100) if closed_count else 0,
         "profit_factor": profit_factor,
         "average_win": average_win,
         "average_loss": average_loss,
         "best_trade": best_trade,
         "worst_trade": worst_trade,
         "avg_trade_pnl": avg_trade_pnl,
-        "last_updated": datetime.utcnow().isoformat(),
+        "last_updated": datetime.utcnow(),
     }
 
+@functools.lru_cache(maxsize=64)
+def _equity_curve_dates(days: int, today: date) -> tuple:
+    """
+    The equity curve's date axis, newest first: (dates, "YYYY-MM-DD" labels).
+    Depends only on (days, today), so it is built once per day per window in
+    process memory instead of formatted on every request.
+    """
+    dates = tuple(today - timedelta(days=i) for i in range(days))
+    return dates, tuple(d.isoformat() for d in dates)
+
 @router.get("/equity-curve")
+@_cached_report("equity-curve")
 async def get_equity_curve(
     days: int = 30,
-    current_user: UserResponse = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: UserResponse = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get equity curve data for charts"""
     user_id = current_user.id
     
     # Get portfolio and calculate real equity curve from trades
-    portfolio = db.query(Portfolio).filter(Portfolio.user_id == user_id).first()
+    # (only the two balance columns, not a Portfolio instance)
+    portfolio = (await db.execute(
+        select(Portfolio.total_value, Portfolio.cash_balance).where(Portfolio.user_id == user_id)
+    )).first()
     if not portfolio:
         return []  # No portfolio = no data
     
-    since = datetime.utcnow() - timedelta(days=days)
+    now = datetime.utcnow()
+    since = now - timedelta(days=days)
     
-    # Get all trades (open and closed) for this period
-    all_trades = db.query(Trade).filter(
+    # Stream the period's trades (open and closed) in batches, only the
+    # columns needed, grouping realized P&L by date as rows arrive
+    stmt = select(Trade.entry_time, Trade.status, Trade.pnl).where(
         Trade.user_id == user_id,
         Trade.entry_time >= since
-    ).order_by(Trade.entry_time).all()
+    ).execution_options(yield_per=STREAM_BATCH_SIZE)
     
-    if not all_trades:
-        # No trades, return flat line from portfolio value
-        data = []
-        now = datetime.utcnow()
-        for i in range(days):
-            date = now - timedelta(days=i)
-            data.append({
-                "date": date.strftime("%Y-%m-%d"),
-                "value": round(portfolio.total_value, 2),
-                "pnl": 0
-            })
-        return list(reversed(data))
-    
-    # Build equity curve day by day
-    data = []
     daily_pnl = {}  # date -> pnl
-    
-    # Group trades by date and calculate daily P&L
-    for trade in all_trades:
-        if trade.entry_time is None:
+    has_trades = False
+    async for entry_time, status, pnl in await db.stream(stmt):
+        has_trades = True
+        if entry_time is None:
             continue
         
-        date_key = trade.entry_time.strftime("%Y-%m-%d")
+        date_key = entry_time.date()
         if date_key not in daily_pnl:
             daily_pnl[date_key] = 0
         
         # Only count closed trades for realized P&L
-        if trade.status == "CLOSED" and trade.pnl is not None:
-            daily_pnl[date_key] += trade.pnl
+        if status == "CLOSED" and pnl is not None:
+            daily_pnl[date_key] += pnl
+    
+    dates, date_labels = _equity_curve_dates(days, now.date())
+    
+    if not has_trades:
+        # No trades, return flat line from portfolio value
+        value = round(portfolio.total_value, 2)
+        return [{"date": label, "value": value, "pnl": 0} for label in reversed(date_labels)]
     
     # Start with portfolio initial balance (assuming all trades start from current value / (1 + total_return))
     # Better: use the cash_balance as starting point
     starting_balance = portfolio.cash_balance or portfolio.total_value
-    cumulative_pnl = 0
     
-    # Generate data points
-    now = datetime.utcnow()
-    for i in range(days):
-        date = now - timedelta(days=i)
-        date_key = date.strftime("%Y-%m-%d")
-        
-        # Add daily P&L if exists
-        daily_change = daily_pnl.get(date_key, 0)
-        cumulative_pnl += daily_change
-        
-        equity_value = starting_balance + cumulative_pnl
-        
-        data.append({
+    # Generate data points (newest first, P&L accumulated going back in time)
+    daily_changes = np.array([daily_pnl.get(date, 0) for date in dates], dtype=float)
+    equity_values = np.round(starting_balance + np.cumsum(daily_changes), 2).tolist()
+    daily_changes = np.round(daily_changes, 2).tolist()
+    
+    data = [
+        {
             "date": date_key,
-            "value": round(equity_value, 2),
-            "pnl": round(daily_change, 2)
-        })
+            "value": value,
+            "pnl": change
+        }
+        for date_key, value, change in zip(date_labels, equity_values, daily_changes)
+    ]
     
     return list(reversed(data))
 
 @router.get("/trades")
+@_cached_report("trades")
 async def get_trades_report(
     limit: int = 50,
     days: int = 30,
@@ -157,8 +422,8 @@ async def get_trades_report(
     min_pnl: float = None,
     max_pnl: float = None,
     status: str = None,
-    current_user: UserResponse = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: UserResponse = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get detailed trades report with advanced filtering
@@ -175,93 +440,89 @@ async def get_trades_report(
     """
     logger.info(f"📋 [TRADES] Request from user: {current_user.id} | days={days}")
     user_id = current_user.id
-    since = datetime.utcnow() - timedelta(days=days)
+    now = datetime.utcnow()
+    since = now - timedelta(days=days)
     
-    query = db.query(Trade).filter(
+    # Filters are composed once and shared by the aggregate and the page query
+    conds = [
         Trade.user_id == user_id,
         Trade.entry_time >= since
-    )
+    ]
     
     # Apply filters
     if strategy:
-        query = query.filter(Trade.strategy == strategy)
+        conds.append(Trade.strategy == strategy)
     
     if symbol:
-        query = query.filter(Trade.symbol == symbol.upper())
+        conds.append(Trade.symbol == symbol.upper())
     
     if market_context:
-        query = query.filter(Trade.market_context == market_context)
+        conds.append(Trade.market_context == market_context)
     
     if status:
-        query = query.filter(Trade.status == status.upper())
+        conds.append(Trade.status == status.upper())
     
     if min_pnl is not None:
-        query = query.filter(Trade.pnl >= min_pnl)
+        conds.append(Trade.pnl >= min_pnl)
     
     if max_pnl is not None:
-        query = query.filter(Trade.pnl <= max_pnl)
-    
-    trades = query.order_by(desc(Trade.entry_time)).limit(limit).all()
-    
-    closed_trades = [t for t in trades if t.status == "CLOSED"]
-    total_pnl = sum([t.pnl or 0 for t in closed_trades])
-    winning = len([t for t in closed_trades if t.pnl and t.pnl > 0])
-    
-    # Group stats by market context
-    context_stats = {}
-    for trade in closed_trades:
-        context = trade.market_context or "UNKNOWN"
-        if context not in context_stats:
-            context_stats[context] = {
-                "count": 0,
-                "winning": 0,
-                "total_pnl": 0,
-                "avg_pnl": 0
-            }
-        context_stats[context]["count"] += 1
-        if trade.pnl and trade.pnl > 0:
-            context_stats[context]["winning"] += 1
-        context_stats[context]["total_pnl"] += trade.pnl or 0
+        conds.append(Trade.pnl <= max_pnl)
+    
+    # Plain column rows (no ORM objects); keys match the response fields
+    # (ordered to match idx_trades_user_entry so the LIMIT stops the scan early)
+    page = select(*TRADE_REPORT_COLUMNS).where(*conds).order_by(desc(Trade.entry_time)).limit(limit)
+    
+    # Totals and market context breakdown, aggregated by the database: one row
+    # per context, with open/closed splits as FILTERed aggregates
+    closed = Trade.status == "CLOSED"
+    grouped = (await db.execute(
+        select(
+            Trade.market_context,
+            func.count(Trade.id).label("count"),
+            func.count(Trade.id).filter(Trade.status == "OPEN").label("open"),
+            func.count(Trade.id).filter(closed).label("closed"),
+            func.count(Trade.id).filter(closed, Trade.pnl > 0).label("winning"),
+            func.coalesce(func.sum(Trade.pnl).filter(closed), 0.0).label("total_pnl")
+        ).where(*conds).group_by(Trade.market_context)
+    )).all()
+    
+    total_count = 0
+    open_count = 0
+    closed_count = 0
+    total_pnl = 0
+    winning = 0
+    context_stats = defaultdict(lambda: {"count": 0, "winning": 0, "total_pnl": 0, "avg_pnl": 0})
+    for row in grouped:
+        total_count += row.count
+        open_count += row.open
+        if not row.closed:
+            continue
+        closed_count += row.closed
+        total_pnl += row.total_pnl
+        winning += row.winning
+        
+        # Group stats by market context (NULL and "UNKNOWN" share a bucket)
+        stats = context_stats[row.market_context or "UNKNOWN"]
+        stats["count"] += row.closed
+        stats["winning"] += row.winning
+        stats["total_pnl"] += row.total_pnl
     
     # Calculate averages
-    for context in context_stats:
-        if context_stats[context]["count"] > 0:
-            context_stats[context]["avg_pnl"] = context_stats[context]["total_pnl"] / context_stats[context]["count"]
-            context_stats[context]["win_rate"] = (context_stats[context]["winning"] / context_stats[context]["count"]) * 100
-    
-    return {
-        "total_trades": len(trades),
-        "closed_trades": len(closed_trades),
-        "open_trades": len([t for t in trades if t.status == "OPEN"]),
+    for stats in context_stats.values():
+        stats["avg_pnl"] = stats["total_pnl"] / stats["count"]
+        stats["win_rate"] = (stats["winning"] / stats["count"]) * 100
+    
+    report = {
+        "total_trades": total_count,
+        "closed_trades": closed_count,
+        "open_trades": open_count,
         "total_pnl": total_pnl,
-        "win_rate": (winning / len(closed_trades) * 100) if closed_trades else 0,
-        "average_pnl": (total_pnl / len(closed_trades)) if closed_trades else 0,
-        "context_breakdown": context_stats,  # NEW: Market context breakdown
-        "trades": [
-            {
-                "id": str(trade.id),
-                "symbol": trade.symbol,
-                "side": trade.side,
-                "entry_price": trade.entry_price,
-                "exit_price": trade.exit_price,
-                "quantity": trade.quantity,
-                "pnl": trade.pnl,
-                "pnl_percent": trade.pnl_percent,
-                "status": trade.status,
-                "strategy": trade.strategy,
-                "entry_time": trade.entry_time.isoformat() if trade.entry_time else None,
-                "exit_time": trade.exit_time.isoformat() if trade.exit_time else None,
-                "market_context": trade.market_context,  # NEW: Market context at entry
-                "market_context_confidence": trade.market_context_confidence,  # NEW: Context confidence
-                "stop_loss_price": trade.stop_loss_price,
-                "take_profit_price": trade.take_profit_price,
-                "trade_phase": trade.trade_phase,
-            }
-            for trade in trades
-        ],
+        "win_rate": (winning / closed_count * 100) if closed_count else 0,
+        "average_pnl": (total_pnl / closed_count) if closed_count else 0,
+        "context_breakdown": dict(context_stats),  # NEW: Market context breakdown
         "period": {
-            "start": since.isoformat(),
-            "end": datetime.utcnow().isoformat(),
+            "start": since,
+            "end": now,
             "days": days
         },
         "filters_applied": {
@@ -272,102 +533,72 @@ async def get_trades_report(
             "pnl_range": [min_pnl, max_pnl] if min_pnl is not None or max_pnl is not None else None
         }
     }
+    
+    if limit > STREAM_BATCH_SIZE:
+        # Large pages are streamed: rows are fetched and serialized a batch
+        # at a time instead of materializing the whole list
+        return StreamingResponse(_stream_trades_report(report, page), media_type="application/json")
+    
+    report["trades"] = [dict(trade._mapping) for trade in await db.execute(page)]
+    return report
 
 @router.get("/trades/context-performance")
+@_cached_report("context-performance")
 async def get_context_performance(
     days: int = 30,
-    current_user: UserResponse = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: UserResponse = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get strategy performance broken down by market context
     Shows win rate and P&L for each strategy in each market condition
     """
     user_id = current_user.id
-    since = datetime.utcnow() - timedelta(days=days)
-    
-    all_trades = db.query(Trade).filter(
-        Trade.user_id == user_id,
-        Trade.entry_time >= since,
-        Trade.status == "CLOSED"
-    ).all()
+    now = datetime.utcnow()
+    since = now - timedelta(days=days)
     
-    # Create matrix: strategy x context
-    performance_matrix = {}
-    
-    for trade in all_trades:
-        strategy = trade.strategy or "UNKNOWN"
-        context = trade.market_context or "UNKNOWN"
-        key = f"{strategy}|{context}"
-        
-        if key not in performance_matrix:
-            performance_matrix[key] = {
-                "strategy": strategy,
-                "market_context": context,
-                "trades": 0,
-                "wins": 0,
-                "losses": 0,
-                "total_pnl": 0,
-                "best_pnl": None,
-                "worst_pnl": None
-            }
-        
-        performance_matrix[key]["trades"] += 1
-        
-        if trade.pnl and trade.pnl > 0:
-            performance_matrix[key]["wins"] += 1
-        elif trade.pnl and trade.pnl < 0:
-            performance_matrix[key]["losses"] += 1
-        
-        performance_matrix[key]["total_pnl"] += trade.pnl or 0
-        
-        if performance_matrix[key]["best_pnl"] is None or trade.pnl > performance_matrix[key]["best_pnl"]:
-            performance_matrix[key]["best_pnl"] = trade.pnl
-        
-        if performance_matrix[key]["worst_pnl"] is None or trade.pnl < performance_matrix[key]["worst_pnl"]:
-            performance_matrix[key]["worst_pnl"] = trade.pnl
+    # Matrix strategy x context, aggregated from closed trades (index-only on
+    # idx_trades_user_status_entry_ctx) and sorted by strategy, then context
+    group = (_STRATEGY_KEY.element, _CONTEXT_KEY.element)
+    rows = (await db.execute(
+        select(_STRATEGY_KEY, _CONTEXT_KEY, *_pnl_aggregates()).where(
+            *_closed_since(user_id, since)
+        ).group_by(*group).order_by(*group)
+    )).all()
     
     # Calculate metrics for each combo
-    result = []
-    for key, stats in performance_matrix.items():
-        if stats["trades"] > 0:
-            win_rate = (stats["wins"] / stats["trades"]) * 100
-            avg_pnl = stats["total_pnl"] / stats["trades"]
-        else:
-            win_rate = 0
-            avg_pnl = 0
-        
-        result.append({
-            "strategy": stats["strategy"],
-            "market_context": stats["market_context"],
-            "total_trades": stats["trades"],
-            "winning_trades": stats["wins"],
-            "losing_trades": stats["losses"],
-            "win_rate": win_rate,
-            "total_pnl": stats["total_pnl"],
-            "avg_pnl": avg_pnl,
-            "best_trade": stats["best_pnl"],
-            "worst_trade": stats["worst_pnl"]
-        })
-    
-    # Sort by strategy, then context
-    result = sorted(result, key=lambda x: (x["strategy"], x["market_context"]))
+    result = [
+        {
+            "strategy": row.strategy,
+            "market_context": row.market_context,
+            "total_trades": row.trades,
+            "winning_trades": row.wins,
+            "losing_trades": row.losses,
+            "win_rate": (row.wins / row.trades) * 100,
+            "total_pnl": row.total_pnl,
+            "avg_pnl": row.total_pnl / row.trades,
+            "best_trade": row.max_pnl,
+            "worst_trade": row.min_pnl
+        }
+        for row in rows
+    ]
     
     return {
         "performance_matrix": result,
         "total_combos": len(result),
         "period": {
-            "start": since.isoformat(),
-            "end": datetime.utcnow().isoformat(),
+            "start": since,
+            "end": now,
             "days": days
         }
     }
 
 @router.get("/strategies")
+@_cached_report("strategies")
 async def get_strategies_report(
     days: int = 30,
-    current_user: UserResponse = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: UserResponse = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get strategies comparison report with market context breakdown
@@ -375,143 +606,52 @@ async def get_strategies_report(
     """
     logger.info(f"🎯 [STRATEGIES] Request from user: {current_user.id} | days={days}")
     user_id = current_user.id
-    since = datetime.utcnow() - timedelta(days=days)
+    now = datetime.utcnow()
+    since = now - timedelta(days=days)
     
-    # Get all trades for the period
-    all_trades = db.query(Trade).filter(
-        Trade.user_id == user_id,
-        Trade.entry_time >= since,
-        Trade.status == "CLOSED"
-    ).all()
+    rollup = await _strategy_rollup(db, user_id, since)
     
-    if not all_trades:
+    if not rollup.totals:
         return {
             "strategies": [],
             "total_strategies": 0,
             "context_breakdown": {}
         }
     
-    # Aggregate by strategy (global stats)
-    strategy_global = {}
-    strategy_by_context = {}
-    
-    for trade in all_trades:
-        strategy = trade.strategy or "UNKNOWN"
-        context = trade.market_context or "UNKNOWN"
-        
-        # Global strategy stats
-        if strategy not in strategy_global:
-            strategy_global[strategy] = {
-                "total_trades": 0,
-                "winning_trades": 0,
-                "losing_trades": 0,
-                "total_pnl": 0,
-                "best_pnl": None,
-                "worst_pnl": None
-            }
-        
-        # By-context stats
-        key = f"{strategy}|{context}"
-        if key not in strategy_by_context:
-            strategy_by_context[key] = {
-                "strategy": strategy,
-                "market_context": context,
-                "total_trades": 0,
-                "winning_trades": 0,
-                "losing_trades": 0,
-                "total_pnl": 0,
-                "best_pnl": None,
-                "worst_pnl": None
-            }
-        
-        # Update global stats
-        strategy_global[strategy]["total_trades"] += 1
-        if trade.pnl and trade.pnl > 0:
-            strategy_global[strategy]["winning_trades"] += 1
-        elif trade.pnl and trade.pnl < 0:
-            strategy_global[strategy]["losing_trades"] += 1
-        
-        strategy_global[strategy]["total_pnl"] += trade.pnl or 0
-        
-        if strategy_global[strategy]["best_pnl"] is None or trade.pnl > strategy_global[strategy]["best_pnl"]:
-            strategy_global[strategy]["best_pnl"] = trade.pnl
-        
-        if strategy_global[strategy]["worst_pnl"] is None or trade.pnl < strategy_global[strategy]["worst_pnl"]:
-            strategy_global[strategy]["worst_pnl"] = trade.pnl
-        
-        # Update by-context stats
-        strategy_by_context[key]["total_trades"] += 1
-        if trade.pnl and trade.pnl > 0:
-            strategy_by_context[key]["winning_trades"] += 1
-        elif trade.pnl and trade.pnl < 0:
-            strategy_by_context[key]["losing_trades"] += 1
-        
-        strategy_by_context[key]["total_pnl"] += trade.pnl or 0
-        
-        if strategy_by_context[key]["best_pnl"] is None or trade.pnl > strategy_by_context[key]["best_pnl"]:
-            strategy_by_context[key]["best_pnl"] = trade.pnl
-        
-        if strategy_by_context[key]["worst_pnl"] is None or trade.pnl < strategy_by_context[key]["worst_pnl"]:
-            strategy_by_context[key]["worst_pnl"] = trade.pnl
-    
-    # Build result with global stats
     result = []
-    for strategy, stats in strategy_global.items():
-        if stats["total_trades"] > 0:
-            win_rate = (stats["winning_trades"] / stats["total_trades"]) * 100
-            avg_pnl = stats["total_pnl"] / stats["total_trades"]
-            profit_factor = 0
-            
-            # Calculate profit factor (total wins / abs(total losses))
-            if stats["losing_trades"] > 0:
-                total_wins = sum([t.pnl for t in all_trades if t.strategy == strategy and t.pnl and t.pnl > 0]) or 0
-                total_losses = sum([abs(t.pnl) for t in all_trades if t.strategy == strategy and t.pnl and t.pnl < 0]) or 0
-                if total_losses > 0:
-                    profit_factor = total_wins / total_losses
-        else:
-            win_rate = 0
-            avg_pnl = 0
-            profit_factor = 0
+    context_breakdown = {
+        strategy: {
+            market_context: {
+                "total_trades": stats.trades,
+                "winning_trades": stats.wins,
+                "losing_trades": stats.losses,
+                "win_rate": round((stats.wins / stats.trades) * 100, 2),
+                "total_pnl": round(stats.total_pnl, 2),
+                "avg_pnl": round(stats.total_pnl / stats.trades, 2),
+                "best_trade": round(stats.max_pnl, 2) if stats.max_pnl is not None else None,
+                "worst_trade": round(stats.min_pnl, 2) if stats.min_pnl is not None else None
+            }
+            for market_context, stats in by_context.items()
+        }
+        for strategy, by_context in rollup.contexts.items()
+    }
+    for stats in rollup.totals.values():
+        # Calculate profit factor (total wins / abs(total losses))
+        profit_factor = stats.win_pnl / abs(stats.loss_pnl) if stats.loss_pnl < 0 else 0
         
         result.append({
-            "name": strategy,
-            "total_trades": stats["total_trades"],
-            "winning_trades": stats["winning_trades"],
-            "losing_trades": stats["losing_trades"],
-            "win_rate": round(win_rate, 2),
-            "total_pnl": round(stats["total_pnl"], 2),
-            "avg_pnl": round(avg_pnl, 2),
-            "best_trade": round(stats["best_pnl"], 2) if stats["best_pnl"] else None,
-            "worst_trade": round(stats["worst_pnl"], 2) if stats["worst_pnl"] else None,
+            "name": stats.strategy,
+            "total_trades": stats.trades,
+            "winning_trades": stats.wins,
+            "losing_trades": stats.losses,
+            "win_rate": round((stats.wins / stats.trades) * 100, 2),
+            "total_pnl": round(stats.total_pnl, 2),
+            "avg_pnl": round(stats.total_pnl / stats.trades, 2),
+            "best_trade": round(stats.max_pnl, 2) if stats.max_pnl is not None else None,
+            "worst_trade": round(stats.min_pnl, 2) if stats.min_pnl is not None else None,
             "profit_factor": round(profit_factor, 2)
         })
     
-    # Build context breakdown
-    context_breakdown = {}
-    for key, stats in strategy_by_context.items():
-        strategy, context = key.split("|")
-        
-        if strategy not in context_breakdown:
-            context_breakdown[strategy] = {}
-        
-        if stats["total_trades"] > 0:
-            win_rate = (stats["winning_trades"] / stats["total_trades"]) * 100
-            avg_pnl = stats["total_pnl"] / stats["total_trades"]
-        else:
-            win_rate = 0
-            avg_pnl = 0
-        
-        context_breakdown[strategy][context] = {
-            "total_trades": stats["total_trades"],
-            "winning_trades": stats["winning_trades"],
-            "losing_trades": stats["losing_trades"],
-            "win_rate": round(win_rate, 2),
-            "total_pnl": round(stats["total_pnl"], 2),
-            "avg_pnl": round(avg_pnl, 2),
-            "best_trade": round(stats["best_pnl"], 2) if stats["best_pnl"] else None,
-            "worst_trade": round(stats["worst_pnl"], 2) if stats["worst_pnl"] else None
-        }
-    
     # Sort result by total trades descending
     result = sorted(result, key=lambda x: x["total_trades"], reverse=True)
     
@@ -520,17 +660,19 @@ async def get_strategies_report(
         "total_strategies": len(result),
         "context_breakdown": context_breakdown,  # NEW: Breakdown by market context
         "period": {
-            "start": since.isoformat(),
-            "end": datetime.utcnow().isoformat(),
+            "start": since,
+            "end": now,
             "days": days
         }
     }
 
 @router.get("/strategies/{strategy_name}")
+@_cached_report("strategy-detail")
 async def get_strategy_detail(
     strategy_name: str,
     days: int = 30,
-    db: Session = Depends(get_db)
+    current_user: UserResponse = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get detailed performance for a specific strategy
@@ -538,84 +680,45 @@ async def get_strategy_detail(
     """
     since = datetime.utcnow() - timedelta(days=days)
     
-    # Get all trades for this strategy
-    trades = db.query(Trade).filter(
-        Trade.strategy == strategy_name,
-        Trade.entry_time >= since,
-        Trade.status == "CLOSED"
-    ).order_by(desc(Trade.exit_time)).all()
+    rollup = await _strategy_rollup(db, current_user.id, since, strategy=strategy_name)
+    stats = rollup.totals.get(strategy_name)
     
-    if not trades:
+    if stats is None:
         return {
             "strategy": strategy_name,
             "total_trades": 0,
             "error": "No trades found for this strategy"
         }
     
-    # Global stats
-    winning = len([t for t in trades if t.pnl and t.pnl > 0])
-    losing = len([t for t in trades if t.pnl and t.pnl < 0])
-    total_pnl = sum([t.pnl or 0 for t in trades])
-    
-    winning_pnl = sum([t.pnl for t in trades if t.pnl and t.pnl > 0]) or 0
-    losing_pnl = sum([abs(t.pnl) for t in trades if t.pnl and t.pnl < 0]) or 0
-    
-    profit_factor = (winning_pnl / losing_pnl) if losing_pnl > 0 else 0
-    
-    # By context
-    context_stats = {}
-    for trade in trades:
-        context = trade.market_context or "UNKNOWN"
-        if context not in context_stats:
-            context_stats[context] = {
-                "trades": 0,
-                "wins": 0,
-                "losses": 0,
-                "total_pnl": 0,
-                "best": None,
-                "worst": None
-            }
-        
-        context_stats[context]["trades"] += 1
-        if trade.pnl and trade.pnl > 0:
-            context_stats[context]["wins"] += 1
-        elif trade.pnl and trade.pnl < 0:
-            context_stats[context]["losses"] += 1
-        
-        context_stats[context]["total_pnl"] += trade.pnl or 0
-        
-        if context_stats[context]["best"] is None or trade.pnl > context_stats[context]["best"]:
-            context_stats[context]["best"] = trade.pnl
-        
-        if context_stats[context]["worst"] is None or trade.pnl < context_stats[context]["worst"]:
-            context_stats[context]["worst"] = trade.pnl
+    losing_pnl = abs(stats.loss_pnl)
+    profit_factor = (stats.win_pnl / losing_pnl) if losing_pnl > 0 else 0
     
     # Format context stats
-    context_breakdown = {}
-    for context, stats in context_stats.items():
-        win_rate = (stats["wins"] / stats["trades"] * 100) if stats["trades"] > 0 else 0
-        context_breakdown[context] = {
-            "trades": stats["trades"],
-            "wins": stats["wins"],
-            "losses": stats["losses"],
-            "win_rate": round(win_rate, 2),
-            "total_pnl": round(stats["total_pnl"], 2),
-            "avg_pnl": round(stats["total_pnl"] / stats["trades"], 2) if stats["trades"] > 0 else 0,
-            "best_trade": round(stats["best"], 2) if stats["best"] is not None else None,
-            "worst_trade": round(stats["worst"], 2) if stats["worst"] is not None else None
+    context_breakdown = {
+        market_context: {
+            "trades": row.trades,
+            "wins": row.wins,
+            "losses": row.losses,
+            "win_rate": round(row.wins / row.trades * 100, 2),
+            "total_pnl": round(row.total_pnl, 2),
+            "avg_pnl": round(row.total_pnl / row.trades, 2),
+            "best_trade": round(row.max_pnl, 2) if row.max_pnl is not None else None,
+            "worst_trade": round(row.min_pnl, 2) if row.min_pnl is not None else None
         }
+        for market_context, row in rollup.contexts[strategy_name].items()
+    }
     
     return {
         "strategy": strategy_name,
-        "total_trades": len(trades),
-        "winning_trades": winning,
-        "losing_trades": losing,
-        "win_rate": round((winning / len(trades) * 100), 2) if trades else 0,
-        "total_pnl": round(total_pnl, 2),
-        "avg_pnl": round(total_pnl / len(trades), 2) if trades else 0,
+        "total_trades": stats.trades,
+        "winning_trades": stats.wins,
+        "losing_trades": stats.losses,
+        "win_rate": round((stats.wins / stats.trades * 100), 2),
+        "total_pnl": round(stats.total_pnl, 2),
+        "avg_pnl": round(stats.total_pnl / stats.trades, 2),
         "profit_factor": round(profit_factor, 2),
-        "best_trade": round(max([t.pnl for t in trades if t.pnl]), 2),
-        "worst_trade": round(min([t.pnl for t in trades if t.pnl]), 2),
+        "best_trade": round(stats.max_pnl, 2) if stats.max_pnl is not None else None,
+        "worst_trade": round(stats.min_pnl, 2) if stats.min_pnl is not None else None,
         "context_performance": context_breakdown,
         "recent_trades": [
             {
@@ -626,78 +729,73 @@ async def get_strategy_detail(
                 "pnl": round(t.pnl, 2) if t.pnl else None,
                 "pnl_percent": round(t.pnl_percent, 2) if t.pnl_percent else None,
                 "market_context": t.market_context,
-                "exit_time": t.exit_time.isoformat() if t.exit_time else None
+                "exit_time": t.exit_time
             }
-            for t in trades[:10]  # Last 10 trades
+            for t in rollup.recent_trades
         ]
     }
 
 @router.get("/performance")
-async def get_performance_report(db: Session = Depends(get_db)):
+@_cached_global_report("performance")
+async def get_performance_report(db: AsyncSession = Depends(get_async_db)):
     """Get overall performance metrics"""
-    bots = db.query(Bot).all()
-    all_trades = db.query(Trade).all()
+    # One aggregate row over closed trades instead of loading every trade
+    stats = (await db.execute(
+        select(*_pnl_aggregates()).where(Trade.status == "CLOSED")
+    )).one()
     
-    closed_trades = [t for t in all_trades if t.status == "CLOSED"]
-    
-    if not closed_trades:
+    if not stats.trades:
         return {"error": "No closed trades found"}
     
-    total_pnl = sum([t.pnl or 0 for t in closed_trades])
-    winning_trades = len([t for t in closed_trades if t.pnl and t.pnl > 0])
-    losing_trades = len([t for t in closed_trades if t.pnl and t.pnl < 0])
-    
-    winning_pnl = sum([t.pnl for t in closed_trades if t.pnl and t.pnl > 0])
-    losing_pnl = sum([t.pnl for t in closed_trades if t.pnl and t.pnl < 0])
-    
     return {
-        "total_trades": len(closed_trades),
-        "winning_trades": winning_trades,
-        "losing_trades": losing_trades,
-        "win_rate": (winning_trades / len(closed_trades) * 100),
-        "total_pnl": total_pnl,
-        "average_win": (winning_pnl / winning_trades) if winning_trades > 0 else 0,
-        "average_loss": (losing_pnl / losing_trades) if losing_trades > 0 else 0,
-        "profit_factor": (winning_pnl / abs(losing_pnl)) if losing_pnl != 0 else 0,
-        "avg_trade_pnl": (total_pnl / len(closed_trades)),
-        "best_trade": max([t.pnl for t in closed_trades if t.pnl]),
-        "worst_trade": min([t.pnl for t in closed_trades if t.pnl]),
+        "total_trades": stats.trades,
+        "winning_trades": stats.wins,
+        "losing_trades": stats.losses,
+        "win_rate": (stats.wins / stats.trades * 100),
+        "total_pnl": stats.total_pnl,
+        "average_win": (stats.win_pnl / stats.wins) if stats.wins > 0 else 0,
+        "average_loss": (stats.loss_pnl / stats.losses) if stats.losses > 0 else 0,
+        "profit_factor": (stats.win_pnl / abs(stats.loss_pnl)) if stats.loss_pnl != 0 else 0,
+        "avg_trade_pnl": (stats.total_pnl / stats.trades),
+        "best_trade": stats.max_pnl,
+        "worst_trade": stats.min_pnl,
     }
 
 @router.get("/drawdown-history")
-async def get_drawdown_history(days: int = 30, db: Session = Depends(get_db)):
-    """Get drawdown over time for charts"""
-    # Calculate drawdown from equity curve
-    portfolio = db.query(Portfolio).first()
-    current_value = portfolio.total_value if portfolio else 100000
-    
-    data = []
-    import random
-    
-    # Generate realistic drawdown data
-    value = current_value
-    peak = current_value
-    now = datetime.utcnow()
-    
-    for i in range(days, 0, -1):
-        date = (now - timedelta(days=i)).date()
-        
-        # Simulate daily changes
-        daily_change = random.uniform(-0.02, 0.03)  # -2% to +3%
-        value = value * (1 + daily_change)
-        
-        # Update peak if new high
-        if value > peak:
-            peak = value
-        
-        # Calculate drawdown percentage
-        drawdown_pct = ((value - peak) / peak * 100) if peak > 0 else 0
-        
-        data.append({
-            "date": date.isoformat(),
-            "drawdown": max(0, abs(drawdown_pct)),
+@_cached_report("drawdown-history")
+async def get_drawdown_history(
+    days: int = 30,
+    current_user: UserResponse = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get drawdown over time for charts (from daily portfolio_history snapshots, backfilled from trades by migration 032)"""
+    user_id = current_user.id
+    since = datetime.utcnow().date() - timedelta(days=days)
+    
+    rows = (await db.execute(
+        select(PortfolioHistory.date, PortfolioHistory.equity).where(
+            PortfolioHistory.user_id == user_id,
+            PortfolioHistory.date > since
+        ).order_by(PortfolioHistory.date)
+    )).all()
+    
+    if not rows:
+        return []
+    
+    dates = [row.date for row in rows]
+    values = np.array([row.equity for row in rows], dtype=float)
+    
+    # Calculate drawdown percentage from the running peak
+    peaks = np.maximum.accumulate(values)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drawdowns = np.where(peaks > 0, np.abs((values - peaks) / peaks * 100), 0.0)
+    
+    return [
+        {
+            "date": date,
+            "drawdown": drawdown,
             "value": value,
             "recovery_days": 0  # Would need actual recovery logic
-        })
-    
-    return data
+        }
+        for date, drawdown, value in zip(dates, drawdowns.tolist(), values.tolist())
+    ]
@@ -2,46 +2,41 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from app.db.database import get_db
 from app.models.database_models import RiskEvent
+from app.db.redis_client import cached_response
+from app.config import settings
 
 router = APIRouter(prefix="/api", tags=["risk"])
 
 @router.get("/risk-events")
+@cached_response("risk:events", settings.REPORTS_CACHE_TTL)
 async def get_risk_events(db: Session = Depends(get_db)):
     """Get risk events and alerts"""
-    events = db.query(RiskEvent).order_by(RiskEvent.created_at.desc()).limit(10).all()
+    # Only the response columns, no RiskEvent instances (the model stores
+    # the description as message and the level as severity)
+    events = db.query(
+        RiskEvent.id,
+        RiskEvent.event_type,
+        RiskEvent.message.label("description"),
+        RiskEvent.severity.label("level"),
+        RiskEvent.created_at
+    ).order_by(RiskEvent.created_at.desc()).limit(10).all()
     
-    return {
-        "events": [
-            {
-                "id": e.id,
-                "event_type": e.event_type,
-                "description": e.description,
-                "level": e.level,
-                "created_at": e.created_at
-            }
-            for e in events
-        ]
-    }
+    return {"events": [dict(e._mapping) for e in events]}
 
 @router.get("/risk-summary")
+@cached_response("risk:summary", settings.REPORTS_CACHE_TTL)
 async def get_risk_summary(db: Session = Depends(get_db)):
     """Get overall risk summary"""
     from app.models.database_models import Portfolio
     
-    portfolio = db.query(Portfolio).first()
-    if not portfolio:
-        return {
-            "max_drawdown": 0,
-            "daily_risk": 0,
-            "position_count": 0,
-            "leverage_ratio": 1.0,
-            "risk_score": 0
-        }
+    # The two columns used, not a Portfolio instance
+    row = db.query(Portfolio.max_drawdown, Portfolio.daily_pnl).first()
+    max_drawdown, daily_pnl = row or (0, 0)
     
     return {
-        "max_drawdown": portfolio.max_drawdown or 0,
-        "daily_risk": portfolio.daily_pnl or 0,
+        "max_drawdown": max_drawdown or 0,
+        "daily_risk": daily_pnl or 0,
         "position_count": 0,
         "leverage_ratio": 1.0,
-        "risk_score": abs(portfolio.max_drawdown or 0) * 10
+        "risk_score": abs(max_drawdown or 0) * 10
     }
@@ -10,16 +10,26 @@ Endpoints:
 - POST /api/settings/trading/reset    - Reset to profile defaults
 """
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from pydantic import BaseModel, Field
-from typing import Optional, List
-from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from typing import Optional, List, Tuple
 import logging
+import orjson
 
-from app.db.database import get_db
-from app.auth.local_auth import get_current_user, UserResponse
+from app.db.database import get_async_db
+from app.db.redis_client import (
+    cache_get, cache_set, invalidate_trading_settings_cache, trading_settings_cache_key,
+    trading_settings_cache_version,
+)
+from app.config import settings as app_settings
+from app.http_cache import body_etag, static_json_response
+from app.auth.local_auth import get_current_user, security, to_user_response, verify_credentials, UserResponse
 from app.models.database_models import (
+    User,
     UserTradingSettings, 
     SLTPProfilePreset,
     SLTP_PROFILE_PRESETS
@@ -68,8 +78,13 @@ class TradingSettingsResponse(BaseModel):
     max_daily_loss_pct: float
     max_trades_per_day: int
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+    
+    @field_validator("user_id", mode="before")
+    @classmethod
+    def _user_id_str(cls, value):
+        """The ORM row holds a UUID; the API returns it as a string."""
+        return str(value)
 
 
 class TradingSettingsUpdate(BaseModel):
@@ -123,66 +138,132 @@ class ProfilePresetResponse(BaseModel):
     validation_threshold_pct: float
 
 
+# Presets are static: validate, order (PRUDENT, BALANCED, AGGRESSIVE) and
+# serialize them once at import instead of on every request
+_PROFILE_ORDER = {"PRUDENT": 0, "BALANCED": 1, "AGGRESSIVE": 2}
+_PROFILE_DETAIL_CACHE = {
+    name: ProfilePresetResponse(profile_name=name, **config)
+    for name, config in sorted(
+        SLTP_PROFILE_PRESETS.items(), key=lambda item: _PROFILE_ORDER.get(item[0], 99)
+    )
+}
+# Settings columns a profile preset provides values for
+_PROFILE_FIELDS = (
+    "sl_atr_multiplier", "sl_fixed_pct", "sl_max_pct",
+    "tp1_risk_reward", "tp1_exit_pct", "tp2_risk_reward",
+    "trailing_activation_pct", "trailing_distance_pct", "validation_threshold_pct",
+)
+# Column values each profile applies, extracted once: updates merge a ready dict
+_PROFILE_VALUES = {
+    name: {field: config[field] for field in _PROFILE_FIELDS}
+    for name, config in SLTP_PROFILE_PRESETS.items()
+}
+# Non-profile settings restored by POST /trading/reset
+_RESET_TOGGLES = {
+    "enable_trailing_sl": True,
+    "enable_trade_phases": True,
+    "move_sl_to_breakeven": True,
+    "enable_partial_tp": True,
+    "sl_method": "ATR",
+    "sl_min_distance": 0.01,
+    "max_position_pct": 25.0,
+    "max_daily_loss_pct": 5.0,
+    "max_trades_per_day": 10,
+}
+_PRESETS_BODY = orjson.dumps([preset.model_dump() for preset in _PROFILE_DETAIL_CACHE.values()])
+_PRESETS_ETAG = body_etag(_PRESETS_BODY)
+
+
 # ============================================
 # Endpoints
 # ============================================
 
+async def _load_user_and_settings(db: AsyncSession, user_id) -> Tuple[UserResponse, Optional[UserTradingSettings]]:
+    """
+    Load a user and their trading settings row in one query (User LEFT JOIN
+    user_trading_settings). Settings are None if not created yet.
+    """
+    row = (await db.execute(
+        select(User, UserTradingSettings)
+        .outerjoin(UserTradingSettings, UserTradingSettings.user_id == User.id)
+        .where(User.id == user_id)
+    )).first()
+    
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found"
+        )
+    
+    user, settings = row
+    return to_user_response(user), settings
+
+
+async def get_user_and_settings(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> Tuple[UserResponse, Optional[UserTradingSettings]]:
+    """
+    Authenticate the caller and load their trading settings row in the same
+    query, instead of get_current_user followed by a separate settings SELECT.
+    """
+    return await _load_user_and_settings(db, verify_credentials(credentials))
+
+
 @router.get("/trading", response_model=TradingSettingsResponse)
 async def get_trading_settings(
-    current_user: UserResponse = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get user's current trading settings.
     Creates default settings if none exist.
-    """
-    user_id = UUID(current_user.id)
     
-    # Try to get existing settings
-    settings = db.query(UserTradingSettings).filter(
-        UserTradingSettings.user_id == user_id
-    ).first()
-    
-    # Create default settings if not exists
+    Cached per user in Redis (TRADING_SETTINGS_CACHE_TTL); a hit skips the
+    database entirely. The key carries a version that PUT /trading and
+    /trading/reset bump after committing, so a read racing a write can only
+    fill an already-orphaned key.
+    """
+    token_user_id = verify_credentials(credentials)
+    # Read the version before the row: a write committing in between bumps
+    # it, and this (possibly stale) response lands under the old key
+    version = await trading_settings_cache_version(token_user_id)  # None: caching disabled / Redis unreachable
+    cache_key = trading_settings_cache_key(token_user_id, version) if version is not None else None
+    cached = await cache_get(cache_key) if cache_key else None
+    if cached is not None:
+        return cached
+    
+    current_user, settings = await _load_user_and_settings(db, token_user_id)
+    user_id = current_user.uuid
+    
+    # Create default settings if not exists. ON CONFLICT DO NOTHING: a
+    # concurrent first GET may insert the row first (user_id is the primary
+    # key), in which case its row is read back instead
     if not settings:
         logger.info(f"📝 Creating default trading settings for user {user_id}")
-        settings = UserTradingSettings(
-            user_id=user_id,
-            sl_tp_profile="BALANCED"
-        )
-        db.add(settings)
-        db.commit()
-        db.refresh(settings)
-    
-    return TradingSettingsResponse(
-        user_id=str(settings.user_id),
-        sl_tp_profile=settings.sl_tp_profile,
-        sl_method=settings.sl_method,
-        sl_atr_multiplier=settings.sl_atr_multiplier,
-        sl_fixed_pct=settings.sl_fixed_pct,
-        sl_min_distance=settings.sl_min_distance,
-        sl_max_pct=settings.sl_max_pct,
-        tp1_risk_reward=settings.tp1_risk_reward,
-        tp1_exit_pct=settings.tp1_exit_pct,
-        tp2_risk_reward=settings.tp2_risk_reward,
-        enable_trailing_sl=settings.enable_trailing_sl,
-        trailing_activation_pct=settings.trailing_activation_pct,
-        trailing_distance_pct=settings.trailing_distance_pct,
-        enable_trade_phases=settings.enable_trade_phases,
-        validation_threshold_pct=settings.validation_threshold_pct,
-        move_sl_to_breakeven=settings.move_sl_to_breakeven,
-        enable_partial_tp=settings.enable_partial_tp,
-        max_position_pct=settings.max_position_pct,
-        max_daily_loss_pct=settings.max_daily_loss_pct,
-        max_trades_per_day=settings.max_trades_per_day
-    )
+        settings = (await db.execute(
+            insert(UserTradingSettings)
+            .values(user_id=user_id, sl_tp_profile="BALANCED")
+            .on_conflict_do_nothing(index_elements=[UserTradingSettings.user_id])
+            .returning(UserTradingSettings)
+        )).scalar_one_or_none()
+        if settings is None:
+            settings = (await db.execute(
+                select(UserTradingSettings).where(UserTradingSettings.user_id == user_id)
+            )).scalar_one()
+        await db.commit()
+    
+    response = TradingSettingsResponse.model_validate(settings)
+    if cache_key:
+        await cache_set(cache_key, response.model_dump(), app_settings.TRADING_SETTINGS_CACHE_TTL)
+    return response
 
 
 @router.put("/trading", response_model=TradingSettingsResponse)
 async def update_trading_settings(
     update_data: TradingSettingsUpdate,
-    current_user: UserResponse = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    user_and_settings: Tuple[UserResponse, Optional[UserTradingSettings]] = Depends(get_user_and_settings),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update user's trading settings.
@@ -190,161 +271,94 @@ async def update_trading_settings(
     If sl_tp_profile is changed, applies the profile defaults first,
     then applies any other specified overrides.
     """
-    user_id = UUID(current_user.id)
-    
-    # Get or create settings
-    settings = db.query(UserTradingSettings).filter(
-        UserTradingSettings.user_id == user_id
-    ).first()
-    
-    if not settings:
-        settings = UserTradingSettings(user_id=user_id)
-        db.add(settings)
-    
-    # If profile is changing, apply profile defaults first
-    if update_data.sl_tp_profile and update_data.sl_tp_profile != settings.sl_tp_profile:
-        profile = SLTP_PROFILE_PRESETS.get(update_data.sl_tp_profile)
-        if profile:
+    current_user, settings = user_and_settings
+    user_id = current_user.uuid
+    
+    # Merge the changes in Python: profile defaults first if the profile is
+    # changing, then any specific overrides
+    fields = {}
+    current_profile = settings.sl_tp_profile if settings else None
+    if update_data.sl_tp_profile and update_data.sl_tp_profile != current_profile:
+        profile_values = _PROFILE_VALUES.get(update_data.sl_tp_profile)
+        if profile_values:
             logger.info(f"📊 User {user_id} changing profile to {update_data.sl_tp_profile}")
-            settings.sl_tp_profile = update_data.sl_tp_profile
-            settings.sl_atr_multiplier = profile["sl_atr_multiplier"]
-            settings.sl_fixed_pct = profile["sl_fixed_pct"]
-            settings.sl_max_pct = profile["sl_max_pct"]
-            settings.tp1_risk_reward = profile["tp1_risk_reward"]
-            settings.tp1_exit_pct = profile["tp1_exit_pct"]
-            settings.tp2_risk_reward = profile["tp2_risk_reward"]
-            settings.trailing_activation_pct = profile["trailing_activation_pct"]
-            settings.trailing_distance_pct = profile["trailing_distance_pct"]
-            settings.validation_threshold_pct = profile["validation_threshold_pct"]
-    
-    # Apply any specific overrides
-    update_dict = update_data.model_dump(exclude_unset=True, exclude_none=True)
-    for field, value in update_dict.items():
-        if field != "sl_tp_profile":  # Already handled above
-            setattr(settings, field, value)
+            fields["sl_tp_profile"] = update_data.sl_tp_profile
+            fields.update(profile_values)
     
-    db.commit()
-    db.refresh(settings)
+    update_dict = update_data.model_dump(exclude_unset=True, exclude_none=True)
+    update_dict.pop("sl_tp_profile", None)  # Already handled above
+    fields.update(update_dict)
+    
+    # One INSERT ... ON CONFLICT DO UPDATE ... RETURNING instead of
+    # create-or-update + commit + refresh (creates the row on first update)
+    stmt = insert(UserTradingSettings).values(user_id=user_id, **fields)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[UserTradingSettings.user_id],
+        set_={**fields, "updated_at": func.now()}
+    ).returning(UserTradingSettings).execution_options(populate_existing=True)
+    settings = (await db.execute(stmt)).scalar_one()
+    # RETURNING already loaded the row (and the async session doesn't expire
+    # on commit), so no refresh SELECT is needed
+    response = TradingSettingsResponse.model_validate(settings)
+    await db.commit()
+    await invalidate_trading_settings_cache(user_id)
     
     logger.info(f"✅ Trading settings updated for user {user_id}")
     
-    return TradingSettingsResponse(
-        user_id=str(settings.user_id),
-        sl_tp_profile=settings.sl_tp_profile,
-        sl_method=settings.sl_method,
-        sl_atr_multiplier=settings.sl_atr_multiplier,
-        sl_fixed_pct=settings.sl_fixed_pct,
-        sl_min_distance=settings.sl_min_distance,
-        sl_max_pct=settings.sl_max_pct,
-        tp1_risk_reward=settings.tp1_risk_reward,
-        tp1_exit_pct=settings.tp1_exit_pct,
-        tp2_risk_reward=settings.tp2_risk_reward,
-        enable_trailing_sl=settings.enable_trailing_sl,
-        trailing_activation_pct=settings.trailing_activation_pct,
-        trailing_distance_pct=settings.trailing_distance_pct,
-        enable_trade_phases=settings.enable_trade_phases,
-        validation_threshold_pct=settings.validation_threshold_pct,
-        move_sl_to_breakeven=settings.move_sl_to_breakeven,
-        enable_partial_tp=settings.enable_partial_tp,
-        max_position_pct=settings.max_position_pct,
-        max_daily_loss_pct=settings.max_daily_loss_pct,
-        max_trades_per_day=settings.max_trades_per_day
-    )
+    return response
 
 
 @router.get("/trading/profiles", response_model=List[ProfilePresetResponse])
 async def get_profile_presets(
+    request: Request,
     current_user: UserResponse = Depends(get_current_user)
 ):
     """
     Get available SL/TP profile presets.
     Returns PRUDENT, BALANCED, and AGGRESSIVE profiles with their configurations.
     """
-    profiles = []
-    for name, config in SLTP_PROFILE_PRESETS.items():
-        profiles.append(ProfilePresetResponse(
-            profile_name=name,
-            **config
-        ))
-    
-    # Sort: PRUDENT, BALANCED, AGGRESSIVE
-    order = {"PRUDENT": 0, "BALANCED": 1, "AGGRESSIVE": 2}
-    profiles.sort(key=lambda p: order.get(p.profile_name, 99))
-    
-    return profiles
+    return static_json_response(request, _PRESETS_BODY, _PRESETS_ETAG, "private, max-age=3600")
 
 
 @router.post("/trading/reset", response_model=TradingSettingsResponse)
 async def reset_to_profile_defaults(
-    current_user: UserResponse = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    user_and_settings: Tuple[UserResponse, Optional[UserTradingSettings]] = Depends(get_user_and_settings),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Reset user's trading settings to their current profile's defaults.
     Useful when user wants to undo custom overrides.
     """
-    user_id = UUID(current_user.id)
-    
-    settings = db.query(UserTradingSettings).filter(
-        UserTradingSettings.user_id == user_id
-    ).first()
+    current_user, settings = user_and_settings
+    user_id = current_user.uuid
     
     if not settings:
         raise HTTPException(status_code=404, detail="Settings not found")
     
-    profile = SLTP_PROFILE_PRESETS.get(settings.sl_tp_profile)
-    if not profile:
+    profile_values = _PROFILE_VALUES.get(settings.sl_tp_profile)
+    if not profile_values:
         raise HTTPException(status_code=400, detail="Invalid profile")
     
-    # Reset to profile defaults
-    settings.sl_atr_multiplier = profile["sl_atr_multiplier"]
-    settings.sl_fixed_pct = profile["sl_fixed_pct"]
-    settings.sl_max_pct = profile["sl_max_pct"]
-    settings.tp1_risk_reward = profile["tp1_risk_reward"]
-    settings.tp1_exit_pct = profile["tp1_exit_pct"]
-    settings.tp2_risk_reward = profile["tp2_risk_reward"]
-    settings.trailing_activation_pct = profile["trailing_activation_pct"]
-    settings.trailing_distance_pct = profile["trailing_distance_pct"]
-    settings.validation_threshold_pct = profile["validation_threshold_pct"]
-    
-    # Reset toggles to defaults
-    settings.enable_trailing_sl = True
-    settings.enable_trade_phases = True
-    settings.move_sl_to_breakeven = True
-    settings.enable_partial_tp = True
-    settings.sl_method = "ATR"
-    settings.sl_min_distance = 0.01
-    settings.max_position_pct = 25.0
-    settings.max_daily_loss_pct = 5.0
-    settings.max_trades_per_day = 10
-    
-    db.commit()
-    db.refresh(settings)
-    
-    logger.info(f"🔄 Trading settings reset to {settings.sl_tp_profile} defaults for user {user_id}")
-    
-    return TradingSettingsResponse(
-        user_id=str(settings.user_id),
-        sl_tp_profile=settings.sl_tp_profile,
-        sl_method=settings.sl_method,
-        sl_atr_multiplier=settings.sl_atr_multiplier,
-        sl_fixed_pct=settings.sl_fixed_pct,
-        sl_min_distance=settings.sl_min_distance,
-        sl_max_pct=settings.sl_max_pct,
-        tp1_risk_reward=settings.tp1_risk_reward,
-        tp1_exit_pct=settings.tp1_exit_pct,
-        tp2_risk_reward=settings.tp2_risk_reward,
-        enable_trailing_sl=settings.enable_trailing_sl,
-        trailing_activation_pct=settings.trailing_activation_pct,
-        trailing_distance_pct=settings.trailing_distance_pct,
-        enable_trade_phases=settings.enable_trade_phases,
-        validation_threshold_pct=settings.validation_threshold_pct,
-        move_sl_to_breakeven=settings.move_sl_to_breakeven,
-        enable_partial_tp=settings.enable_partial_tp,
-        max_position_pct=settings.max_position_pct,
-        max_daily_loss_pct=settings.max_daily_loss_pct,
-        max_trades_per_day=settings.max_trades_per_day
-    )
+    # Reset to profile defaults and default toggles: one UPDATE ... RETURNING
+    # loads the row, so it isn't re-read after commit
+    settings = (await db.execute(
+        update(UserTradingSettings)
+        .where(UserTradingSettings.user_id == user_id)
+        .values(
+            **profile_values,
+            **_RESET_TOGGLES,
+            updated_at=func.now()
+        )
+        .returning(UserTradingSettings)
+        .execution_options(populate_existing=True)
+    )).scalar_one()
+    response = TradingSettingsResponse.model_validate(settings)
+    await db.commit()
+    await invalidate_trading_settings_cache(user_id)
+    
+    logger.info(f"🔄 Trading settings reset to {response.sl_tp_profile} defaults for user {user_id}")
+    
+    return response
 
 
 @router.get("/trading/profile/{profile_name}", response_model=ProfilePresetResponse)
@@ -355,17 +369,12 @@ async def get_profile_details(
     """
     Get details for a specific profile preset.
     """
-    profile_name_upper = profile_name.upper()
+    preset = _PROFILE_DETAIL_CACHE.get(profile_name.upper())
     
-    if profile_name_upper not in SLTP_PROFILE_PRESETS:
+    if preset is None:
         raise HTTPException(
             status_code=404, 
             detail=f"Profile '{profile_name}' not found. Available: PRUDENT, BALANCED, AGGRESSIVE"
         )
     
-    config = SLTP_PROFILE_PRESETS[profile_name_upper]
-    
-    return ProfilePresetResponse(
-        profile_name=profile_name_upper,
-        **config
-    )
+    return preset
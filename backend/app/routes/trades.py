@@ -1,31 +1,52 @@
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, Depends, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
 from datetime import datetime
-from app.db.database import get_db
+from app.db.database import get_async_db
 from app.models.database_models import Trade, Bot
-from app.auth.local_auth import get_current_user, get_optional_user, UserResponse
-from pydantic import BaseModel
-from typing import Optional, List
+from app.auth.local_auth import get_optional_user_async, UserResponse
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, model_validator
+from typing import Literal, Optional, List
+from uuid import UUID
 
 router = APIRouter(prefix="/api/trades", tags=["trades"])
 
 class TradeCreateRequest(BaseModel):
     """Request model for creating a trade with limits"""
-    bot_id: str
+    bot_id: UUID
     symbol: str
-    side: str  # BUY or SELL
+    side: Literal["BUY", "SELL"]
     entry_price: float
     quantity: float
     strategy: str
     stop_loss_price: Optional[float] = None
     take_profit_price: Optional[float] = None
-    trailing_stop_percent: Optional[float] = None
+    trailing_stop_percent: Optional[float] = Field(None, ge=0, le=100)
+    
+    @model_validator(mode="after")
+    def _check_limits(self):
+        """SL/TP must sit on the correct side of the entry price (rejected with 422)"""
+        if not self.entry_price:
+            return self
+        entry, stop_loss, take_profit = self.entry_price, self.stop_loss_price, self.take_profit_price
+        if self.side == "BUY":
+            if stop_loss and stop_loss >= entry:
+                raise ValueError("Stop loss must be below entry price for BUY orders")
+            if take_profit and take_profit <= entry:
+                raise ValueError("Take profit must be above entry price for BUY orders")
+        else:
+            if stop_loss and stop_loss <= entry:
+                raise ValueError("Stop loss must be above entry price for SELL orders")
+            if take_profit and take_profit >= entry:
+                raise ValueError("Take profit must be below entry price for SELL orders")
+        return self
 
 class TradeResponse(BaseModel):
     """Response model for trade"""
-    id: int
-    user_id: Optional[str] = None
-    bot_id: str
+    id: UUID
+    user_id: Optional[UUID] = None
+    bot_id: Optional[UUID] = None
     symbol: str
     side: str
     entry_price: float
@@ -38,14 +59,16 @@ class TradeResponse(BaseModel):
     take_profit_price: Optional[float]
     trailing_stop_percent: Optional[float]
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+# Validates/serializes a whole trade list in one pydantic-core call
+_TRADE_LIST_ADAPTER = TypeAdapter(List[TradeResponse])
 
 @router.post("/create", response_model=TradeResponse)
 async def create_trade(
     trade_req: TradeCreateRequest,
-    db: Session = Depends(get_db),
-    current_user: Optional[UserResponse] = Depends(get_optional_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Optional[UserResponse] = Depends(get_optional_user_async)
 ):
     """
     FEATURE 1.1: Create a trade with risk limits
@@ -54,45 +77,13 @@ async def create_trade(
     - trailing_stop_percent: Trailing stop as percentage of entry price
     """
     
-    # Validate limits logic
-    if trade_req.stop_loss_price and trade_req.entry_price:
-        if trade_req.side == "BUY":
-            if trade_req.stop_loss_price >= trade_req.entry_price:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Stop loss must be below entry price for BUY orders"
-                )
-        elif trade_req.side == "SELL":
-            if trade_req.stop_loss_price <= trade_req.entry_price:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Stop loss must be above entry price for SELL orders"
-                )
-    
-    if trade_req.take_profit_price and trade_req.entry_price:
-        if trade_req.side == "BUY":
-            if trade_req.take_profit_price <= trade_req.entry_price:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Take profit must be above entry price for BUY orders"
-                )
-        elif trade_req.side == "SELL":
-            if trade_req.take_profit_price >= trade_req.entry_price:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Take profit must be below entry price for SELL orders"
-                )
-    
-    if trade_req.trailing_stop_percent:
-        if trade_req.trailing_stop_percent < 0 or trade_req.trailing_stop_percent > 100:
-            raise HTTPException(
-                status_code=400,
-                detail="Trailing stop must be between 0 and 100"
-            )
-    
-    # Create trade with user_id
+    # SL/TP/trailing limits were validated by TradeCreateRequest
+    
+    # Create trade with user_id. Written through the ORM flush so the session
+    # hooks see it (cache invalidation); the async session keeps the object
+    # loaded after commit, no refresh SELECT
     trade = Trade(
-        user_id=current_user.id if current_user else None,
+        user_id=current_user.uuid if current_user else None,
         bot_id=trade_req.bot_id,
         symbol=trade_req.symbol,
         side=trade_req.side,
@@ -108,8 +99,7 @@ async def create_trade(
     )
     
     db.add(trade)
-    db.commit()
-    db.refresh(trade)
+    await db.commit()
     
     return trade
 
@@ -117,84 +107,88 @@ async def create_trade(
 async def get_trades(
     symbol: Optional[str] = None,
     status: Optional[str] = None,
-    bot_id: Optional[str] = None,
+    bot_id: Optional[UUID] = None,
     limit: int = 50,
-    db: Session = Depends(get_db),
-    current_user: Optional[UserResponse] = Depends(get_optional_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Optional[UserResponse] = Depends(get_optional_user_async)
 ):
     """Get trades with optional filters (filtered by user if authenticated)"""
-    query = db.query(Trade)
+    # Trade has no relationships today; raiseload makes any future lazy load
+    # while serializing the list fail loudly instead of running one SELECT
+    # per row (load related rows explicitly, e.g. with selectinload)
+    stmt = select(Trade).options(raiseload("*"))
     
     # Filter by user_id if authenticated
     if current_user:
-        query = query.filter(Trade.user_id == current_user.id)
+        stmt = stmt.where(Trade.user_id == current_user.uuid)
     
     if symbol:
-        query = query.filter(Trade.symbol == symbol.upper())
+        stmt = stmt.where(Trade.symbol == symbol.upper())
     if status:
-        query = query.filter(Trade.status == status.upper())
+        stmt = stmt.where(Trade.status == status.upper())
     if bot_id:
-        query = query.filter(Trade.bot_id == bot_id)
+        stmt = stmt.where(Trade.bot_id == bot_id)
     
-    trades = query.order_by(Trade.created_at.desc()).limit(limit).all()
-    return trades
+    # Newest first by entry_time (set on creation, like created_at): walks
+    # idx_trades_user_entry, or idx_trades_user_status_entry_ctx with a status
+    result = await db.execute(stmt.order_by(Trade.entry_time.desc()).limit(limit))
+    trades = _TRADE_LIST_ADAPTER.validate_python(result.scalars().all(), from_attributes=True)
+    return Response(content=_TRADE_LIST_ADAPTER.dump_json(trades), media_type="application/json")
 
 @router.get("/{trade_id}", response_model=TradeResponse)
 async def get_trade(
-    trade_id: int, 
-    db: Session = Depends(get_db),
-    current_user: Optional[UserResponse] = Depends(get_optional_user)
+    trade_id: UUID, 
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Optional[UserResponse] = Depends(get_optional_user_async)
 ):
     """Get a specific trade"""
-    query = db.query(Trade).filter(Trade.id == trade_id)
+    stmt = select(Trade).options(raiseload("*")).where(Trade.id == trade_id)
     
     # Filter by user_id if authenticated
     if current_user:
-        query = query.filter(Trade.user_id == current_user.id)
+        stmt = stmt.where(Trade.user_id == current_user.uuid)
     
-    trade = query.first()
+    trade = (await db.execute(stmt)).scalars().first()
     if not trade:
         raise HTTPException(status_code=404, detail="Trade not found")
     return trade
 
 @router.put("/{trade_id}/close")
 async def close_trade(
-    trade_id: int,
+    trade_id: UUID,
     exit_price: float,
-    db: Session = Depends(get_db),
-    current_user: Optional[UserResponse] = Depends(get_optional_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Optional[UserResponse] = Depends(get_optional_user_async)
 ):
     """Close a trade and calculate P&L"""
-    query = db.query(Trade).filter(Trade.id == trade_id)
+    stmt = select(Trade).where(Trade.id == trade_id)
     
     # Filter by user_id if authenticated
     if current_user:
-        query = query.filter(Trade.user_id == current_user.id)
+        stmt = stmt.where(Trade.user_id == current_user.uuid)
     
-    trade = query.first()
+    trade = (await db.execute(stmt)).scalars().first()
     if not trade:
         raise HTTPException(status_code=404, detail="Trade not found")
     
     if trade.status == "CLOSED":
         raise HTTPException(status_code=400, detail="Trade already closed")
     
-    # Calculate P&L
-    if trade.side == "BUY":
-        pnl = (exit_price - trade.entry_price) * trade.quantity
-    else:  # SELL
-        pnl = (trade.entry_price - exit_price) * trade.quantity
-    
-    pnl_percent = (pnl / (trade.entry_price * trade.quantity)) * 100
+    # Calculate P&L (SELL profits when price falls); the percentage is the
+    # signed price move, independent of quantity
+    diff = (exit_price - trade.entry_price) * (1 if trade.side == "BUY" else -1)
+    pnl = diff * trade.quantity
+    pnl_percent = (diff / trade.entry_price) * 100
     
-    # Update trade
+    # Update trade (an ORM flush, so the close invalidates the user's cached
+    # reports); no refresh needed, the session doesn't expire on commit
     trade.exit_price = exit_price
     trade.pnl = pnl
     trade.pnl_percent = pnl_percent
     trade.status = "CLOSED"
     trade.exit_time = datetime.utcnow()
     
-    db.commit()
-    db.refresh(trade)
+    await db.commit()
     
     return {
         "id": trade.id,
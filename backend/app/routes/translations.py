@@ -1,5 +1,7 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from typing import Dict, Any
+import orjson
+from app.http_cache import body_etag, static_json_response
 
 router = APIRouter(prefix="/api", tags=["translations"])
 
@@ -32,33 +34,44 @@ TRANSLATIONS = {
     "zh": {},  # To be added in Phase 2
 }
 
+AVAILABLE_LANGUAGES = ["fr", "en", "de", "es", "zh"]
+
+# Translations are static: serialize every response body once at import
+_LANG_PAYLOADS = {
+    lang: orjson.dumps({
+        "language": lang,
+        "translations": translations,
+        "available_languages": AVAILABLE_LANGUAGES
+    })
+    for lang, translations in TRANSLATIONS.items()
+}
+_ALL_PAYLOAD = orjson.dumps({
+    "languages": list(TRANSLATIONS.keys()),
+    "available": AVAILABLE_LANGUAGES,
+    "completed": ["fr", "en"],
+    "translations": TRANSLATIONS
+})
+
+# Bodies only change on deploy; let browsers/CDN reuse them for a day
+_CACHE_CONTROL = "public, max-age=86400"
+_LANG_ETAGS = {lang: body_etag(body) for lang, body in _LANG_PAYLOADS.items()}
+_ALL_ETAG = body_etag(_ALL_PAYLOAD)
+
 @router.get("/translations/{lang}")
-async def get_translations(lang: str):
+async def get_translations(lang: str, request: Request):
     """
     FEATURE 6.1: Get translations for a specific language
     Returns all available translations for the requested language
     Fallback to English if language not found
     """
-    lang_lower = lang.lower()
-    
-    if lang_lower not in TRANSLATIONS:
-        # Fallback to English
-        lang_lower = "en"
-    
-    return {
-        "language": lang_lower,
-        "translations": TRANSLATIONS[lang_lower],
-        "available_languages": ["fr", "en", "de", "es", "zh"]
-    }
+    lang = lang.lower()
+    if lang not in _LANG_PAYLOADS:
+        lang = "en"  # Fallback to English
+    return static_json_response(request, _LANG_PAYLOADS[lang], _LANG_ETAGS[lang], _CACHE_CONTROL)
 
 @router.get("/translations")
-async def get_all_translations():
+async def get_all_translations(request: Request):
     """
     Get all available translations
     """
-    return {
-        "languages": list(TRANSLATIONS.keys()),
-        "available": ["fr", "en", "de", "es", "zh"],
-        "completed": ["fr", "en"],
-        "translations": TRANSLATIONS
-    }
+    return static_json_response(request, _ALL_PAYLOAD, _ALL_ETAG, _CACHE_CONTROL)
@@ -2,17 +2,25 @@
 Watchlist API Routes
 Endpoints for managing user's crypto watchlist
 """
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, raiseload
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from pydantic import BaseModel, validator
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import datetime
 from uuid import UUID
-from app.db.database import get_db
-from app.auth.local_auth import get_current_user, UserResponse
+from app.db.database import AsyncSessionLocal, get_async_db
+from app.http_cache import body_etag, static_json_response
+from app.auth.local_auth import get_current_user_async, UserResponse
 from app.models.database_models import WatchlistItem
 from app.services import ai_bot_controller as ai_bot_controller_module
+import asyncio
+import functools
 import logging
+import orjson
 
 logger = logging.getLogger(__name__)
 
@@ -23,20 +31,24 @@ router = APIRouter(prefix="/api/watchlist", tags=["Watchlist"])
 # Helper Functions
 # ============================================
 
-def get_user_uuid(user_id) -> UUID:
-    """
-    Safely convert user_id to UUID
-    Handles both string and UUID inputs
-    """
-    if isinstance(user_id, UUID):
-        return user_id
-    if isinstance(user_id, str):
-        try:
-            return UUID(user_id)
-        except (ValueError, TypeError) as e:
-            logger.error(f"❌ Invalid user_id format: {user_id} - {str(e)}")
-            raise HTTPException(status_code=400, detail="Invalid user ID format")
-    raise HTTPException(status_code=400, detail="Invalid user ID format")
+# Characters dropped when normalizing a symbol ("btc/usdt " -> "BTCUSDT")
+_SYMBOL_STRIP = str.maketrans('', '', '/ \t\r\n')
+
+
+@functools.lru_cache(maxsize=4096)  # Bounded: the set of traded symbols is small
+def normalize_symbol(symbol: str) -> str:
+    """Normalize to Binance format (BTCUSDT, not BTC/USDT), adding USDT if missing"""
+    symbol = symbol.translate(_SYMBOL_STRIP).upper()
+    return symbol if symbol.endswith('USDT') else f"{symbol}USDT"
+
+
+# String priorities accepted by the watchlist API, keyed in the casings
+# clients send so the common case needs no .lower()
+_PRIORITY_MAP = {
+    key: value
+    for name, value in {'low': 0, 'medium': 5, 'high': 10, 'critical': 15}.items()
+    for key in (name, name.upper(), name.title())
+}
 
 
 # ============================================
@@ -66,6 +78,21 @@ POPULAR_SYMBOLS = [
     {"symbol": "CRO/USDT", "name": "Cronos", "logo": "🔷"},
 ]
 
+# GET /popular body, serialized once (the list is static)
+_POPULAR_BODY = orjson.dumps({
+    "symbols": POPULAR_SYMBOLS,
+    "count": len(POPULAR_SYMBOLS)
+})
+_POPULAR_ETAG = body_etag(_POPULAR_BODY)
+
+
+# Bulk add: skip symbols the user already has, report the ones inserted
+_BULK_INSERT = (
+    pg_insert(WatchlistItem)
+    .on_conflict_do_nothing(index_elements=["user_id", "symbol"])
+    .returning(WatchlistItem.symbol)
+)
+
 
 # ============================================
 # Pydantic Models
@@ -80,26 +107,16 @@ class WatchlistItemCreate(BaseModel):
     
     @validator('symbol')
     def validate_symbol(cls, v):
-        v = v.upper().strip()
-        # Normalize to Binance format (BTCUSDT, not BTC/USDT)
-        # Remove any slashes first
-        v = v.replace('/', '')
-        # Add USDT if missing
-        if not v.endswith('USDT'):
-            v = f"{v}USDT"
-        return v
+        return normalize_symbol(v)
     
     @validator('priority', pre=True)
     def validate_priority(cls, v):
         """Convert string priority to integer"""
         if isinstance(v, str):
-            priority_map = {
-                'low': 0,
-                'medium': 5,
-                'high': 10,
-                'critical': 15
-            }
-            return priority_map.get(v.lower(), 5)  # Default to medium (5)
+            priority = _PRIORITY_MAP.get(v)
+            if priority is None:  # Unusual casing: normalize, default to medium (5)
+                priority = _PRIORITY_MAP.get(v.lower(), 5)
+            return priority
         return v
 
 
@@ -128,17 +145,7 @@ class BulkAddRequest(BaseModel):
     
     @validator('symbols')
     def validate_symbols(cls, v):
-        # Normalize all symbols to Binance format (BTCUSDT, not BTC/USDT)
-        normalized = []
-        for s in v:
-            s = s.upper().strip()
-            # Remove any slashes
-            s = s.replace('/', '')
-            # Add USDT if missing
-            if not s.endswith('USDT'):
-                s = f"{s}USDT"
-            normalized.append(s)
-        return normalized
+        return [normalize_symbol(s) for s in v]
 
 
 # ============================================
@@ -147,13 +154,11 @@ class BulkAddRequest(BaseModel):
 
 @router.get("/popular")
 async def get_popular_symbols(
-    current_user: UserResponse = Depends(get_current_user)
+    request: Request,
+    current_user: UserResponse = Depends(get_current_user_async)
 ):
     """Get list of popular crypto symbols"""
-    return {
-        "symbols": POPULAR_SYMBOLS,
-        "count": len(POPULAR_SYMBOLS)
-    }
+    return static_json_response(request, _POPULAR_BODY, _POPULAR_ETAG, "private, max-age=3600")
 
 
 @router.get("/", name="get_watchlist_with_slash")
@@ -161,51 +166,51 @@ async def get_popular_symbols(
 async def get_watchlist(
     active_only: bool = Query(False, description="Only return active items"),
     include_recommendations: bool = Query(False, description="Include pending recommendations"),
-    db: Session = Depends(get_db),
-    current_user: UserResponse = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserResponse = Depends(get_current_user_async)
 ):
     """Get user's watchlist - returns as array for frontend compatibility"""
     logger.info(f"📋 [WATCHLIST] Fetching watchlist for user {current_user.id}")
     try:
-        user_uuid = get_user_uuid(current_user.id)
-        logger.info(f"📋 [WATCHLIST] User UUID: {user_uuid}")
-        
-        query = db.query(WatchlistItem).filter(
+        user_uuid = current_user.uuid
+        
+        # Only the columns the response serializes; touching any other
+        # column or a lazy relationship in the loop below raises instead of
+        # emitting one SELECT per item
+        stmt = select(WatchlistItem).options(load_only(
+            WatchlistItem.id, WatchlistItem.symbol, WatchlistItem.base_currency,
+            WatchlistItem.quote_currency, WatchlistItem.is_active,
+            WatchlistItem.priority, WatchlistItem.notes, WatchlistItem.created_at,
+            raiseload=True
+        ), raiseload("*")).where(
             WatchlistItem.user_id == user_uuid
         )
         
         if active_only:
-            query = query.filter(WatchlistItem.is_active == True)
+            stmt = stmt.where(WatchlistItem.is_active == True)
         
-        items = query.order_by(WatchlistItem.priority.desc(), WatchlistItem.created_at).all()
+        items = (await db.execute(
+            stmt.order_by(WatchlistItem.priority.desc(), WatchlistItem.created_at)
+        )).scalars().all()
         logger.info(f"📋 [WATCHLIST] Found {len(items)} items")
         
-        # Format items for response
-        formatted_items = []
-        for item in items:
-            logger.info(f"📋 [WATCHLIST] Item: {item.symbol} (active={item.is_active})")
-            logger.info(f"📋 [WATCHLIST] base_currency from DB: '{item.base_currency}' (type: {type(item.base_currency)})")
-            
-            # Extract base_currency from symbol if empty
-            base_currency = item.base_currency
-            if not base_currency and item.symbol:
-                # Remove 'USDT' suffix to get base currency (e.g., BTCUSDT -> BTC)
-                base_currency = item.symbol.replace('USDT', '').replace('/USDT', '').strip()
-                logger.info(f"📋 [WATCHLIST] Extracted base_currency from symbol: '{base_currency}'")
-            
-            quote_currency = item.quote_currency or 'USDT'
-            logger.info(f"📋 [WATCHLIST] Final: symbol={item.symbol}, base={base_currency}, quote={quote_currency}")
-            
-            formatted_items.append({
-                "id": str(item.id),
+        # Format items for response. id and created_at stay UUID/datetime:
+        # the response is handed straight to orjson, which emits the same
+        # strings as str()/isoformat() without a jsonable_encoder pass
+        formatted_items = [
+            {
+                "id": item.id,
                 "symbol": item.symbol,
-                "base_currency": base_currency,
-                "quote_currency": quote_currency,
+                # Extract base_currency from symbol if empty (e.g., BTCUSDT -> BTC)
+                "base_currency": item.base_currency or item.symbol.replace('USDT', '').replace('/USDT', '').strip(),
+                "quote_currency": item.quote_currency or 'USDT',
                 "is_active": item.is_active,
                 "priority": item.priority,
                 "notes": item.notes,
-                "created_at": item.created_at.isoformat() if item.created_at else None
-            })
+                "created_at": item.created_at
+            }
+            for item in items
+        ]
         
         # Build base response
         response = [{
@@ -222,7 +227,10 @@ async def get_watchlist(
             from app.services.watchlist_recommendation_engine import get_recommendation_engine
             engine = get_recommendation_engine()
             
-            recommendations = engine.get_user_pending_recommendations(db, str(user_uuid), limit=10)
+            # The engine works on a sync Session; run it on this connection
+            recommendations = await db.run_sync(
+                engine.get_user_pending_recommendations, current_user.id, limit=10
+            )
             
             response[0]["pending_recommendations"] = recommendations
             response[0]["recommendation_count"] = len(recommendations)
@@ -230,7 +238,7 @@ async def get_watchlist(
             logger.info(f"📋 [WATCHLIST] Added {len(recommendations)} pending recommendations")
         
         logger.info(f"✅ [WATCHLIST] Returning {len(formatted_items)} symbols")
-        return response
+        return ORJSONResponse(response)
     except HTTPException:
         raise
     except Exception as e:
@@ -243,55 +251,53 @@ async def get_watchlist(
 @router.post("/add")  # Alias for frontend compatibility
 async def add_to_watchlist(
     request: WatchlistItemCreate,
-    db: Session = Depends(get_db),
-    current_user: UserResponse = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserResponse = Depends(get_current_user_async)
 ):
     """Add a symbol to watchlist"""
     try:
-        user_uuid = get_user_uuid(current_user.id)
-        
-        # Check if already exists
-        existing = db.query(WatchlistItem).filter(
-            WatchlistItem.user_id == user_uuid,
-            WatchlistItem.symbol == request.symbol
-        ).first()
-        
-        if existing:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Symbol {request.symbol} is already in your watchlist"
-            )
+        user_uuid = current_user.uuid
         
         # Parse symbol
         parts = request.symbol.split('/')
         base_currency = parts[0] if len(parts) > 0 else None
         quote_currency = parts[1] if len(parts) > 1 else None
         
-        # Create item
-        item = WatchlistItem(
-            user_id=user_uuid,
-            symbol=request.symbol,
-            base_currency=base_currency,
-            quote_currency=quote_currency,
-            notes=request.notes,
-            priority=request.priority,
-            is_active=True
-        )
+        # Insert unless already present: the (user_id, symbol) unique index
+        # does the duplicate check, no separate SELECT round-trip
+        item_id = (await db.execute(
+            pg_insert(WatchlistItem)
+            .values(
+                user_id=user_uuid,
+                symbol=request.symbol,
+                base_currency=base_currency,
+                quote_currency=quote_currency,
+                notes=request.notes,
+                priority=request.priority,
+                is_active=True
+            )
+            .on_conflict_do_nothing(index_elements=["user_id", "symbol"])
+            .returning(WatchlistItem.id)
+        )).scalar()
+        
+        if item_id is None:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Symbol {request.symbol} is already in your watchlist"
+            )
         
-        db.add(item)
-        db.commit()
-        db.refresh(item)
+        await db.commit()
         
         # Sync with AI config
-        await _sync_watchlist_to_ai(db, str(current_user.id))
+        _schedule_sync(current_user.uuid)
         
         logger.info(f"✅ Added {request.symbol} to watchlist for user {current_user.id}")
         
         return {
             "status": "success",
             "message": f"{request.symbol} added to watchlist",
-            "id": str(item.id),
-            "symbol": item.symbol
+            "id": str(item_id),
+            "symbol": request.symbol
         }
     except HTTPException:
         raise
@@ -303,49 +309,46 @@ async def add_to_watchlist(
 @router.post("/bulk")
 async def bulk_add_to_watchlist(
     request: BulkAddRequest,
-    db: Session = Depends(get_db),
-    current_user: UserResponse = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserResponse = Depends(get_current_user_async)
 ):
     """Add multiple symbols to watchlist at once"""
     try:
-        user_uuid = get_user_uuid(current_user.id)
-        logger.info(f"📥 Bulk add request: {request.symbols} for user {current_user.id}")
-        added = []
-        skipped = []
-        
-        for symbol in request.symbols:
-            # Check if already exists for THIS user
-            existing = db.query(WatchlistItem).filter(
-                WatchlistItem.user_id == user_uuid,
-                WatchlistItem.symbol == symbol
-            ).first()
-            
-            if existing:
-                skipped.append(symbol)
-                logger.debug(f"⏭️ Skipped {symbol} - already exists for user")
-                continue
-            
-            # Parse symbol
-            parts = symbol.split('/')
-            base_currency = parts[0] if len(parts) > 0 else None
-            quote_currency = parts[1] if len(parts) > 1 else None
-            
-            # Create item with correct user_id
-            item = WatchlistItem(
-                user_id=user_uuid,
-                symbol=symbol,
-                base_currency=base_currency,
-                quote_currency=quote_currency,
-                is_active=True
-            )
-            db.add(item)
-            added.append(symbol)
-            logger.info(f"➕ Added {symbol} for user {current_user.id}")
-        
-        db.commit()
+        user_uuid = current_user.uuid
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"📥 Bulk add request: {request.symbols} for user {current_user.id}")
+        symbols = list(dict.fromkeys(request.symbols))  # Dedupe, keep order
+        
+        # One batched INSERT for every symbol; symbols already in THIS
+        # user's watchlist hit the (user_id, symbol) unique index and are
+        # skipped. Rows are passed as executemany parameters (batched by
+        # insertmanyvalues) so the statement compiles once whatever the
+        # number of symbols, instead of one cached VALUES shape per count.
+        inserted = set()
+        if symbols:
+            inserted = set((await db.execute(
+                _BULK_INSERT,
+                [
+                    {
+                        "user_id": user_uuid,
+                        "symbol": symbol,
+                        # Normalized symbols carry no "/": base = symbol
+                        "base_currency": symbol,
+                        "quote_currency": None,
+                        "is_active": True
+                    }
+                    for symbol in symbols
+                ]
+            )).scalars())
+        added = [symbol for symbol in symbols if symbol in inserted]
+        skipped = [symbol for symbol in symbols if symbol not in inserted]
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"➕ Added {added} for user {current_user.id}")
+        
+        await db.commit()
         
         # Sync with AI config
-        await _sync_watchlist_to_ai(db, str(current_user.id))
+        _schedule_sync(current_user.uuid)
         
         logger.info(f"✅ Bulk result: added={len(added)}, skipped={len(skipped)}")
         
@@ -365,16 +368,16 @@ async def bulk_add_to_watchlist(
 
 @router.put("/{item_id}")
 async def update_watchlist_item(
-    item_id: str,
+    item_id: UUID,
     request: WatchlistItemUpdate,
-    db: Session = Depends(get_db),
-    current_user: UserResponse = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserResponse = Depends(get_current_user_async)
 ):
     """Update a watchlist item"""
-    item = db.query(WatchlistItem).filter(
+    item = (await db.execute(select(WatchlistItem).where(
         WatchlistItem.id == item_id,
-        WatchlistItem.user_id == UUID(current_user.id)
-    ).first()
+        WatchlistItem.user_id == current_user.uuid
+    ))).scalars().first()
     
     if not item:
         raise HTTPException(status_code=404, detail="Watchlist item not found")
@@ -387,11 +390,11 @@ async def update_watchlist_item(
     if request.priority is not None:
         item.priority = request.priority
     
-    db.commit()
+    await db.commit()
     
     # Sync with AI config if active status changed
     if request.is_active is not None:
-        await _sync_watchlist_to_ai(db, current_user.id)
+        _schedule_sync(current_user.uuid)
     
     return {
         "status": "success",
@@ -401,25 +404,25 @@ async def update_watchlist_item(
 
 @router.delete("/{item_id}")
 async def remove_from_watchlist(
-    item_id: str,
-    db: Session = Depends(get_db),
-    current_user: UserResponse = Depends(get_current_user)
+    item_id: UUID,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserResponse = Depends(get_current_user_async)
 ):
     """Remove a symbol from watchlist"""
-    item = db.query(WatchlistItem).filter(
+    item = (await db.execute(select(WatchlistItem).where(
         WatchlistItem.id == item_id,
-        WatchlistItem.user_id == UUID(current_user.id)
-    ).first()
+        WatchlistItem.user_id == current_user.uuid
+    ))).scalars().first()
     
     if not item:
         raise HTTPException(status_code=404, detail="Watchlist item not found")
     
     symbol = item.symbol
-    db.delete(item)
-    db.commit()
+    await db.delete(item)
+    await db.commit()
     
     # Sync with AI config
-    await _sync_watchlist_to_ai(db, current_user.id)
+    _schedule_sync(current_user.uuid)
     
     logger.info(f"🗑️ Removed {symbol} from watchlist")
     
@@ -431,24 +434,24 @@ async def remove_from_watchlist(
 
 @router.post("/{item_id}/toggle")
 async def toggle_watchlist_item(
-    item_id: str,
-    db: Session = Depends(get_db),
-    current_user: UserResponse = Depends(get_current_user)
+    item_id: UUID,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserResponse = Depends(get_current_user_async)
 ):
     """Toggle a watchlist item's active status"""
-    item = db.query(WatchlistItem).filter(
+    item = (await db.execute(select(WatchlistItem).where(
         WatchlistItem.id == item_id,
-        WatchlistItem.user_id == UUID(current_user.id)
-    ).first()
+        WatchlistItem.user_id == current_user.uuid
+    ))).scalars().first()
     
     if not item:
         raise HTTPException(status_code=404, detail="Watchlist item not found")
     
     item.is_active = not item.is_active
-    db.commit()
+    await db.commit()
     
     # Sync with AI config
-    await _sync_watchlist_to_ai(db, current_user.id)
+    _schedule_sync(current_user.uuid)
     
     return {
         "status": "success",
@@ -460,16 +463,14 @@ async def toggle_watchlist_item(
 
 @router.get("/symbols")
 async def get_watchlist_symbols(
-    db: Session = Depends(get_db),
-    current_user: UserResponse = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserResponse = Depends(get_current_user_async)
 ):
     """Get just the active symbol list (for AI config sync)"""
-    items = db.query(WatchlistItem).filter(
-        WatchlistItem.user_id == UUID(current_user.id),
+    symbols = (await db.execute(select(WatchlistItem.symbol).where(
+        WatchlistItem.user_id == current_user.uuid,
         WatchlistItem.is_active == True
-    ).order_by(WatchlistItem.priority.desc()).all()
-    
-    symbols = [item.symbol for item in items]
+    ).order_by(WatchlistItem.priority.desc()))).scalars().all()
     
     return {
         "symbols": symbols,
@@ -481,16 +482,50 @@ async def get_watchlist_symbols(
 # Helper Functions
 # ============================================
 
-async def _sync_watchlist_to_ai(db: Session, user_id: str):
-    """Sync active watchlist symbols to AI Bot Controller config"""
+# Seconds to wait for further changes before syncing a user's watchlist
+_SYNC_DEBOUNCE_SECONDS = 0.5
+
+# user_id -> latest sync task, kept until it finishes: the event loop only
+# holds weak references to tasks, so this one keeps it from being collected
+_pending_syncs: Dict[UUID, asyncio.Task] = {}
+
+
+def _schedule_sync(user_id: UUID):
+    """
+    Sync the user's watchlist to the AI config once changes settle: each
+    call restarts the delay, so a burst of edits (e.g. accepting several
+    recommendations) costs one sync instead of one per request. A sync
+    already running is cancelled too; the new one reads the latest state.
+    """
+    pending = _pending_syncs.get(user_id)
+    if pending is not None:
+        pending.cancel()
+    _pending_syncs[user_id] = asyncio.create_task(_delayed_sync(user_id))
+
+
+async def _delayed_sync(user_id: UUID):
+    try:
+        await asyncio.sleep(_SYNC_DEBOUNCE_SECONDS)
+        await _sync_watchlist_to_ai(user_id)
+    finally:
+        # Unless a newer change has already replaced this task
+        if _pending_syncs.get(user_id) is asyncio.current_task():
+            del _pending_syncs[user_id]
+
+
+async def _sync_watchlist_to_ai(user_id: UUID):
+    """
+    Sync active watchlist symbols to AI Bot Controller config.
+    Runs after the response is sent, so it opens its own session (the
+    request's is closed by then).
+    """
     try:
         # Get active symbols
-        items = db.query(WatchlistItem).filter(
-            WatchlistItem.user_id == UUID(user_id),
-            WatchlistItem.is_active == True
-        ).order_by(WatchlistItem.priority.desc()).all()
-        
-        symbols = [item.symbol for item in items]
+        async with AsyncSessionLocal() as db:
+            symbols = (await db.execute(select(WatchlistItem.symbol).where(
+                WatchlistItem.user_id == user_id,
+                WatchlistItem.is_active == True
+            ).order_by(WatchlistItem.priority.desc()))).scalars().all()
         
         # Update AI Bot Controller config
         controller = ai_bot_controller_module.ai_bot_controller
@@ -526,54 +561,29 @@ class RecommendationAcceptRequest(BaseModel):
 @router.get("/recommendations/pending")
 async def get_pending_recommendations(
     limit: int = Query(50, le=100),
-    db: Session = Depends(get_db),
-    current_user: UserResponse = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserResponse = Depends(get_current_user_async)
 ):
     """
     Get global pending recommendations, filtered by what the user already has.
     """
     try:
-        user_uuid = get_user_uuid(current_user.id)
+        user_uuid = current_user.uuid
         SYSTEM_USER_ID = "00000000-0000-0000-0000-000000000000"
         
-        # 1. Get user's existing watchlist symbols (BOTH active and inactive)
-        # We need inactive ones too to show REMOVE recommendations for items they've disabled
-        existing_items = db.query(WatchlistItem.symbol).filter(
-            WatchlistItem.user_id == user_uuid
-        ).all()
-        user_symbols = {item.symbol for item in existing_items}
-        
-        # 2. Get GLOBAL recommendations (from System User)
         from app.services.watchlist_recommendation_engine import get_recommendation_engine
         from app.db.database import SessionLocal
         engine = get_recommendation_engine(SessionLocal)
         
-        # We fetch MORE than the limit to allow for filtering
-        raw_recommendations = engine.get_user_pending_recommendations(
-            db, SYSTEM_USER_ID, limit=limit * 2
+        # GLOBAL recommendations (from System User), minus what doesn't apply
+        # to this user: ADD for symbols they already have, REMOVE for symbols
+        # they don't (inactive items count as had, so disabled symbols still
+        # get REMOVE recommendations). Filtered in SQL so LIMIT is exact.
+        final_recommendations = await db.run_sync(
+            engine.get_global_recommendations_for_user, current_user.id, SYSTEM_USER_ID, limit=limit
         )
         
-        # 3. Filter out what user already has
-        # Also filter out REMOVE actions if the user doesn't have the symbol (doesn't make sense to recommend removing something they don't have)
-        filtered_recommendations = []
-        for rec in raw_recommendations:
-            symbol = rec['symbol']
-            action = rec['action']
-            
-            # If user has the symbol, we skip ADD recommendations (already added)
-            # If user does NOT have the symbol, we skip REMOVE recommendations (nothing to remove)
-            
-            if symbol in user_symbols:
-                if action == 'REMOVE':
-                    filtered_recommendations.append(rec)
-            else:
-                if action == 'ADD':
-                    filtered_recommendations.append(rec)
-        
-        # Apply limit after filtering
-        final_recommendations = filtered_recommendations[:limit]
-        
-        logger.info(f"[RECOMMENDATION] User {user_uuid}: {len(final_recommendations)} global recs (filtered from {len(raw_recommendations)})")
+        logger.info(f"[RECOMMENDATION] User {user_uuid}: {len(final_recommendations)} global recs")
         
         return {
             "recommendations": final_recommendations,
@@ -590,25 +600,34 @@ async def get_pending_recommendations(
 async def accept_recommendation(
     recommendation_id: str,
     request: RecommendationAcceptRequest,
-    db: Session = Depends(get_db),
-    current_user: UserResponse = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserResponse = Depends(get_current_user_async)
 ):
     """
     Accept a recommendation.
     Optionally adds the symbol to the user's watchlist.
     """
     try:
-        user_uuid = get_user_uuid(current_user.id)
+        user_uuid = current_user.uuid
         SYSTEM_USER_ID = "00000000-0000-0000-0000-000000000000"
         
-        # Get recommendation (allowing Global OR User-specific)
-        from sqlalchemy import text
-        result = db.execute(text("""
-            SELECT symbol, action, user_id FROM watchlist_recommendations
-            WHERE id = :id AND (user_id = :user_id OR user_id = :system_user_id)
+        # Get recommendation (allowing Global OR User-specific) and, in the
+        # same statement, mark it accepted ONLY if owned by user
+        # (Global recs stay available for others)
+        result = await db.execute(text("""
+            WITH rec AS (
+                SELECT id, symbol, action, user_id FROM watchlist_recommendations
+                WHERE id = :id AND (user_id = :user_id OR user_id = :system_user_id)
+            ), accepted AS (
+                UPDATE watchlist_recommendations w
+                SET accepted = true, accepted_at = NOW()
+                FROM rec
+                WHERE w.id = rec.id AND rec.user_id = :user_id
+            )
+            SELECT symbol, action FROM rec
         """), {
             "id": recommendation_id, 
-            "user_id": str(user_uuid),
+            "user_id": current_user.id,
             "system_user_id": SYSTEM_USER_ID
         })
         
@@ -619,71 +638,45 @@ async def accept_recommendation(
         
         symbol = rec[0]
         action = rec[1]
-        rec_owner_id = str(rec[2])
-        
-        # Mark as accepted ONLY if owned by user
-        # (Global recs stay available for others)
-        if rec_owner_id == str(user_uuid):
-            db.execute(text("""
-                UPDATE watchlist_recommendations
-                SET accepted = true, accepted_at = NOW()
-                WHERE id = :id
-            """), {"id": recommendation_id})
         
         # Handle action: ADD (add to watchlist) or REMOVE (deactivate from watchlist)
         if request.add_to_watchlist:
             if action == "ADD":
-                # Add to watchlist if requested and action is ADD
-                existing = db.query(WatchlistItem).filter(
-                    WatchlistItem.user_id == user_uuid,
-                    WatchlistItem.symbol == symbol
-                ).first()
+                # Add to watchlist, or reactivate the item if the user already
+                # has it, in one upsert on the (user_id, symbol) unique index
+                normalized_symbol = normalize_symbol(symbol)
+                base_currency = normalized_symbol[:-4]  # Normalized symbols always end in USDT
                 
-                if not existing:
-                    # Normalize to Binance format (BTCUSDT, not BTC/USDT)
-                    normalized_symbol = symbol.upper().strip()
-                    normalized_symbol = normalized_symbol.replace('/', '')
-                    if not normalized_symbol.endswith('USDT'):
-                        normalized_symbol = f"{normalized_symbol}USDT"
-                    
-                    # Extract base currency from normalized symbol
-                    base_currency = normalized_symbol.replace('USDT', '').replace('/USDT', '').strip()
-                    
-                    try:
-                        new_item = WatchlistItem(
-                            user_id=user_uuid,
-                            symbol=normalized_symbol,
-                            base_currency=base_currency,
-                            quote_currency='USDT',
-                            is_active=True,
-                            priority=5,
-                            notes=f"Added from recommendation"
-                        )
-                        db.add(new_item)
-                        logger.info(f"[RECOMMENDATION] ✅ Added {normalized_symbol} to watchlist for user {user_uuid}")
-                    except Exception as e:
-                        logger.error(f"[RECOMMENDATION] ❌ Failed to add {symbol} to watchlist: {e}")
-                        db.rollback()
-                        raise
-                else:
-                    # Item exists but might be inactive, reactivate it
-                    if not existing.is_active:
-                        existing.is_active = True
-                        logger.info(f"[RECOMMENDATION] ✅ Reactivated {symbol} in watchlist for user {user_uuid}")
+                insert_stmt = pg_insert(WatchlistItem).values(
+                    user_id=user_uuid,
+                    symbol=normalized_symbol,
+                    base_currency=base_currency,
+                    quote_currency='USDT',
+                    is_active=True,
+                    priority=5,
+                    notes="Added from recommendation"
+                )
+                await db.execute(insert_stmt.on_conflict_do_update(
+                    index_elements=["user_id", "symbol"],
+                    set_={"is_active": True}
+                ))
+                logger.info(f"[RECOMMENDATION] ✅ Added {normalized_symbol} to watchlist for user {user_uuid}")
             
             elif action == "REMOVE":
                 # Remove/deactivate from watchlist if action is REMOVE
-                existing = db.query(WatchlistItem).filter(
-                    WatchlistItem.user_id == user_uuid,
-                    WatchlistItem.symbol == symbol
-                ).first()
-                
-                if existing:
-                    existing.is_active = False  # Deactivate instead of delete
+                deactivated = await db.execute(
+                    update(WatchlistItem)
+                    .where(WatchlistItem.user_id == user_uuid, WatchlistItem.symbol == symbol)
+                    .values(is_active=False)  # Deactivate instead of delete
+                )
+                if deactivated.rowcount:
                     logger.info(f"[RECOMMENDATION] ✅ Deactivated {symbol} from watchlist for user {user_uuid}")
         
         
-        db.commit()
+        await db.commit()
+        
+        if request.add_to_watchlist and action in ("ADD", "REMOVE"):
+            _schedule_sync(current_user.uuid)
         
         logger.info(f"[RECOMMENDATION] User {user_uuid} accepted {symbol} ({action})")
         
@@ -699,29 +692,28 @@ async def accept_recommendation(
         raise
     except Exception as e:
         logger.error(f"[RECOMMENDATION] Error accepting: {e}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/recommendations/{recommendation_id}/reject")
 async def reject_recommendation(
     recommendation_id: str,
-    db: Session = Depends(get_db),
-    current_user: UserResponse = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserResponse = Depends(get_current_user_async)
 ):
     """
     Reject a recommendation.
     Marks it as not accepted without adding to watchlist.
     """
     try:
-        user_uuid = get_user_uuid(current_user.id)
+        user_uuid = current_user.uuid
         
         # Check if exists
-        from sqlalchemy import text
-        result = db.execute(text("""
+        result = await db.execute(text("""
             SELECT symbol FROM watchlist_recommendations
             WHERE id = :id AND user_id = :user_id
-        """), {"id": recommendation_id, "user_id": str(user_uuid)})
+        """), {"id": recommendation_id, "user_id": current_user.id})
         
         rec = result.fetchone()
         
@@ -731,13 +723,13 @@ async def reject_recommendation(
         symbol = rec[0]
         
         # Mark as rejected
-        db.execute(text("""
+        await db.execute(text("""
             UPDATE watchlist_recommendations
             SET accepted = false, accepted_at = NOW()
             WHERE id = :id
         """), {"id": recommendation_id})
         
-        db.commit()
+        await db.commit()
         
         logger.info(f"[RECOMMENDATION] User {user_uuid} rejected {symbol}")
         
@@ -751,17 +743,31 @@ async def reject_recommendation(
         raise
     except Exception as e:
         logger.error(f"[RECOMMENDATION] Error rejecting: {e}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _encode_history_cursor(accepted_at: Optional[datetime], rec_id) -> str:
+    """Keyset cursor for recommendation history: '<iso accepted_at>_<rec id>' (time empty when NULL)."""
+    return f"{accepted_at.isoformat() if accepted_at else ''}_{rec_id}"
+
+
+def _decode_history_cursor(cursor: str):
+    """Inverse of _encode_history_cursor. Raises ValueError on malformed input."""
+    time_part, sep, id_part = cursor.partition("_")
+    if not sep:
+        raise ValueError("cursor has no recommendation id")
+    return (datetime.fromisoformat(time_part) if time_part else None), UUID(id_part)
+
+
 @router.get("/recommendations/history")
 async def get_recommendation_history(
     status: Optional[str] = Query(None, regex="^(accepted|rejected|all)$"),
     limit: int = Query(50, le=200),
     offset: int = Query(0, ge=0),
-    db: Session = Depends(get_db),
-    current_user: UserResponse = Depends(get_current_user)
+    cursor: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserResponse = Depends(get_current_user_async)
 ):
     """
     Get recommendation history with pagination.
@@ -770,11 +776,12 @@ async def get_recommendation_history(
         status: Filter by status (accepted, rejected, or all)
         limit: Number of results per page
         offset: Pagination offset
+        cursor: next_cursor from the previous page; switches to keyset
+            pagination (offset is ignored and total_count is not computed)
     """
     try:
-        user_uuid = get_user_uuid(current_user.id)
-        
-        from sqlalchemy import text
+        user_uuid = current_user.uuid
+        params = {"user_id": current_user.id, "limit": limit}
         
         # Build query based on status filter
         where_clause = "WHERE user_id = :user_id AND accepted IS NOT NULL"
@@ -783,22 +790,56 @@ async def get_recommendation_history(
         elif status == "rejected":
             where_clause += " AND accepted = false"
         
-        # Get total count
-        count_result = db.execute(text(f"""
-            SELECT COUNT(*) FROM watchlist_recommendations
-            {where_clause}
-        """), {"user_id": str(user_uuid)})
-        
-        total_count = count_result.fetchone()[0]
-        
-        # Get paginated results
-        result = db.execute(text(f"""
-            SELECT id, symbol, score, action, reasoning, accepted, accepted_at, created_at
-            FROM watchlist_recommendations
-            {where_clause}
-            ORDER BY accepted_at DESC
-            LIMIT :limit OFFSET :offset
-        """), {"user_id": str(user_uuid), "limit": limit, "offset": offset})
+        columns = "id, symbol, score, action, reasoning, accepted, accepted_at, created_at"
+        
+        if cursor:
+            # Keyset pagination: seek past the last row of the previous page
+            # (idx_rec_user_accepted_at) instead of OFFSET-scanning every
+            # row before it
+            try:
+                cursor_at, params["cursor_id"] = _decode_history_cursor(cursor)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            if cursor_at is None:
+                # NULL accepted_at sorts first in DESC order, so the rest of
+                # the NULL rows come next, then every dated row
+                seek = "AND ((accepted_at IS NULL AND id < :cursor_id) OR accepted_at IS NOT NULL)"
+            else:
+                seek = "AND (accepted_at, id) < (:cursor_at, :cursor_id)"
+                params["cursor_at"] = cursor_at
+            rows = (await db.execute(text(f"""
+                SELECT {columns}
+                FROM watchlist_recommendations
+                {where_clause} {seek}
+                ORDER BY accepted_at DESC, id DESC
+                LIMIT :limit
+            """), {**params, "limit": limit + 1})).fetchall()
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+            total_count = None
+        else:
+            # Get the page and the total in one pass: COUNT(*) OVER () is
+            # computed over the filtered set before LIMIT/OFFSET apply
+            rows = (await db.execute(text(f"""
+                SELECT {columns},
+                       COUNT(*) OVER () AS total_count
+                FROM watchlist_recommendations
+                {where_clause}
+                ORDER BY accepted_at DESC, id DESC
+                LIMIT :limit OFFSET :offset
+            """), {**params, "offset": offset})).fetchall()
+            
+            if rows:
+                total_count = rows[0][8]
+            elif offset:
+                # Paged past the end: no row to carry the total, count separately
+                total_count = (await db.execute(text(f"""
+                    SELECT COUNT(*) FROM watchlist_recommendations
+                    {where_clause}
+                """), {"user_id": current_user.id})).scalar()
+            else:
+                total_count = 0
+            has_more = (offset + limit) < total_count
         
         history = [
             {
@@ -811,9 +852,13 @@ async def get_recommendation_history(
                 "accepted_at": row[6].isoformat() if row[6] else None,
                 "created_at": row[7].isoformat() if row[7] else None
             }
-            for row in result.fetchall()
+            for row in rows
         ]
         
+        next_cursor = None
+        if has_more and rows:
+            next_cursor = _encode_history_cursor(rows[-1][6], rows[-1][0])
+        
         logger.info(f"[RECOMMENDATION] History for user {user_uuid}: {len(history)} items")
         
         return {
@@ -821,9 +866,12 @@ async def get_recommendation_history(
             "total_count": total_count,
             "limit": limit,
             "offset": offset,
-            "has_more": (offset + limit) < total_count
+            "has_more": has_more,
+            "next_cursor": next_cursor
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"[RECOMMENDATION] Error fetching history: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -835,8 +883,8 @@ async def get_recommendation_history(
 
 @router.post("/recommendations/generate-now")
 async def generate_recommendations_now(
-    current_user: UserResponse = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: UserResponse = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Manually trigger recommendation generation for the current user
@@ -845,7 +893,7 @@ async def generate_recommendations_now(
     Returns the number of recommendations generated
     """
     try:
-        user_uuid = get_user_uuid(current_user.id)
+        user_uuid = current_user.uuid
         logger.info(f"📊 [TRIGGER] Manual recommendation generation requested by {user_uuid}")
         
         # Import here to avoid circular imports
@@ -856,17 +904,17 @@ async def generate_recommendations_now(
         engine = get_recommendation_engine(SessionLocal)
         
         # Generate recommendations for this user
-        recommendations = engine.generate_recommendations(user_id=str(user_uuid))
+        recommendations = engine.generate_recommendations(user_id=current_user.id)
         
         # Save to database
-        saved_count = engine.save_recommendations(db, str(user_uuid), recommendations)
+        saved_count = await db.run_sync(engine.save_recommendations, current_user.id, recommendations)
         
         logger.info(f"✅ [TRIGGER] Generated {len(recommendations)} recommendations for user {user_uuid}")
         logger.info(f"💾 [TRIGGER] Saved {saved_count} recommendations to database")
         
         return {
             "status": "success",
-            "user_id": str(user_uuid),
+            "user_id": current_user.id,
             "count": len(recommendations),
             "saved": saved_count,
             "recommendations": [
@@ -848,12 +848,9 @@ class AITradingAgent:
             entry_price = float(open_trade.entry_price)
             quantity = float(open_trade.quantity)
             
-            if open_trade.side == "BUY":
-                pnl = (exit_price - entry_price) * quantity
-            else:
-                pnl = (entry_price - exit_price) * quantity
-            
-            pnl_percent = (pnl / (entry_price * quantity)) * 100
+            diff = (exit_price - entry_price) * (1 if open_trade.side == "BUY" else -1)
+            pnl = diff * quantity
+            pnl_percent = (diff / entry_price) * 100
             
             # Update trade
             open_trade.exit_price = exit_price
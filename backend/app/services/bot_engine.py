@@ -8,6 +8,7 @@ import asyncio
 import json
 from typing import Dict, Any, List, Optional
 from datetime import datetime
+from sqlalchemy import func, case
 from sqlalchemy.orm import Session
 from app.models.database_models import Bot, Trade, Portfolio
 from app.services.strategies import StrategyRegistry
@@ -1008,15 +1009,17 @@ class BotEngine:
                 pnl = trade.pnl or 0
                 bot.total_pnl = float(bot.total_pnl or 0) + pnl
                 
-                # Recalculate win rate
-                closed_trades = db.query(Trade).filter(
+                # Recalculate win rate (counted by the database)
+                closed_count, winning = db.query(
+                    func.count(Trade.id),
+                    func.coalesce(func.sum(case((Trade.pnl > 0, 1), else_=0)), 0)
+                ).filter(
                     Trade.bot_id == bot.id,
                     Trade.status == "CLOSED"
-                ).all()
+                ).one()
                 
-                if closed_trades:
-                    winning = len([t for t in closed_trades if (t.pnl or 0) > 0])
-                    bot.win_rate = (winning / len(closed_trades)) * 100
+                if closed_count:
+                    bot.win_rate = (winning / closed_count) * 100
         
         db.commit()
     
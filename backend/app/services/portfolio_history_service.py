@@ -0,0 +1,83 @@
+"""
+Portfolio History Service
+Snapshots every portfolio's total value into portfolio_history once per hour.
+
+One row per (user_id, date): each run upserts today's row, so the table ends
+up holding the last known equity of each day. Reports (drawdown history)
+read these rows instead of recomputing or simulating past values.
+"""
+
+import asyncio
+from typing import Optional
+import logging
+from sqlalchemy import text
+from app.db.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+SNAPSHOT_SQL = text("""
+    INSERT INTO portfolio_history (user_id, date, equity, updated_at)
+    SELECT user_id, CURRENT_DATE, total_value, NOW()
+    FROM portfolios
+    WHERE total_value IS NOT NULL
+    ON CONFLICT (user_id, date)
+    DO UPDATE SET equity = EXCLUDED.equity, updated_at = EXCLUDED.updated_at
+""")
+
+
+class PortfolioHistoryService:
+    """
+    Periodic job writing daily equity snapshots for all portfolios
+    """
+    
+    def __init__(self):
+        self.running = False
+        self.snapshot_interval = 3600  # Snapshot every hour
+    
+    async def start(self):
+        """Start the snapshot loop"""
+        self.running = True
+        logger.info("🚀 Portfolio History Service started")
+        
+        while self.running:
+            try:
+                await asyncio.to_thread(self.snapshot_all_portfolios)
+                await asyncio.sleep(self.snapshot_interval)
+            except Exception as e:
+                logger.error(f"Error in portfolio history loop: {str(e)}")
+                await asyncio.sleep(60)  # Retry after 1min on error
+    
+    def stop(self):
+        """Stop the snapshot loop"""
+        self.running = False
+        logger.info("🛑 Portfolio History Service stopped")
+    
+    def snapshot_all_portfolios(self) -> int:
+        """Upsert today's equity for every portfolio in one statement"""
+        db = SessionLocal()
+        try:
+            result = db.execute(SNAPSHOT_SQL)
+            db.commit()
+            logger.debug(f"Portfolio history: {result.rowcount} snapshots written")
+            return result.rowcount
+        finally:
+            db.close()
+
+
+# Global instance
+portfolio_history_service: Optional[PortfolioHistoryService] = None
+
+
+def get_portfolio_history_service() -> PortfolioHistoryService:
+    """Get or create the global portfolio history service"""
+    global portfolio_history_service
+    if portfolio_history_service is None:
+        portfolio_history_service = PortfolioHistoryService()
+    return portfolio_history_service
+
+
+def stop_portfolio_history_service():
+    """Stop the background portfolio history job"""
+    service = get_portfolio_history_service()
+    service.stop()
@@ -946,9 +946,8 @@ class SLTPManager:
             
             db = self.db_session_factory()
             try:
-                settings = db.query(UserTradingSettings).filter(
-                    UserTradingSettings.user_id == user_id
-                ).first()
+                # user_id is the primary key: identity-map lookup first
+                settings = db.get(UserTradingSettings, user_id)
                 
                 if settings:
                     return UserSLTPSettings(
@@ -1203,12 +1202,9 @@ class GlobalTradeMonitor:
             entry_price = float(trade.entry_price)
             quantity = float(trade.quantity)
             
-            if trade.side == "BUY":
-                pnl = (exit_price - entry_price) * quantity
-            else:
-                pnl = (entry_price - exit_price) * quantity
-            
-            pnl_percent = (pnl / (entry_price * quantity)) * 100
+            diff = (exit_price - entry_price) * (1 if trade.side == "BUY" else -1)
+            pnl = diff * quantity
+            pnl_percent = (diff / entry_price) * 100
             
             # Update trade
             trade.status = "CLOSED"
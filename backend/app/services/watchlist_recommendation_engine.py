@@ -535,18 +535,48 @@ class WatchlistRecommendationEngine:
             LIMIT :limit
         """), {"user_id": user_id, "limit": limit})
         
-        return [
-            {
-                "id": str(row[0]),
-                "symbol": row[1],
-                "score": row[2],
-                "action": row[3],
-                "reasoning": row[4],
-                "components": row[5] or {"momentum": 0, "volume": 0, "volatility": 0, "rsi": 0},
-                "created_at": row[6].isoformat() if row[6] else None
-            }
-            for row in result.fetchall()
-        ]
+        return [self._pending_row_to_dict(row) for row in result.fetchall()]
+    
+    def get_global_recommendations_for_user(
+        self,
+        db: Session,
+        user_id: str,
+        system_user_id: str,
+        limit: int = 50
+    ) -> List[Dict]:
+        """
+        Get pending global (system user) recommendations that apply to a user:
+        ADD for symbols not in their watchlist, REMOVE for symbols in it
+        (active or not). Filtered in SQL, so LIMIT is exact.
+        """
+        result = db.execute(text("""
+            SELECT r.id, r.symbol, r.score, r.action, r.reasoning, r.components, r.created_at
+            FROM watchlist_recommendations r
+            WHERE r.user_id = :system_user_id
+            AND r.accepted IS NULL
+            AND r.created_at >= NOW() - INTERVAL '24 HOURS'
+            AND r.action = CASE WHEN EXISTS (
+                SELECT 1 FROM watchlist_items w
+                WHERE w.user_id = :user_id AND w.symbol = r.symbol
+            ) THEN 'REMOVE' ELSE 'ADD' END
+            ORDER BY r.score DESC
+            LIMIT :limit
+        """), {"user_id": user_id, "system_user_id": system_user_id, "limit": limit})
+        
+        return [self._pending_row_to_dict(row) for row in result.fetchall()]
+    
+    @staticmethod
+    def _pending_row_to_dict(row) -> Dict:
+        """Format an (id, symbol, score, action, reasoning, components, created_at) row."""
+        return {
+            "id": str(row[0]),
+            "symbol": row[1],
+            "score": row[2],
+            "action": row[3],
+            "reasoning": row[4],
+            "components": row[5] or {"momentum": 0, "volume": 0, "volatility": 0, "rsi": 0},
+            "created_at": row[6].isoformat() if row[6] else None
+        }
     
     # ============================================
     # DeepSeek AI Integration for Reasoning
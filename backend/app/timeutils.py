@@ -0,0 +1,10 @@
+"""
+Timestamp helpers shared by the API routes.
+"""
+
+from datetime import datetime
+
+
+def iso_now() -> str:
+    """Current UTC time as an ISO-8601 string (response "timestamp" fields)."""
+    return datetime.utcnow().isoformat()
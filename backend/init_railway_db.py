@@ -209,7 +209,6 @@ try:
             "CREATE INDEX IF NOT EXISTS idx_bots_user_id ON bots(user_id)",
             "CREATE INDEX IF NOT EXISTS idx_bots_status ON bots(status)",
             "CREATE INDEX IF NOT EXISTS idx_bots_created_at ON bots(created_at DESC)",
-            "CREATE INDEX IF NOT EXISTS idx_trades_user_id ON trades(user_id)",
             "CREATE INDEX IF NOT EXISTS idx_trades_bot_id ON trades(bot_id)",
             "CREATE INDEX IF NOT EXISTS idx_trades_symbol ON trades(symbol)",
             "CREATE INDEX IF NOT EXISTS idx_trades_status ON trades(status)",
@@ -0,0 +1,11 @@
+-- Migration 023: Composite index for per-user trade history
+-- Trade-history endpoints filter on (user_id, status) and order by
+-- exit_time DESC. Without a composite index Postgres falls back to a scan
+-- of the user's trades followed by a sort. (user_id, status, entry_time)
+-- lookups are served by the idx_trades_user_status_entry_ctx prefix
+-- (migration 024).
+
+-- Trade history (closed trades, most recent exit first)
+-- NULLS LAST matches ORDER BY exit_time DESC NULLS LAST in get_trade_history
+CREATE INDEX IF NOT EXISTS idx_trades_user_status_exit
+ON trades(user_id, status, exit_time DESC NULLS LAST);
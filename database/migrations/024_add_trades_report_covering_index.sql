@@ -0,0 +1,8 @@
+-- Migration 024: Covering index for report aggregates
+-- The reports endpoints aggregate a user's closed trades since a date,
+-- grouped by strategy and market_context. With the group keys in the index
+-- and pnl INCLUDEd, Postgres can answer them with an index-only scan.
+
+CREATE INDEX IF NOT EXISTS idx_trades_user_status_entry_ctx
+ON trades(user_id, status, entry_time, strategy, market_context)
+INCLUDE (pnl);
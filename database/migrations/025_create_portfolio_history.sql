@@ -0,0 +1,13 @@
+-- Migration 025: Create portfolio_history table
+-- One equity snapshot per user per day, upserted hourly by
+-- PortfolioHistoryService (last snapshot of the day wins).
+-- Drawdown history reads it with a single PK range scan instead of
+-- synthesising a random walk on every request.
+
+CREATE TABLE IF NOT EXISTS portfolio_history (
+    user_id UUID NOT NULL,
+    date DATE NOT NULL,
+    equity DOUBLE PRECISION NOT NULL,
+    updated_at TIMESTAMP DEFAULT NOW(),
+    PRIMARY KEY (user_id, date)
+);
@@ -0,0 +1,9 @@
+-- Migration 026: Time-ordered trades index for the unfiltered trades report
+-- GET /api/reports/trades filters on user_id + entry_time and orders by
+-- entry_time DESC with a LIMIT; status is optional. Without a status filter
+-- the (user_id, status, entry_time, ...) index from migration 024 cannot
+-- return rows in entry_time order, forcing a sort of the whole window.
+-- This index lets the page query stop after LIMIT rows.
+
+CREATE INDEX IF NOT EXISTS idx_trades_user_entry
+ON trades(user_id, entry_time DESC);
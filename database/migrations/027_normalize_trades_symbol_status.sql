@@ -0,0 +1,13 @@
+-- Migration 027: Normalize trades.symbol / trades.status to uppercase
+-- Report filters compare symbol and status against uppercased input
+-- (symbol.upper(), status.upper()), and the Trade model now uppercases both
+-- on write. Fix up any mixed-case legacy rows so those equality filters can
+-- rely on the existing btree indexes instead of upper() expressions.
+
+UPDATE trades
+SET symbol = upper(symbol)
+WHERE symbol <> upper(symbol);
+
+UPDATE trades
+SET status = upper(status)
+WHERE status <> upper(status);
@@ -0,0 +1,15 @@
+-- Migration 028: Cross-user trades index on (status, entry_time)
+-- Every trades index so far leads with user_id, which only helps per-user
+-- queries. Two hot paths filter on status alone:
+--   - the SL/TP monitor loads every OPEN trade on each tick
+--   - GET /api/reports/performance aggregates every CLOSED trade
+-- Leading with status turns both into index range scans. INCLUDE (pnl)
+-- lets the closed-trade aggregate run as an index-only scan.
+--
+-- (market_context, status) and (strategy, market_context) are not added:
+-- the user-scoped equivalents exist (migrations 010, 024), and the context
+-- and strategy reports are index-only on idx_trades_user_status_entry_ctx.
+
+CREATE INDEX IF NOT EXISTS idx_trades_status_entry
+ON trades(status, entry_time)
+INCLUDE (pnl);
@@ -0,0 +1,13 @@
+-- Migration 029: Partial index for active watchlist listings
+-- GET /api/watchlist/symbols, the AI config sync and GET /api/watchlist
+-- ?active_only=true all read a user's ACTIVE items ordered by priority DESC
+-- (then created_at). The existing single-column indexes (migration 004)
+-- leave the planner filtering idx_watchlist_items_user_id and sorting; this
+-- index returns the rows already in order. Partial on is_active so
+-- deactivated symbols don't bloat it (and is_active need not be a key).
+-- Existence checks by (user_id, symbol) are already served by the unique
+-- idx_watchlist_items_user_symbol from migration 004.
+
+CREATE INDEX IF NOT EXISTS idx_watchlist_items_user_active_priority
+ON watchlist_items(user_id, priority DESC, created_at)
+WHERE is_active = TRUE;
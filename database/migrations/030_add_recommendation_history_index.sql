@@ -0,0 +1,11 @@
+-- Migration 030: Keyset index for GET /api/watchlist/recommendations/history
+-- The history lists a user's decided recommendations (accepted IS NOT NULL)
+-- ordered by accepted_at DESC, id DESC, and pages with
+-- (accepted_at, id) < (cursor). idx_rec_user_accepted (migration 013) only
+-- narrows to the user, leaving a sort of every decided row per page; this
+-- index walks them in order and seeks straight to the cursor. Partial on
+-- accepted IS NOT NULL so pending recommendations stay out of it.
+
+CREATE INDEX IF NOT EXISTS idx_rec_user_accepted_at
+ON watchlist_recommendations(user_id, accepted_at DESC, id DESC)
+WHERE accepted IS NOT NULL;
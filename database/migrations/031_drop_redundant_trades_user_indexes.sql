@@ -0,0 +1,7 @@
+-- Migration 031: Drop the single-column trades user_id indexes
+-- idx_trades_user_id (initial schema) and ix_trades_user_id (when the table
+-- was created from the models) are a prefix of every per-user composite
+-- index, so they only added write cost on trade inserts/closes.
+
+DROP INDEX IF EXISTS idx_trades_user_id;
+DROP INDEX IF EXISTS ix_trades_user_id;
@@ -0,0 +1,35 @@
+-- Migration 032: Backfill portfolio_history (migration 025) from trades
+-- PortfolioHistoryService only snapshots today's equity, so drawdown
+-- history stayed empty until days of snapshots had accumulated. Rebuild the
+-- past year from closed trades: walking back from the current portfolio
+-- value, a day's closing equity is total_value minus the P&L of every trade
+-- closed after that day. Snapshots already written are kept (DO NOTHING).
+
+INSERT INTO portfolio_history (user_id, date, equity, updated_at)
+SELECT
+    p.user_id,
+    d.day::date,
+    p.total_value - COALESCE((
+        SELECT SUM(t.pnl)
+        FROM trades t
+        WHERE t.user_id = p.user_id
+          AND t.status = 'CLOSED'
+          AND t.exit_time >= d.day + INTERVAL '1 day'
+    ), 0),
+    NOW()
+FROM portfolios p
+CROSS JOIN LATERAL (
+    SELECT MIN(t.exit_time)::date AS first_day
+    FROM trades t
+    WHERE t.user_id = p.user_id
+      AND t.status = 'CLOSED'
+      AND t.pnl IS NOT NULL
+) f
+CROSS JOIN LATERAL generate_series(
+    GREATEST(f.first_day, CURRENT_DATE - 365),
+    CURRENT_DATE,
+    INTERVAL '1 day'
+) AS d(day)
+WHERE p.total_value IS NOT NULL
+  AND f.first_day IS NOT NULL
+ON CONFLICT (user_id, date) DO NOTHING;
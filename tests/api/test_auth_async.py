@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+get_current_user_async: bearer token verification plus an awaited user
+lookup on the AsyncSession. DB-backed cases require TEST_DATABASE_URL
+(see conftest).
+"""
+
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.auth.local_auth import TokenManager, get_current_user_async
+from app.models.database_models import User
+
+pytestmark = pytest.mark.api
+
+
+def _bearer(token):
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+@pytest.mark.asyncio
+async def test_missing_credentials_are_rejected_before_any_query():
+    with pytest.raises(HTTPException) as excinfo:
+        await get_current_user_async(credentials=None, db=None)
+    assert excinfo.value.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_known_user_is_returned(async_db):
+    user = User(id=uuid.uuid4(), email=f"{uuid.uuid4().hex}@example.com")
+    async_db.add(user)
+    await async_db.commit()
+
+    token = TokenManager.create_access_token(str(user.id), user.email)
+    current_user = await get_current_user_async(credentials=_bearer(token), db=async_db)
+
+    assert current_user.id == str(user.id)
+    assert current_user.uuid == user.id
+    assert current_user.email == user.email
+
+
+@pytest.mark.asyncio
+async def test_unknown_user_is_rejected(async_db):
+    token = TokenManager.create_access_token(str(uuid.uuid4()), "ghost@example.com")
+    with pytest.raises(HTTPException) as excinfo:
+        await get_current_user_async(credentials=_bearer(token), db=async_db)
+    assert excinfo.value.status_code == 401
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+ETag / If-None-Match handling: app.http_cache.etag_matches and the per-user
+report caches (_cached_report, _cached_global_report), whose cache hits
+answer from Redis alone.
+DB-backed cases require TEST_DATABASE_URL (see conftest).
+"""
+
+import uuid
+from datetime import datetime
+
+import pytest
+from fastapi import Request, Response
+
+from app.auth.local_auth import UserResponse
+from app.db.redis_client import invalidate_user_cache, report_cache_key
+from app.http_cache import etag_matches
+from app.models.database_models import Trade
+from app.routes.reports import get_dashboard_report, get_performance_report
+
+pytestmark = [pytest.mark.api, pytest.mark.reports]
+
+
+def _request(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def _user():
+    return UserResponse(id=str(uuid.uuid4()), email="trader@example.com")
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, False),
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"xyz", "abc"', True),
+    ("*", True),
+    ('"abcd"', False),
+])
+def test_etag_matches(header, expected):
+    assert etag_matches(_request(header), '"abc"') is expected
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_answers_from_redis_without_database(redis):
+    user = _user()
+    key = report_cache_key(user.id, 0, "dashboard", {})
+    await redis.set(key, b'{"etag": "\\"v1\\"", "body": {"total_trades": 3}}')
+
+    # db=None: any database access would fail
+    response = Response()
+    body = await get_dashboard_report(request=_request(), response=response, current_user=user, db=None)
+    assert body == {"total_trades": 3}
+    assert response.headers["ETag"] == '"v1"'
+    assert response.headers["Cache-Control"].startswith("private, max-age=")
+
+    not_modified = await get_dashboard_report(
+        request=_request('"v1"'), response=Response(), current_user=user, db=None
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == '"v1"'
+
+
+@pytest.mark.asyncio
+async def test_cache_miss_stores_etag_with_body_and_write_changes_it(redis, async_db):
+    user = _user()
+    first = Response()
+    body = await get_dashboard_report(request=_request(), response=first, current_user=user, db=async_db)
+    etag = first.headers["ETag"]
+    assert body["total_trades"] == 0
+
+    # Now cached: revalidates from Redis
+    not_modified = await get_dashboard_report(
+        request=_request(etag), response=Response(), current_user=user, db=None
+    )
+    assert not_modified.status_code == 304
+
+    async_db.add(Trade(
+        user_id=user.uuid, symbol="BTCUSDT", side="BUY", entry_price=100.0, quantity=1.0,
+        status="CLOSED", pnl=5.0, entry_time=datetime.utcnow(), exit_time=datetime.utcnow(),
+    ))
+    await async_db.commit()
+    await invalidate_user_cache(user.uuid)
+
+    changed = Response()
+    body = await get_dashboard_report(request=_request(etag), response=changed, current_user=user, db=async_db)
+    assert changed.headers["ETag"] != etag
+    assert body["total_trades"] == 1
+
+
+@pytest.mark.asyncio
+async def test_without_redis_etag_comes_from_database(async_db, monkeypatch):
+    from app.db import redis_client
+
+    monkeypatch.setattr(redis_client.settings, "REDIS_ENABLED", False)
+    user = _user()
+    first = Response()
+    await get_dashboard_report(request=_request(), response=first, current_user=user, db=async_db)
+
+    not_modified = await get_dashboard_report(
+        request=_request(first.headers["ETag"]), response=Response(), current_user=user, db=async_db
+    )
+    assert not_modified.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_global_report_hit_answers_from_redis_without_database(redis):
+    await redis.set("reports:global:performance", b'{"etag": "\\"g1\\"", "body": {"total_trades": 9}}')
+
+    response = Response()
+    body = await get_performance_report(request=_request(), response=response, db=None)
+    assert body == {"total_trades": 9}
+    assert response.headers["ETag"] == '"g1"'
+    assert response.headers["Cache-Control"].startswith("public, ")
+
+    not_modified = await get_performance_report(request=_request('"g1"'), response=Response(), db=None)
+    assert not_modified.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_global_report_etag_and_body_share_a_snapshot(redis, async_db):
+    first = Response()
+    body = await get_performance_report(request=_request(), response=first, db=async_db)
+    etag = first.headers["ETag"]
+
+    # A trade closing while the entry is cached changes neither half of it:
+    # the stale body is never paired with a fresh ETag
+    async_db.add(Trade(
+        user_id=uuid.uuid4(), symbol="BTCUSDT", side="BUY", entry_price=100.0, quantity=1.0,
+        status="CLOSED", pnl=5.0, entry_time=datetime.utcnow(), exit_time=datetime.utcnow(),
+    ))
+    await async_db.commit()
+
+    cached = Response()
+    assert await get_performance_report(request=_request(), response=cached, db=async_db) == body
+    assert cached.headers["ETag"] == etag
+
+    # Once the entry ages out, body and ETag move on together
+    redis.data.clear()
+    fresh = Response()
+    body = await get_performance_report(request=_request(etag), response=fresh, db=async_db)
+    assert fresh.headers["ETag"] != etag
+    assert body["total_trades"] >= 1
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+TradeCreateRequest: side and limit-price validation (rejected with 422
+before the route runs).
+"""
+
+import uuid
+
+import pytest
+from pydantic import ValidationError
+
+from app.routes.trades import TradeCreateRequest
+
+pytestmark = pytest.mark.api
+
+
+def _request(**fields):
+    return TradeCreateRequest(**{
+        "bot_id": uuid.uuid4(), "symbol": "BTCUSDT", "side": "BUY", "entry_price": 100.0,
+        "quantity": 1.0, "strategy": "SCALPING", **fields,
+    })
+
+
+@pytest.mark.parametrize("side, stop_loss, take_profit", [
+    ("BUY", 95.0, 110.0),
+    ("SELL", 105.0, 90.0),
+    ("BUY", None, None),
+    ("SELL", 105.0, None),
+])
+def test_limits_on_the_correct_side_are_accepted(side, stop_loss, take_profit):
+    trade = _request(side=side, stop_loss_price=stop_loss, take_profit_price=take_profit)
+    assert (trade.stop_loss_price, trade.take_profit_price) == (stop_loss, take_profit)
+
+
+@pytest.mark.parametrize("side, fields, message", [
+    ("BUY", {"stop_loss_price": 100.0}, "Stop loss must be below entry price for BUY orders"),
+    ("BUY", {"take_profit_price": 99.0}, "Take profit must be above entry price for BUY orders"),
+    ("SELL", {"stop_loss_price": 95.0}, "Stop loss must be above entry price for SELL orders"),
+    ("SELL", {"stop_loss_price": 100.0}, "Stop loss must be above entry price for SELL orders"),
+    ("SELL", {"take_profit_price": 100.0}, "Take profit must be below entry price for SELL orders"),
+])
+def test_limits_on_the_wrong_side_are_rejected(side, fields, message):
+    with pytest.raises(ValidationError, match=message):
+        _request(side=side, **fields)
+
+
+@pytest.mark.parametrize("fields", [
+    {"side": "HOLD"},
+    {"trailing_stop_percent": -1.0},
+    {"trailing_stop_percent": 101.0},
+])
+def test_invalid_side_or_trailing_stop_is_rejected(fields):
+    with pytest.raises(ValidationError):
+        _request(**fields)
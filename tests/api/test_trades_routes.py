@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+/api/trades routes on real Trade rows: UUID ids serialize through
+TradeResponse (single and bulk list). Requires TEST_DATABASE_URL (see conftest).
+"""
+
+import uuid
+
+import orjson
+import pytest
+from fastapi import HTTPException
+
+from app.auth.local_auth import UserResponse
+from app.routes.trades import TradeCreateRequest, TradeResponse, close_trade, create_trade, get_trade, get_trades
+
+pytestmark = pytest.mark.api
+
+
+def _user():
+    return UserResponse(id=str(uuid.uuid4()), email="trader@example.com")
+
+
+async def _create(db, user, bot_id=None):
+    request = TradeCreateRequest(
+        bot_id=bot_id or uuid.uuid4(), symbol="BTCUSDT", side="BUY", entry_price=100.0,
+        quantity=2.0, strategy="SCALPING", stop_loss_price=95.0,
+    )
+    return await create_trade(request, db=db, current_user=user)
+
+
+@pytest.mark.asyncio
+async def test_created_trade_serializes_with_uuid_ids(async_db):
+    user = _user()
+    bot_id = uuid.uuid4()
+    trade = await _create(async_db, user, bot_id)
+
+    response = TradeResponse.model_validate(trade)
+    assert (response.id, response.user_id, response.bot_id) == (trade.id, user.uuid, bot_id)
+    assert response.status == "OPEN"
+
+
+@pytest.mark.asyncio
+async def test_list_and_get(async_db):
+    user = _user()
+    first, second = await _create(async_db, user), await _create(async_db, user)
+
+    listed = await get_trades(
+        symbol=None, status=None, bot_id=None, limit=50, db=async_db, current_user=user
+    )
+    body = orjson.loads(listed.body)
+    assert {row["id"] for row in body} == {str(first.id), str(second.id)}
+    assert {row["user_id"] for row in body} == {user.id}
+
+    by_bot = orjson.loads((await get_trades(
+        symbol=None, status=None, bot_id=first.bot_id, limit=50, db=async_db, current_user=user
+    )).body)
+    assert [row["id"] for row in by_bot] == [str(first.id)]
+
+    fetched = await get_trade(trade_id=first.id, db=async_db, current_user=user)
+    assert TradeResponse.model_validate(fetched).id == first.id
+
+    with pytest.raises(HTTPException) as excinfo:
+        await get_trade(trade_id=uuid.uuid4(), db=async_db, current_user=user)
+    assert excinfo.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_close_trade(async_db):
+    user = _user()
+    trade = await _create(async_db, user)
+
+    closed = await close_trade(trade_id=trade.id, exit_price=110.0, db=async_db, current_user=user)
+    assert closed["status"] == "CLOSED"
+    assert closed["pnl"] == pytest.approx(20.0)
+    assert closed["pnl_percent"] == pytest.approx(10.0)
+
+    with pytest.raises(HTTPException) as excinfo:
+        await close_trade(trade_id=trade.id, exit_price=120.0, db=async_db, current_user=user)
+    assert excinfo.value.status_code == 400
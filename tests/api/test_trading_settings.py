@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+GET/PUT /api/settings/trading: default row creation and the versioned
+Redis cache, which a read racing a write cannot leave stale. Requires
+TEST_DATABASE_URL (see conftest).
+"""
+
+import uuid
+
+import pytest
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.auth.local_auth import TokenManager
+from app.db.redis_client import cache_set, trading_settings_cache_key, trading_settings_cache_version
+from app.models.database_models import User, UserTradingSettings
+from app.routes import settings as settings_routes
+from app.routes.settings import (
+    TradingSettingsUpdate, _load_user_and_settings, get_trading_settings, update_trading_settings,
+)
+
+pytestmark = pytest.mark.api
+
+
+async def _user(db):
+    user = User(id=uuid.uuid4(), email=f"{uuid.uuid4().hex}@example.com")
+    db.add(user)
+    await db.commit()
+    token = TokenManager.create_access_token(str(user.id), user.email)
+    return user, HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+async def _update(db, user, **fields):
+    user_and_settings = await _load_user_and_settings(db, str(user.id))
+    return await update_trading_settings(TradingSettingsUpdate(**fields), user_and_settings=user_and_settings, db=db)
+
+
+@pytest.mark.asyncio
+async def test_first_get_creates_default_settings(async_db):
+    user, credentials = await _user(async_db)
+
+    response = await get_trading_settings(credentials=credentials, db=async_db)
+    assert response.user_id == str(user.id)
+    assert response.sl_tp_profile == "BALANCED"
+    assert await async_db.get(UserTradingSettings, user.id) is not None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_first_get_reads_the_row_another_request_created(async_db, monkeypatch):
+    user, credentials = await _user(async_db)
+    async_db.add(UserTradingSettings(user_id=user.id, sl_tp_profile="PRUDENT"))
+    await async_db.commit()
+
+    # As if the row was inserted between this request's read and its insert
+    async def load_before_insert(db, user_id):
+        current_user, _ = await _load_user_and_settings(db, user_id)
+        return current_user, None
+    monkeypatch.setattr(settings_routes, "_load_user_and_settings", load_before_insert)
+
+    response = await get_trading_settings(credentials=credentials, db=async_db)
+    assert response.sl_tp_profile == "PRUDENT"
+
+
+@pytest.mark.asyncio
+async def test_read_racing_a_write_cannot_leave_stale_settings(async_db, redis):
+    user, credentials = await _user(async_db)
+    stale = await get_trading_settings(credentials=credentials, db=async_db)
+    version = await trading_settings_cache_version(user.id)
+
+    updated = await _update(async_db, user, sl_tp_profile="AGGRESSIVE")
+    assert await trading_settings_cache_version(user.id) == version + 1
+
+    # A GET that loaded the row before the write fills the cache after it
+    await cache_set(trading_settings_cache_key(user.id, version), stale.model_dump(), 300)
+
+    response = await get_trading_settings(credentials=credentials, db=async_db)
+    assert response.sl_tp_profile == updated.sl_tp_profile == "AGGRESSIVE"
+
+    # Served from the cache until the next write
+    assert await get_trading_settings(credentials=credentials, db=None) == response.model_dump()
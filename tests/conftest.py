@@ -0,0 +1,105 @@
+"""
+Shared pytest fixtures.
+
+Database-backed tests run against the PostgreSQL database named by the
+TEST_DATABASE_URL environment variable (e.g.
+postgresql://postgres@localhost:5432/crbot_test) and are skipped when it is
+not set. Tables are created from the models; each test runs in a
+transaction that is rolled back afterwards (db for the sync Session,
+async_db for the AsyncSession).
+"""
+
+import os
+import sys
+
+import pytest
+import pytest_asyncio
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+
+@pytest.fixture
+def test_database_url():
+    url = os.environ.get("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL not set")
+    return url
+
+
+@pytest_asyncio.fixture
+async def async_db(test_database_url):
+    """AsyncSession (asyncpg) inside a transaction rolled back after the test."""
+    from sqlalchemy import make_url
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from app.db.database import Base
+    import app.models.database_models  # noqa: F401  (registers the tables)
+
+    engine = create_async_engine(make_url(test_database_url).set(drivername="postgresql+asyncpg"))
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        session = AsyncSession(bind=conn, join_transaction_mode="create_savepoint", expire_on_commit=False)
+        try:
+            yield session
+        finally:
+            await session.close()
+            await transaction.rollback()
+    await engine.dispose()
+
+
+@pytest.fixture
+def db(test_database_url):
+    """Sync Session (psycopg2) inside a transaction rolled back after the test."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+    from app.db.database import Base
+    import app.models.database_models  # noqa: F401  (registers the tables)
+
+    engine = create_engine(test_database_url)
+    Base.metadata.create_all(engine)
+
+    with engine.connect() as conn:
+        transaction = conn.begin()
+        session = Session(bind=conn, join_transaction_mode="create_savepoint")
+        try:
+            yield session
+        finally:
+            session.close()
+            transaction.rollback()
+    engine.dispose()
+
+
+class InMemoryRedis:
+    """The subset of redis.asyncio.Redis used by app.db.redis_client."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    async def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1).encode()
+        return int(self.data[key])
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    """Enable caching against an in-memory Redis for the test."""
+    from app.db import redis_client
+
+    client = InMemoryRedis()
+    monkeypatch.setattr(redis_client.settings, "REDIS_ENABLED", True)
+    monkeypatch.setattr(redis_client, "_redis_client", client)
+    return client
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Drawdown history is built from portfolio_history, which migration 032
+backfills from closed trades. Requires TEST_DATABASE_URL (see conftest).
+"""
+
+import uuid
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import pytest
+from sqlalchemy import select, text
+
+from app.models.database_models import Portfolio, PortfolioHistory, Trade
+
+pytestmark = [pytest.mark.integration, pytest.mark.reports]
+
+BACKFILL_SQL = (
+    Path(__file__).parents[2] / "database" / "migrations" / "032_backfill_portfolio_history.sql"
+).read_text()
+
+
+def _closed(user_id, pnl, days_ago):
+    exit_time = datetime.combine(date.today() - timedelta(days=days_ago), datetime.min.time()) + timedelta(hours=12)
+    return Trade(
+        user_id=user_id, symbol="BTCUSDT", side="BUY", entry_price=100.0, quantity=1.0,
+        status="CLOSED", pnl=pnl, entry_time=exit_time - timedelta(hours=1), exit_time=exit_time,
+    )
+
+
+@pytest.mark.asyncio
+async def test_backfill_rebuilds_daily_equity_from_closed_trades(async_db):
+    user_id = uuid.uuid4()
+    today = date.today()
+    async_db.add_all([
+        Portfolio(user_id=user_id, total_value=1000.0),
+        _closed(user_id, 100.0, days_ago=3),
+        _closed(user_id, -50.0, days_ago=1),
+        # A snapshot the service already wrote is kept as is
+        PortfolioHistory(user_id=user_id, date=today, equity=999.0),
+    ])
+    await async_db.commit()
+
+    await async_db.execute(text(BACKFILL_SQL))
+
+    rows = (await async_db.execute(
+        select(PortfolioHistory.date, PortfolioHistory.equity)
+        .where(PortfolioHistory.user_id == user_id)
+        .order_by(PortfolioHistory.date)
+    )).all()
+    assert [(row.date, row.equity) for row in rows] == [
+        (today - timedelta(days=3), pytest.approx(1050.0)),  # before the -50 close
+        (today - timedelta(days=2), pytest.approx(1050.0)),
+        (today - timedelta(days=1), pytest.approx(1000.0)),
+        (today, pytest.approx(999.0)),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_backfill_skips_users_without_closed_trades(async_db):
+    user_id = uuid.uuid4()
+    async_db.add(Portfolio(user_id=user_id, total_value=1000.0))
+    await async_db.commit()
+
+    await async_db.execute(text(BACKFILL_SQL))
+
+    rows = (await async_db.execute(
+        select(PortfolioHistory.date).where(PortfolioHistory.user_id == user_id)
+    )).all()
+    assert rows == []
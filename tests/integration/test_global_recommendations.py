@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Global (system user) recommendations filtered per user in SQL
+(WatchlistRecommendationEngine.get_global_recommendations_for_user).
+Requires TEST_DATABASE_URL (see conftest).
+"""
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.database_models import WatchlistItem, WatchlistRecommendation
+from app.services.watchlist_recommendation_engine import WatchlistRecommendationEngine
+
+pytestmark = pytest.mark.integration
+
+
+def _global(system_user_id, symbol, action, score=50.0, **fields):
+    return WatchlistRecommendation(
+        user_id=system_user_id, symbol=symbol, action=action, score=score, **fields,
+    )
+
+
+def test_only_recommendations_that_apply_to_the_user(db):
+    user_id, system_user_id = uuid.uuid4(), uuid.uuid4()
+    db.add_all([
+        WatchlistItem(user_id=user_id, symbol="ETHUSDT"),
+        WatchlistItem(user_id=user_id, symbol="SOLUSDT", is_active=False),
+        _global(system_user_id, "BTCUSDT", "ADD", score=90.0),  # not watched: applies
+        _global(system_user_id, "ETHUSDT", "ADD"),  # already watched
+        _global(system_user_id, "ETHUSDT", "REMOVE", score=70.0),  # watched: applies
+        _global(system_user_id, "SOLUSDT", "REMOVE", score=60.0),  # inactive still counts
+        _global(system_user_id, "ADAUSDT", "REMOVE"),  # not watched
+        _global(system_user_id, "XRPUSDT", "ADD", accepted=False),  # already decided
+        _global(system_user_id, "DOGEUSDT", "ADD", created_at=datetime.utcnow() - timedelta(days=2)),
+    ])
+    db.commit()
+
+    engine = WatchlistRecommendationEngine(db_session_factory=None)
+    recs = engine.get_global_recommendations_for_user(db, str(user_id), str(system_user_id))
+    assert [(r["symbol"], r["action"]) for r in recs] == [
+        ("BTCUSDT", "ADD"), ("ETHUSDT", "REMOVE"), ("SOLUSDT", "REMOVE"),
+    ]
+
+    # The filter runs before LIMIT, so the top rows all apply
+    top = engine.get_global_recommendations_for_user(db, str(user_id), str(system_user_id), limit=2)
+    assert [r["symbol"] for r in top] == ["BTCUSDT", "ETHUSDT"]
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Portfolio summary, positions, orders and equity curve on the AsyncSession,
+and the risk-metrics cache keyed on closed-trade aggregates.
+Live prices are stubbed; requires TEST_DATABASE_URL (see conftest).
+"""
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from app.auth.local_auth import UserResponse
+from app.db.redis_client import cache_delete, portfolio_cache_keys
+from app.models.database_models import Portfolio, Trade
+from app.routes import portfolio as portfolio_routes
+from app.routes.portfolio import (
+    OrderCreate, create_order, get_equity_curve, get_portfolio_summary, get_positions,
+)
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture(autouse=True)
+def fixed_prices(monkeypatch):
+    """Every symbol trades at 110 (no exchange calls)."""
+    async def prices(market_collector, symbols):
+        return {symbol: 110.0 for symbol in symbols}
+    monkeypatch.setattr(portfolio_routes, "_fetch_current_prices", prices)
+    monkeypatch.setattr(portfolio_routes.settings, "REDIS_ENABLED", False)
+
+
+def _user():
+    return UserResponse(id=str(uuid.uuid4()), email="trader@example.com")
+
+
+def _trade(user_id, status, pnl=None, days_ago=1):
+    entry = datetime.utcnow() - timedelta(days=days_ago)
+    return Trade(
+        user_id=user_id, symbol="BTCUSDT", side="BUY", entry_price=100.0, quantity=2.0,
+        status=status, pnl=pnl, entry_time=entry,
+        exit_time=entry + timedelta(hours=1) if status == "CLOSED" else None,
+    )
+
+
+@pytest.mark.asyncio
+async def test_summary_creates_portfolio_and_values_open_positions(async_db):
+    user = _user()
+    async_db.add_all([
+        _trade(user.uuid, "OPEN"),
+        _trade(user.uuid, "CLOSED", pnl=30.0, days_ago=3),
+        _trade(user.uuid, "CLOSED", pnl=-10.0, days_ago=2),
+    ])
+    await async_db.commit()
+
+    summary = await get_portfolio_summary(db=async_db, current_user=user)
+
+    # 100k - 200 (open cost) + 20 realized, plus the open position at 110
+    assert summary["cash_balance"] == pytest.approx(99820.0)
+    assert summary["portfolio_value"] == pytest.approx(99820.0 + 220.0)
+    assert summary["total_pnl"] == pytest.approx(20.0 + 20.0)
+    assert summary["win_rate"] == pytest.approx(50.0)
+    assert summary["open_positions_count"] == 1
+    assert summary["recent_trades_count"] == 3
+    assert summary["last_updated"] is not None
+
+    stored = (await async_db.execute(select(Portfolio).where(Portfolio.user_id == user.uuid))).scalar_one()
+    assert stored.cash_balance == pytest.approx(99820.0)
+
+
+@pytest.mark.asyncio
+async def test_positions_use_live_prices(async_db):
+    user = _user()
+    async_db.add(_trade(user.uuid, "OPEN"))
+    await async_db.commit()
+
+    positions = await get_positions(
+        db=async_db, current_user=user, sort_by="symbol", sort_order="asc",
+        symbol_filter=None, min_pnl=None, max_pnl=None,
+    )
+    assert len(positions) == 1
+    assert positions[0]["current_price"] == 110.0
+    assert positions[0]["unrealized_pnl"] == pytest.approx(20.0)
+
+
+@pytest.mark.asyncio
+async def test_buy_then_sell_order(async_db):
+    user = _user()
+    async_db.add(Portfolio(user_id=user.uuid, total_value=1000.0, cash_balance=1000.0, total_pnl=0.0))
+    await async_db.commit()
+
+    bought = await create_order(
+        OrderCreate(symbol="ETHUSDT", side="BUY", quantity=2.0, price=100.0), db=async_db, current_user=user
+    )
+    assert bought["new_balance"] == pytest.approx(800.0)
+
+    sold = await create_order(
+        OrderCreate(symbol="ETHUSDT", side="SELL", quantity=2.0, price=150.0), db=async_db, current_user=user
+    )
+    assert sold["pnl"] == pytest.approx(100.0)
+    assert sold["new_balance"] == pytest.approx(1100.0)
+
+    with pytest.raises(HTTPException) as excinfo:
+        await create_order(
+            OrderCreate(symbol="ETHUSDT", side="SELL", quantity=1.0, price=150.0), db=async_db, current_user=user
+        )
+    assert excinfo.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_equity_curve(async_db):
+    user = _user()
+    async_db.add_all([
+        Portfolio(user_id=user.uuid, total_value=1000.0, cash_balance=1000.0),
+        _trade(user.uuid, "CLOSED", pnl=50.0, days_ago=5),
+    ])
+    await async_db.commit()
+
+    curve = await get_equity_curve(days=10, db=async_db, current_user=user)
+    values = [point["value"] for point in curve["data"]]
+    assert len(values) == 10
+    assert values[0] == pytest.approx(1000.0)
+    assert values[-1] == pytest.approx(1050.0)
+
+    assert await get_equity_curve(days=10, db=async_db, current_user=None) == {"data": []}
+
+
+@pytest.mark.asyncio
+async def test_risk_metrics_recomputed_only_when_closed_trades_change(async_db, redis, monkeypatch):
+    calculate = portfolio_routes.RiskCalculator.calculate_all_metrics
+    calls = []
+    monkeypatch.setattr(
+        portfolio_routes.RiskCalculator, "calculate_all_metrics",
+        lambda **kwargs: calls.append(kwargs) or calculate(**kwargs),
+    )
+
+    user = _user()
+    async_db.add(_trade(user.uuid, "CLOSED", pnl=30.0, days_ago=3))
+    await async_db.commit()
+
+    async def summary():
+        await cache_delete(*portfolio_cache_keys(user.uuid))  # bypass the short summary cache
+        return await get_portfolio_summary(db=async_db, current_user=user)
+
+    first = await summary()
+    second = await summary()
+    assert len(calls) == 1
+    assert second["sharpe_ratio"] == first["sharpe_ratio"]
+
+    trade = _trade(user.uuid, "CLOSED", pnl=-5.0, days_ago=1)
+    async_db.add(trade)
+    await async_db.commit()
+    await summary()
+    assert len(calls) == 2
+    assert len(calls[-1]["trades"]) == 2
+
+    # A P&L edit changes the realized total, so the key too
+    trade.pnl = 15.0
+    await async_db.commit()
+    await summary()
+    assert len(calls) == 3
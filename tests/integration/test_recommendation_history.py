@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Recommendation history pagination: keyset cursors, including rows accepted
+or rejected without an accepted_at, and offset pages with totals. DB-backed
+cases require TEST_DATABASE_URL (see conftest).
+"""
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from app.auth.local_auth import UserResponse
+from app.models.database_models import WatchlistRecommendation
+from app.routes.watchlist import (
+    _decode_history_cursor, _encode_history_cursor, get_recommendation_history,
+)
+
+pytestmark = pytest.mark.integration
+
+
+def _user():
+    return UserResponse(id=str(uuid.uuid4()), email="trader@example.com")
+
+
+def _decided(user_id, minutes_ago, accepted=True):
+    return WatchlistRecommendation(
+        id=uuid.uuid4(), user_id=user_id, symbol="BTCUSDT", score=50.0, action="ADD",
+        accepted=accepted,
+        accepted_at=None if minutes_ago is None else datetime.utcnow() - timedelta(minutes=minutes_ago),
+    )
+
+
+async def _history(db, user, **params):
+    params = {"status": None, "limit": 2, "offset": 0, "cursor": None, **params}
+    return await get_recommendation_history(db=db, current_user=user, **params)
+
+
+@pytest.mark.parametrize("accepted_at", [datetime(2026, 3, 1, 9, 15, 0, 500), None])
+def test_cursor_round_trip(accepted_at):
+    rec_id = uuid.uuid4()
+    assert _decode_history_cursor(_encode_history_cursor(accepted_at, rec_id)) == (accepted_at, rec_id)
+
+
+@pytest.mark.parametrize("cursor", ["", "2026-03-01T12:00:00", "yesterday_" + str(uuid.uuid4())])
+def test_malformed_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError):
+        _decode_history_cursor(cursor)
+
+
+@pytest.mark.asyncio
+async def test_cursor_pages_cover_rows_without_accepted_at(async_db):
+    user = _user()
+    async_db.add_all([
+        _decided(user.uuid, minutes) for minutes in (None, None, None, 5, 10, 10)
+    ] + [_decided(user.uuid, 1, accepted=None)])  # still pending: not history
+    await async_db.commit()
+
+    expected = [row["id"] for row in (await _history(async_db, user, limit=100))["history"]]
+    assert len(expected) == 6
+
+    page = await _history(async_db, user)
+    ids = [row["id"] for row in page["history"]]
+    while page["next_cursor"]:
+        page = await _history(async_db, user, cursor=page["next_cursor"])
+        assert page["total_count"] is None
+        ids += [row["id"] for row in page["history"]]
+    assert ids == expected
+    assert page["has_more"] is False
+
+
+@pytest.mark.asyncio
+async def test_offset_pages_report_totals(async_db):
+    user = _user()
+    async_db.add_all([
+        _decided(user.uuid, 1), _decided(user.uuid, 2, accepted=False), _decided(user.uuid, 3),
+    ])
+    await async_db.commit()
+
+    page = await _history(async_db, user, offset=2)
+    assert (page["total_count"], len(page["history"]), page["has_more"]) == (3, 1, False)
+
+    rejected = await _history(async_db, user, status="rejected")
+    assert rejected["total_count"] == 1
+
+    past_end = await _history(async_db, user, offset=10)
+    assert (past_end["total_count"], past_end["history"]) == (3, [])
+
+
+@pytest.mark.asyncio
+async def test_invalid_cursor_is_rejected(async_db):
+    with pytest.raises(HTTPException) as excinfo:
+        await _history(async_db, _user(), cursor="garbage")
+    assert excinfo.value.status_code == 400
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Strategy reports follow trades through their whole lifecycle: close,
+reopen, P&L edits and deletes are all reflected, since the reports
+aggregate closed trades directly. Requires TEST_DATABASE_URL (see conftest).
+"""
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import delete, update
+
+from app.models.database_models import Trade
+from app.routes.reports import _strategy_rollup
+
+pytestmark = [pytest.mark.integration, pytest.mark.reports]
+
+
+def _trade(user_id, pnl, status="CLOSED", strategy="SCALPING", market_context="STRONG_BULLISH", hours_ago=1):
+    entry = datetime.utcnow() - timedelta(hours=hours_ago)
+    return Trade(
+        user_id=user_id,
+        symbol="BTCUSDT",
+        side="BUY",
+        entry_price=100.0,
+        quantity=1.0,
+        pnl=pnl,
+        status=status,
+        entry_time=entry,
+        exit_time=entry + timedelta(minutes=30) if status == "CLOSED" else None,
+        strategy=strategy,
+        market_context=market_context,
+    )
+
+
+async def _totals(db, user_id, strategy=None):
+    since = datetime.utcnow() - timedelta(days=30)
+    return await _strategy_rollup(db, user_id, since, strategy=strategy)
+
+
+@pytest.mark.asyncio
+async def test_close_adds_trade_to_strategy_and_context(async_db):
+    user_id = uuid.uuid4()
+    trade = _trade(user_id, None, status="OPEN")
+    async_db.add_all([trade, _trade(user_id, -5.0, market_context=None)])
+    await async_db.commit()
+
+    rollup = await _totals(async_db, user_id)
+    assert rollup.totals["SCALPING"].trades == 1
+
+    trade.status = "CLOSED"
+    trade.pnl = 20.0
+    trade.exit_time = datetime.utcnow()
+    await async_db.commit()
+
+    rollup = await _totals(async_db, user_id)
+    stats = rollup.totals["SCALPING"]
+    assert (stats.trades, stats.wins, stats.losses) == (2, 1, 1)
+    assert stats.total_pnl == pytest.approx(15.0)
+    assert (stats.win_pnl, stats.loss_pnl) == (pytest.approx(20.0), pytest.approx(-5.0))
+    assert (stats.max_pnl, stats.min_pnl) == (pytest.approx(20.0), pytest.approx(-5.0))
+    assert set(rollup.contexts["SCALPING"]) == {"STRONG_BULLISH", "UNKNOWN"}
+    assert rollup.contexts["SCALPING"]["STRONG_BULLISH"].total_pnl == pytest.approx(20.0)
+
+
+@pytest.mark.asyncio
+async def test_reopen_removes_trade(async_db):
+    user_id = uuid.uuid4()
+    trade = _trade(user_id, 10.0)
+    async_db.add_all([trade, _trade(user_id, 3.0)])
+    await async_db.commit()
+
+    trade.status = "OPEN"
+    trade.pnl = None
+    await async_db.commit()
+
+    stats = (await _totals(async_db, user_id)).totals["SCALPING"]
+    assert (stats.trades, stats.wins) == (1, 1)
+    assert stats.total_pnl == pytest.approx(3.0)
+    assert stats.max_pnl == pytest.approx(3.0)
+
+
+@pytest.mark.asyncio
+async def test_pnl_edit_is_reflected(async_db):
+    user_id = uuid.uuid4()
+    trade = _trade(user_id, 10.0)
+    async_db.add(trade)
+    await async_db.commit()
+
+    # Core UPDATE, bypassing the ORM unit of work
+    await async_db.execute(update(Trade).where(Trade.id == trade.id).values(pnl=-4.0))
+    await async_db.commit()
+
+    stats = (await _totals(async_db, user_id)).totals["SCALPING"]
+    assert (stats.trades, stats.wins, stats.losses) == (1, 0, 1)
+    assert stats.total_pnl == pytest.approx(-4.0)
+    assert stats.min_pnl == pytest.approx(-4.0)
+
+
+@pytest.mark.asyncio
+async def test_delete_removes_trade(async_db):
+    user_id = uuid.uuid4()
+    kept, deleted = _trade(user_id, 7.0), _trade(user_id, 50.0, strategy="SWING")
+    async_db.add_all([kept, deleted])
+    await async_db.commit()
+
+    await async_db.execute(delete(Trade).where(Trade.id == deleted.id))
+    await async_db.commit()
+
+    rollup = await _totals(async_db, user_id)
+    assert set(rollup.totals) == {"SCALPING"}
+    assert "SWING" not in rollup.contexts
+
+
+@pytest.mark.asyncio
+async def test_strategy_detail_window_and_recent_trades(async_db):
+    user_id = uuid.uuid4()
+    old = _trade(user_id, 100.0, hours_ago=24 * 40)
+    recent = [_trade(user_id, float(i), hours_ago=i + 1) for i in range(12)]
+    async_db.add_all([old, *recent, _trade(user_id, 1.0, strategy="SWING")])
+    await async_db.commit()
+
+    rollup = await _totals(async_db, user_id, strategy="SCALPING")
+    assert set(rollup.totals) == {"SCALPING"}
+    assert rollup.totals["SCALPING"].trades == 12
+    assert len(rollup.recent_trades) == 10
+    exits = [t.exit_time for t in rollup.recent_trades]
+    assert exits == sorted(exits, reverse=True)
+    assert old.id not in {t.id for t in rollup.recent_trades}
+
+
+@pytest.mark.asyncio
+async def test_totals_and_recent_trades_share_the_entry_time_window(async_db):
+    user_id = uuid.uuid4()
+    since = datetime.utcnow() - timedelta(days=30)
+    before, after = _trade(user_id, 9.0), _trade(user_id, 4.0)
+    # Either side of the window start (a whole-day window would count both)
+    before.entry_time = since - timedelta(minutes=1)
+    after.entry_time = since + timedelta(minutes=1)
+    async_db.add_all([before, after])
+    await async_db.commit()
+
+    rollup = await _strategy_rollup(async_db, user_id, since, strategy="SCALPING")
+    stats = rollup.totals["SCALPING"]
+    assert stats.trades == len(rollup.recent_trades) == 1
+    assert stats.total_pnl == pytest.approx(4.0)
+    assert [t.id for t in rollup.recent_trades] == [after.id]
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Trade history pagination: keyset cursors (including rows whose sort time is
+NULL) and the COUNT(*) OVER () page totals. DB-backed cases require
+TEST_DATABASE_URL (see conftest).
+"""
+
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.auth.local_auth import UserResponse
+from app.models.database_models import Trade
+from app.routes.portfolio import (
+    _decode_trade_cursor, _encode_trade_cursor, _window_total, get_trade_history,
+)
+
+pytestmark = pytest.mark.integration
+
+
+def _user():
+    return UserResponse(id=str(uuid.uuid4()), email="trader@example.com")
+
+
+def _closed(user_id, minutes_ago):
+    entry = datetime.utcnow() - timedelta(hours=1)
+    return Trade(
+        id=uuid.uuid4(), user_id=user_id, symbol="BTCUSDT", side="BUY", entry_price=100.0,
+        quantity=1.0, status="CLOSED", pnl=1.0, entry_time=entry,
+        exit_time=None if minutes_ago is None else datetime.utcnow() - timedelta(minutes=minutes_ago),
+    )
+
+
+def _history(db, user, **params):
+    params = {
+        "page": 1, "page_size": 2, "sort_by": "entry_time", "sort_order": "desc",
+        "symbol_filter": None, "status_filter": "CLOSED", "min_pnl": None, "max_pnl": None,
+        "cursor": None, **params,
+    }
+    return get_trade_history(db=db, current_user=user, **params)
+
+
+def _walk(db, user, **params):
+    """Every trade id, following next_cursor from the first page."""
+    page = _history(db, user, **params)
+    ids = [t["id"] for t in page["trades"]]
+    while page["pagination"]["next_cursor"]:
+        page = _history(db, user, cursor=page["pagination"]["next_cursor"], **params)
+        ids += [t["id"] for t in page["trades"]]
+    return ids
+
+
+@pytest.mark.parametrize("trade_time", [datetime(2026, 3, 1, 12, 30, 15, 250000), None])
+def test_cursor_round_trip(trade_time):
+    trade_id = uuid.uuid4()
+    assert _decode_trade_cursor(_encode_trade_cursor(trade_time, trade_id)) == (trade_time, trade_id)
+
+
+@pytest.mark.parametrize("cursor", ["", "2026-03-01T12:00:00", "not-a-time_" + str(uuid.uuid4()), "2026-03-01_nope"])
+def test_malformed_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError):
+        _decode_trade_cursor(cursor)
+
+
+def test_window_total():
+    class Query:
+        def count(self):
+            return 42
+
+    assert _window_total([SimpleNamespace(total_count=7)], Query(), 0) == 7
+    assert _window_total([], Query(), 20) == 42  # past the end: counted separately
+    assert _window_total([], Query(), 0) == 0
+
+
+@pytest.mark.parametrize("sort_order", ["desc", "asc"])
+def test_cursor_pages_cover_trades_without_exit_time(db, sort_order):
+    user = _user()
+    trades = [_closed(user.uuid, minutes) for minutes in (5, 10, 10, 20, None, None, None)]
+    db.add_all(trades)
+    db.commit()
+
+    expected = _history(db, user, page_size=100, sort_order=sort_order)["trades"]
+    assert len(expected) == len(trades)
+
+    ids = _walk(db, user, sort_order=sort_order)
+    assert ids == [t["id"] for t in expected]
+
+
+def test_offset_pages_report_totals(db):
+    user = _user()
+    db.add_all([_closed(user.uuid, minutes) for minutes in (1, 2, 3)])
+    db.commit()
+
+    page = _history(db, user, page=2)
+    assert page["pagination"]["total_trades"] == 3
+    assert page["pagination"]["total_pages"] == 2
+    assert len(page["trades"]) == 1
+
+    past_end = _history(db, user, page=5)
+    assert past_end["pagination"]["total_trades"] == 3
+    assert past_end["trades"] == []
+
+
+def test_cursor_rejected_for_non_time_sort(db):
+    with pytest.raises(HTTPException) as excinfo:
+        _history(db, _user(), sort_by="pnl", cursor=_encode_trade_cursor(None, uuid.uuid4()))
+    assert excinfo.value.status_code == 400
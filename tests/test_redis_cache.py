@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Per-user report cache versioning and trade-write invalidation
+(app.db.redis_client), against the in-memory Redis of the redis fixture.
+"""
+
+import asyncio
+import uuid
+
+import pytest
+
+from app.db import redis_client
+
+
+@pytest.mark.asyncio
+async def test_report_version_is_none_without_redis(monkeypatch):
+    monkeypatch.setattr(redis_client.settings, "REDIS_ENABLED", False)
+    assert await redis_client.report_cache_version(uuid.uuid4()) is None
+
+
+@pytest.mark.asyncio
+async def test_invalidation_bumps_report_version(redis):
+    user_id, other_id = uuid.uuid4(), uuid.uuid4()
+    assert await redis_client.report_cache_version(user_id) == 0
+
+    key = redis_client.report_cache_key(user_id, 0, "dashboard", {"days": 30})
+    await redis_client.cache_set(key, {"total": 1}, 30)
+    await redis_client.cache_set(redis_client.portfolio_cache_keys(user_id)[0], {"cash": 1}, 30)
+
+    await redis_client.invalidate_user_cache(user_id)
+
+    version = await redis_client.report_cache_version(user_id)
+    assert version == 1
+    assert redis_client.report_cache_key(user_id, version, "dashboard", {"days": 30}) != key
+    assert await redis_client.cache_get(redis_client.portfolio_cache_keys(user_id)[0]) is None
+    assert await redis_client.report_cache_version(other_id) == 0
+
+
+def test_report_cache_key_ignores_param_order():
+    user_id = uuid.uuid4()
+    assert (
+        redis_client.report_cache_key(user_id, 3, "trades", {"days": 7, "symbol": "BTCUSDT"})
+        == redis_client.report_cache_key(user_id, 3, "trades", {"symbol": "BTCUSDT", "days": 7})
+    )
+
+
+@pytest.mark.asyncio
+async def test_commit_invalidation_task_is_held_until_done(redis):
+    class CommittedSession:
+        info = {}
+
+    user_id = uuid.uuid4()
+    session = CommittedSession()
+    session.info[redis_client._DIRTY_USERS_KEY] = {user_id}
+
+    redis_client._invalidate_after_commit(session)
+    assert len(redis_client._invalidation_tasks) == 1
+
+    await asyncio.gather(*redis_client._invalidation_tasks)
+    await asyncio.sleep(0)  # done callbacks run on the next loop iteration
+    assert not redis_client._invalidation_tasks
+    assert await redis_client.report_cache_version(user_id) == 1
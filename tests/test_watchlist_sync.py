@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Debounced watchlist -> AI config sync (app.routes.watchlist._schedule_sync).
+"""
+
+import asyncio
+import uuid
+
+import pytest
+
+from app.routes import watchlist
+
+
+@pytest.fixture
+def synced(monkeypatch):
+    """Records synced user ids; each sync blocks until `release` is set."""
+    calls = []
+    release = asyncio.Event()
+
+    async def sync(user_id):
+        calls.append(user_id)
+        await release.wait()
+
+    monkeypatch.setattr(watchlist, "_SYNC_DEBOUNCE_SECONDS", 0.01)
+    monkeypatch.setattr(watchlist, "_sync_watchlist_to_ai", sync)
+    monkeypatch.setattr(watchlist, "_pending_syncs", {})
+    return calls, release
+
+
+@pytest.mark.asyncio
+async def test_burst_of_changes_syncs_once(synced):
+    calls, release = synced
+    user_id = uuid.uuid4()
+    for _ in range(3):
+        watchlist._schedule_sync(user_id)
+    release.set()
+    await watchlist._pending_syncs[user_id]
+
+    assert calls == [user_id]
+    assert user_id not in watchlist._pending_syncs
+
+
+@pytest.mark.asyncio
+async def test_task_is_referenced_until_the_sync_finishes(synced):
+    calls, release = synced
+    user_id = uuid.uuid4()
+    watchlist._schedule_sync(user_id)
+    task = watchlist._pending_syncs[user_id]
+
+    while not calls:
+        await asyncio.sleep(0.01)
+    assert watchlist._pending_syncs[user_id] is task  # syncing, past the delay
+
+    release.set()
+    await task
+    assert user_id not in watchlist._pending_syncs
+
+
+@pytest.mark.asyncio
+async def test_finished_sync_keeps_a_newer_task(synced):
+    calls, release = synced
+    user_id = uuid.uuid4()
+    watchlist._schedule_sync(user_id)
+    first = watchlist._pending_syncs[user_id]
+    watchlist._schedule_sync(user_id)
+    second = watchlist._pending_syncs[user_id]
+
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    assert watchlist._pending_syncs[user_id] is second
+
+    release.set()
+    await second
+    assert calls == [user_id]